@@ -1,14 +1,31 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from api.routers import schedule_router
+from api.routers import health_router, metrics_router, schedule_router
+from api.services.job_queue import DEFAULT_WARM_UP, get_solve_queue, shutdown_solve_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # La API arranca sin pandas ni OR-Tools; los procesos del pool los
+    # importan en segundo plano y `/readyz` responde 200 cuando terminaron
+    queue = get_solve_queue()
+    if DEFAULT_WARM_UP:
+        queue.warm_up()
+    yield
+    shutdown_solve_queue()
+
 
 app = FastAPI(
     title="JobShop Scheduler API",
     description="API para resolver Job Shop Scheduling Problems",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Montar el router
 app.include_router(schedule_router.router, prefix="/schedule", tags=["Schedule"])
+app.include_router(metrics_router.router, tags=["Metrics"])
+app.include_router(health_router.router, tags=["Health"])
 
 
 @app.get("/")
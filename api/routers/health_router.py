@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException
+from api.services.job_queue import current_solve_queue
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+def healthz():
+    """
+    Liveness: el proceso de la API responde. No toca la cola ni el solver.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz():
+    """
+    Readiness: la cola de resolución existe y sus procesos terminaron de
+    arrancar (con el stack del solver importado). Mientras tanto, 503.
+    """
+    queue = current_solve_queue()
+    if queue is None or not queue.ready:
+        raise HTTPException(status_code=503, detail="Los procesos de resolución están arrancando")
+    return {"status": "ready", "workers": queue.max_workers, "mp_context": queue.mp_context}
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from api.services.job_queue import get_solve_queue
+from api.services.metrics import get_metrics
+from api.services.result_cache import get_result_cache
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Métricas en formato Prometheus: histogramas de latencia por modo y por
+    fase, gap de CP-SAT, ramas y conflictos, y el estado de la cola y la caché.
+    """
+    queue = get_solve_queue().stats()
+    gauges = {
+        "jsp_queue_queued": ("Trabajos en espera", queue["queued"]),
+        "jsp_queue_running": ("Trabajos en ejecución", queue["running"]),
+        "jsp_queue_max_workers": ("Procesos del pool", queue["max_workers"]),
+        "jsp_queue_max_queue": ("Capacidad de la cola de espera", queue["max_queue"]),
+        "jsp_queue_ready": ("Procesos del pool listos (1) o arrancando (0)", int(queue["ready"])),
+    }
+    counters = {}
+    cache = get_result_cache()
+    if cache is not None:
+        stats = cache.stats()
+        gauges.update(
+            {
+                "jsp_cache_entries": ("Entradas en la caché de resultados", stats["size"]),
+                "jsp_cache_hit_rate": ("Proporción de aciertos de la caché", stats["hit_rate"]),
+            }
+        )
+        counters.update(
+            {
+                "jsp_cache_hits_total": ("Aciertos de la caché", stats["hits"]),
+                "jsp_cache_misses_total": ("Fallos de la caché", stats["misses"]),
+            }
+        )
+    return get_metrics().render(gauges, counters)
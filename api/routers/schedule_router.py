@@ -1,93 +1,425 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import time
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from api.schemas.schedule_schema import (
+    BatchItemResult,
+    BatchSolveRequest,
+    BatchSolveResponse,
+    GanttRequest,
+    JobStatusResponse,
+    RescheduleRequest,
     SolveRequest,
     SolveResponse,
-    TaskOutput,
 )
-import pandas as pd
-from src.optimization.model_builder import (
-    solve_jobshop,
-    solve_jobshop_two_stage,
+from api.services.batch_service import iter_batch, run_batch
+from api.services.gantt_service import DEFAULT_GANTT_MAX_BARS, GANTT_MEDIA_TYPES, render_schedule_gantt
+from api.services.job_queue import QueueFullError, get_solve_queue
+from api.services.metrics import get_metrics
+from api.services.result_cache import get_result_cache
+from api.services.wire_format import (
+    MEDIA_TYPES,
+    encode_arrow,
+    encode_columnar,
+    iter_ndjson,
+    negotiate_format,
+    operation_records,
 )
-from src.utils.helpers import add_day_hour_columns
 
 router = APIRouter()
 
+EVENTS_POLL_SECONDS = 0.5
+
+WireFormat = Literal["json", "columnar", "ndjson", "arrow"]
+GanttFormat = Literal["png", "svg"]
+GanttView = Literal["job", "machine"]
+
+
+def _check_operations(payload: dict, mode: str):
+    """
+    Rechaza con 422 las operaciones repetidas antes de encolar: en el worker
+    harían fallar `build_instance` y el error llegaría como un 500 (o como
+    un trabajo fallido en `/jobs` y en el stream). Solo el modo flexible las
+    acepta, como máquinas elegibles de una misma operación.
+    """
+    if mode == "flexible":
+        return
+    seen = set()
+    for op in operation_records(payload["operations"]):
+        key = (int(op["job_id"]), int(op["operation_index"]))
+        if key in seen:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Operación repetida (job_id={key[0]}, operation_index={key[1]}): "
+                "para varias máquinas elegibles usar el modo flexible",
+            )
+        seen.add(key)
+
+
+def _submit(req: SolveRequest, mode: str):
+    payload = req.model_dump()
+    _check_operations(payload, mode)
+    try:
+        return get_solve_queue().submit(payload, mode)
+    except QueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+def _get_job(job_id: str):
+    job = get_solve_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Trabajo {job_id} no encontrado")
+    return job
+
+
+def _job_status(job) -> JobStatusResponse:
+    return JobStatusResponse(**job.to_dict(), result=job.result)
+
+
+def _respond(result: dict, request: Request, format: Optional[str] = None) -> Response:
+    """
+    Respuesta en el formato negociado. Con JSON el schedule es una lista de
+    `TaskOutput`; los demás formatos lo envían por columnas (o por líneas)
+    sin armar un modelo por operación.
+    """
+    fmt = negotiate_format(request.headers.get("accept"), format)
+    media_type = MEDIA_TYPES[fmt]
+    if fmt == "columnar":
+        return Response(encode_columnar(result), media_type=media_type)
+    if fmt == "ndjson":
+        return StreamingResponse(iter_ndjson(result), media_type=media_type)
+    if fmt == "arrow":
+        try:
+            return Response(encode_arrow(result), media_type=media_type)
+        except ImportError:
+            raise HTTPException(status_code=406, detail="Formato Arrow no disponible: falta instalar pyarrow")
+    return Response(SolveResponse(**result).model_dump_json(), media_type=media_type)
+
+
+async def _wait_result(job, request: Request, format: Optional[str] = None) -> Response:
+    """
+    Espera el resultado del trabajo sin bloquear el servidor. Si el cliente
+    se desconecta antes, el trabajo se detiene (o se cancela si aún no
+    empezó) para no seguir ocupando un proceso del pool. Si otro cliente lo
+    cancela con `DELETE /jobs/{job_id}`, se responde 409.
+    """
+    waiter = asyncio.ensure_future(asyncio.wrap_future(job.future))
+    try:
+        while not waiter.done():
+            await asyncio.wait({waiter}, timeout=EVENTS_POLL_SECONDS)
+            if waiter.done():
+                break
+            if job.status == "cancelled":
+                # Cancelado ya tomado por el pool: el future termina recién
+                # cuando el proceso lo descarta (ver `SolveJobQueue.cancel`)
+                waiter.cancel()
+                break
+            if await request.is_disconnected():
+                get_solve_queue().stop(job.id)
+                waiter.cancel()
+                return Response(status_code=499)
+    except asyncio.CancelledError:
+        # Se canceló el handler (no el trabajo): detener el solve y propagar
+        get_solve_queue().stop(job.id)
+        waiter.cancel()
+        raise
+    if waiter.cancelled() or job.status == "cancelled":
+        raise HTTPException(status_code=409, detail=f"El trabajo {job.id} fue cancelado")
+    try:
+        result = waiter.result()
+    except ValueError as exc:
+        # Datos del request que el modelo no acepta
+        raise HTTPException(status_code=422, detail=str(exc))
+    response = _respond(result, request, format)
+    # Permite pedir luego `/jobs/{job_id}/gantt` de una respuesta síncrona
+    response.headers["X-Job-Id"] = job.id
+    return response
 
-def _build_output(schedule_df_human):
-    output = []
-    for _, row in schedule_df_human.iterrows():
-        output_kwargs = dict(
-            job_id=int(row["job_id"]),
-            operation_index=int(row["operation_index"]),
-            machine_id=int(row["machine_id"]),
-            start_time_hours=row["start_time_hours"],
-            end_time_hours=row["end_time_hours"],
-            duration_hours=row["duration_hours"],
-            start_day=int(row["start_day"]),
-            start_hour_of_day=row["start_hour_of_day"],
-            end_day=int(row["end_day"]),
-            end_hour_of_day=row["end_hour_of_day"],
-        )
-        if "processing_time_hours" in row:
-            output_kwargs["processing_time_hours"] = row["processing_time_hours"]
-        if "setup_time_hours" in row:
-            output_kwargs["setup_time_hours"] = row["setup_time_hours"]
-        output.append(TaskOutput(**output_kwargs))
-    return output
 
 @router.post("/solve", response_model=SolveResponse)
-def solve_schedule(req: SolveRequest):
-    data = [t.model_dump() for t in req.operations]
-    df = pd.DataFrame(data)
-    # Determinar el tiempo máximo a usar
-    max_time = req.max_time_stage1 if req.max_time_stage1 is not None else req.max_time
-    schedule_df = solve_jobshop(
-        df,
-        time_scale=req.time_scale,
-        H_daily_hours=req.H_daily_hours,
-        enforce_daily_limit=req.enforce_daily_limit,
-        use_setup_times=req.use_setup_times,
-        max_time=max_time,
-        fixed_starts=req.fixed_starts,
-    )
-    if schedule_df.empty:
-        return SolveResponse(status="infeasible", makespan=0.0, schedule=[])
-    schedule_df_human = add_day_hour_columns(
-        schedule_df, H_daily_hours=req.H_daily_hours
-    )
-    makespan = (
-        schedule_df_human["end_time_hours"].max()
-        if not schedule_df_human.empty
-        else 0.0
-    )
-    output = _build_output(schedule_df_human)
-    return SolveResponse(status="optimal", makespan=makespan, schedule=output)
+async def solve_schedule(req: SolveRequest, request: Request, format: Optional[WireFormat] = None):
+    """
+    Con `Accept` (o `?format=`) se elige el formato de la respuesta: JSON
+    (por defecto), JSON por columnas, NDJSON o Arrow IPC.
+    """
+    job = _submit(req, "solve")
+    return await _wait_result(job, request, format)
+
 
 @router.post("/solve_two_stage", response_model=SolveResponse)
-def solve_schedule_two_stage(req: SolveRequest):
-    data = [t.model_dump() for t in req.operations]
-    df = pd.DataFrame(data)
-    schedule_df = solve_jobshop_two_stage(
-        df,
-        time_scale=req.time_scale,
-        H_daily_hours=req.H_daily_hours,
-        enforce_daily_limit=req.enforce_daily_limit,
-        use_setup_times=req.use_setup_times,
-        max_time_stage1=req.max_time_stage1 or req.max_time,
-        max_time_stage2=req.max_time_stage2 or 60,
-        fixed_starts=req.fixed_starts,
-    )
-    if schedule_df is None or schedule_df.empty:
-        return SolveResponse(status="infeasible", makespan=0.0, schedule=[])
-    schedule_df_human = add_day_hour_columns(
-        schedule_df, H_daily_hours=req.H_daily_hours
-    )
-    makespan = (
-        schedule_df_human["end_time_hours"].max()
-        if not schedule_df_human.empty
-        else 0.0
+async def solve_schedule_two_stage(req: SolveRequest, request: Request, format: Optional[WireFormat] = None):
+    job = _submit(req, "two_stage")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/solve_local_search", response_model=SolveResponse)
+async def solve_schedule_local_search(req: SolveRequest, request: Request, format: Optional[WireFormat] = None):
+    job = _submit(req, "local_search")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/solve_decomposition", response_model=SolveResponse)
+async def solve_schedule_decomposition(
+    req: SolveRequest, request: Request, format: Optional[WireFormat] = None
+):
+    """
+    Descomposición por ventanas de tiempo para instancias grandes; la
+    respuesta incluye los tiempos de cada ventana en `windows` y la memoria
+    residente máxima del proceso en `peak_rss_mb`.
+    """
+    job = _submit(req, "decomposition")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/solve_flexible", response_model=SolveResponse)
+async def solve_schedule_flexible(req: SolveRequest, request: Request, format: Optional[WireFormat] = None):
+    """
+    Job shop flexible: cada operación se repite en `operations` una vez por
+    máquina elegible, con su duración en esa máquina; la respuesta indica
+    la máquina asignada.
+    """
+    job = _submit(req, "flexible")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/solve_multi_objective", response_model=SolveResponse)
+async def solve_schedule_multi_objective(
+    req: SolveRequest, request: Request, format: Optional[WireFormat] = None
+):
+    """
+    Varios objetivos (`objectives`) sobre un único modelo: en orden
+    lexicográfico, cada etapa parte de la anterior y no la empeora, o como
+    suma ponderada (`objective_mode="weighted"`). Los atrasos usan
+    `due_dates` y `job_weights` por `job_id`.
+    """
+    job = _submit(req, "multi_objective")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/reschedule", response_model=SolveResponse)
+async def reschedule(req: RescheduleRequest, request: Request, format: Optional[WireFormat] = None):
+    """
+    Re-planifica desde `now_hours`: las operaciones terminadas se conservan,
+    las que están en curso quedan fijas y el resto se vuelve a resolver
+    aplicando los cambios (trabajos nuevos o eliminados, duraciones,
+    indisponibilidad de máquinas).
+    """
+    job = _submit(req, "reschedule")
+    return await _wait_result(job, request, format)
+
+
+@router.post("/solve_heuristic", response_model=SolveResponse)
+def solve_schedule_heuristic(req: SolveRequest, request: Request, format: Optional[WireFormat] = None):
+    # Reglas de despacho: responde en milisegundos, sin pasar por el pool. El
+    # stack del solver se importa en la API recién con el primer pedido
+    from api.services.solve_service import solve_request
+
+    _check_operations(req.model_dump(include={"operations"}), "heuristic")
+    t0 = time.perf_counter()
+    try:
+        result = solve_request(req, "heuristic")
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    get_metrics().record_solve("heuristic", result, time.perf_counter() - t0)
+    return _respond(result, request, format)
+
+
+@router.post("/jobs", response_model=JobStatusResponse, status_code=202)
+def submit_job(
+    req: SolveRequest,
+    mode: Literal[
+        "solve", "two_stage", "heuristic", "local_search", "decomposition", "flexible", "multi_objective"
+    ] = "solve",
+):
+    job = _submit(req, mode)
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job(job_id: str):
+    return _job_status(_get_job(job_id))
+
+
+@router.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+def cancel_job(job_id: str):
+    job = _get_job(job_id)
+    if not get_solve_queue().cancel(job_id) and job.status in ("queued", "running"):
+        raise HTTPException(
+            status_code=409, detail=f"El trabajo {job_id} ya está en ejecución"
+        )
+    return _job_status(job)
+
+
+@router.post("/jobs/{job_id}/stop", response_model=JobStatusResponse)
+def stop_job(job_id: str):
+    """
+    Detiene un trabajo en ejecución conservando la mejor solución encontrada.
+    """
+    job = _get_job(job_id)
+    get_solve_queue().stop(job_id)
+    return _job_status(job)
+
+
+def _event(name: str, payload: str) -> str:
+    return f"event: {name}\ndata: {payload}\n\n"
+
+
+async def _job_events(job, stop_on_disconnect: bool = False):
+    # Eventos `incumbent` a medida que llegan y `status` en cada cambio;
+    # el último `status` incluye el resultado
+    last_status = None
+    sent = 0
+    finished = False
+    try:
+        while True:
+            status = job.status
+            incumbents = job.incumbents
+            for incumbent in incumbents[sent:]:
+                yield _event("incumbent", json.dumps(incumbent))
+            sent = len(incumbents)
+            if status != last_status:
+                last_status = status
+                yield _event("status", _job_status(job).model_dump_json())
+            if status in ("done", "failed", "cancelled"):
+                finished = True
+                break
+            await asyncio.sleep(EVENTS_POLL_SECONDS)
+    finally:
+        if stop_on_disconnect and not finished:
+            get_solve_queue().stop(job.id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Stream server-sent events con los incumbentes y los cambios de estado
+    del trabajo; el último evento incluye el resultado.
+    """
+    job = _get_job(job_id)
+    return StreamingResponse(_job_events(job), media_type="text/event-stream")
+
+
+@router.post("/solve/stream")
+async def solve_schedule_stream(
+    req: SolveRequest,
+    mode: Literal["solve", "two_stage", "local_search", "decomposition", "flexible", "multi_objective"] = "solve",
+):
+    """
+    Igual que `/solve` pero responde con server-sent events: cada solución
+    mejorante se envía apenas se encuentra. El primer evento `status` trae el
+    `job_id`, con el que `POST /jobs/{job_id}/stop` detiene el solve y el
+    stream termina con la mejor solución hasta ese momento. Si el cliente se
+    desconecta, el solve se detiene.
+    """
+    job = _submit(req, mode)
+    return StreamingResponse(
+        _job_events(job, stop_on_disconnect=True), media_type="text/event-stream"
     )
-    output = _build_output(schedule_df_human)
-    return SolveResponse(status="optimal", makespan=makespan, schedule=output)
 
+
+def _batch_payloads(req: BatchSolveRequest):
+    return [item.model_dump() for item in req.items]
+
+
+@router.post("/solve_batch", response_model=BatchSolveResponse)
+async def solve_batch(req: BatchSolveRequest):
+    """
+    Resuelve muchas instancias independientes repartiéndolas en el pool de
+    procesos (a lo sumo `max_parallel` a la vez) y las devuelve en el orden
+    de `items`. Cada item usa sus propios límites de tiempo; si uno falla,
+    el resto del lote se responde igual con su error en `error`.
+    """
+    return BatchSolveResponse(**await run_batch(_batch_payloads(req), req.mode, max_parallel=req.max_parallel))
+
+
+async def _batch_events(req: BatchSolveRequest):
+    t0 = time.perf_counter()
+    done = failed = 0
+    async for item in iter_batch(_batch_payloads(req), req.mode, max_parallel=req.max_parallel):
+        if item["status"] == "done":
+            done += 1
+        else:
+            failed += 1
+        yield _event("item", BatchItemResult(**item).model_dump_json())
+    summary = {"done": done, "failed": failed, "wall_time": round(time.perf_counter() - t0, 3)}
+    yield _event("summary", json.dumps(summary))
+
+
+@router.post("/solve_batch/stream")
+async def solve_batch_stream(req: BatchSolveRequest):
+    """
+    Igual que `/solve_batch` pero con server-sent events: un evento `item`
+    por instancia a medida que termina (con su `index` en el lote) y un
+    evento `summary` al final. Si el cliente se desconecta, los solves en
+    curso se detienen y los pendientes no se ejecutan.
+    """
+    return StreamingResponse(_batch_events(req), media_type="text/event-stream")
+
+
+def _gantt(schedule, format: str, view: str, H_daily_hours: int, max_bars: int) -> Response:
+    try:
+        image = render_schedule_gantt(
+            schedule, fmt=format, view=view, H_daily_hours=H_daily_hours, max_bars=max_bars
+        )
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Gantt no disponible: falta instalar matplotlib")
+    return Response(image, media_type=GANTT_MEDIA_TYPES[format])
+
+
+@router.get("/jobs/{job_id}/gantt")
+def job_gantt(
+    job_id: str,
+    format: GanttFormat = "png",
+    view: GanttView = "job",
+    H_daily_hours: int = Query(8, ge=1),
+    max_bars: int = Query(DEFAULT_GANTT_MAX_BARS, ge=1),
+):
+    """
+    Diagrama de Gantt (PNG o SVG) del resultado de un trabajo terminado:
+    `view=job` una fila por trabajo coloreada por máquina, `view=machine`
+    una fila por máquina coloreada por trabajo. Con más de `max_bars`
+    operaciones se unen las barras contiguas de cada fila. Las imágenes se
+    cachean por hash del schedule.
+    """
+    job = _get_job(job_id)
+    if job.status != "done":
+        raise HTTPException(status_code=409, detail=f"El trabajo {job_id} no terminó (estado: {job.status})")
+    return _gantt(job.result["schedule"], format, view, H_daily_hours, max_bars)
+
+
+@router.post("/gantt")
+def gantt(
+    req: GanttRequest,
+    format: GanttFormat = "png",
+    view: GanttView = "job",
+    max_bars: int = Query(DEFAULT_GANTT_MAX_BARS, ge=1),
+):
+    """
+    Igual que `/jobs/{job_id}/gantt` para un schedule enviado en el body
+    (por filas o por columnas, por ejemplo el de una respuesta anterior).
+    """
+    schedule = req.schedule
+    if isinstance(schedule, list):
+        schedule = [task.model_dump() for task in schedule]
+    else:
+        schedule = schedule.model_dump()
+    return _gantt(schedule, format, view, req.H_daily_hours, max_bars)
+
+
+@router.get("/cache")
+def cache_stats():
+    """
+    Métricas de la caché de resultados (aciertos, fallos, tamaño, desalojos).
+    """
+    cache = get_result_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+@router.delete("/cache")
+def clear_cache():
+    cache = get_result_cache()
+    if cache is not None:
+        cache.clear()
+    return {"cleared": cache is not None}
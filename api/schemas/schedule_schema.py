@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Literal, Optional, Dict, Union
 
 
 class TaskInput(BaseModel):
@@ -10,13 +10,50 @@ class TaskInput(BaseModel):
     setup_time: Optional[float] = None
 
 
+class ColumnarOperations(BaseModel):
+    # Operaciones por columnas: una lista por campo de TaskInput, todas del mismo largo
+    job_id: List[int]
+    operation_index: List[int]
+    machine_id: List[int]
+    processing_time: List[float]
+    setup_time: Optional[List[Optional[float]]] = None
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        lengths = {len(v) for v in self.model_dump(exclude_none=True).values()}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas de `operations` deben tener el mismo largo")
+        return self
+
+
 class FixedStart(BaseModel):
     operation_index: int
     start_time_fixed: float
 
 
+class SolverOptions(BaseModel):
+    # Campos en None usan los valores por defecto del servidor
+    num_workers: Optional[int] = Field(default=None, ge=1)
+    deterministic: Optional[bool] = None
+    random_seed: Optional[int] = None
+    relative_gap_limit: Optional[float] = Field(default=None, ge=0)
+    absolute_gap_limit: Optional[float] = Field(default=None, ge=0)
+    log_search_progress: Optional[bool] = None
+
+
+ObjectiveName = Literal[
+    "makespan", "total_tardiness", "weighted_tardiness", "total_flow_time", "setup_count", "machine_idle_time"
+]
+
+
+class ObjectiveSpec(BaseModel):
+    # Peso usado en `objective_mode="weighted"`; en modo lexicográfico solo cuenta el orden
+    name: ObjectiveName
+    weight: float = Field(default=1.0, ge=0)
+
+
 class SolveRequest(BaseModel):
-    operations: List[TaskInput]
+    operations: Union[List[TaskInput], ColumnarOperations]
     H_daily_hours: int = 8
     enforce_daily_limit: bool = True
     time_scale: int = 60
@@ -25,6 +62,46 @@ class SolveRequest(BaseModel):
     max_time_stage1: Optional[int] = None
     max_time_stage2: Optional[int] = None
     fixed_starts: Optional[Dict[int, List[FixedStart]]] = None
+    daily_limit_encoding: Literal["auto", "division", "day_window", "night_intervals"] = "auto"
+    warm_start: bool = True
+    heuristic_rule: Literal["best", "spt", "lpt", "mwkr", "fifo", "random"] = "best"
+    heuristic_time_limit: float = 0.5
+    polish_time: float = 0.0
+    window_size: int = 100
+    window_overlap: Optional[int] = None
+    window_time: float = 2.0
+    solver: Optional[SolverOptions] = None
+    objectives: Optional[List[Union[ObjectiveName, ObjectiveSpec]]] = None
+    objective_mode: Literal["lexicographic", "weighted"] = "lexicographic"
+    due_dates: Optional[Dict[int, float]] = None
+    job_weights: Optional[Dict[int, float]] = None
+
+    @model_validator(mode="after")
+    def _due_dates_for_tardiness(self):
+        names = {o if isinstance(o, str) else o.name for o in self.objectives or ()}
+        if names & {"total_tardiness", "weighted_tardiness"} and not self.due_dates:
+            raise ValueError("Los objetivos de atraso requieren `due_dates`")
+        return self
+
+
+class ScheduledTask(BaseModel):
+    # Subconjunto de TaskOutput: se puede reenviar el schedule de una respuesta
+    job_id: int
+    operation_index: int
+    start_time_hours: float
+
+
+class MachineDowntime(BaseModel):
+    machine_id: int
+    start_time_hours: float
+    end_time_hours: float
+
+
+class DurationUpdate(BaseModel):
+    job_id: int
+    operation_index: int
+    processing_time: float
+    setup_time: Optional[float] = None
 
 
 class TaskOutput(BaseModel):
@@ -40,9 +117,151 @@ class TaskOutput(BaseModel):
     start_hour_of_day: float
     end_day: int
     end_hour_of_day: float
+    state: Optional[str] = None
+
+
+class RescheduleRequest(SolveRequest):
+    previous_schedule: List[ScheduledTask]
+    now_hours: float
+    added_operations: List[TaskInput] = []
+    removed_jobs: List[int] = []
+    duration_updates: List[DurationUpdate] = []
+    machine_downtime: List[MachineDowntime] = []
+    deviation_weight: float = Field(default=0.0, ge=0)
+
+
+class WindowStats(BaseModel):
+    # Una ventana de la descomposición (ver solve_jobshop_decomposition)
+    sweep: int
+    window: int
+    n_operations: int
+    start_hours: float
+    end_hours: float
+    status: str
+    build_time: float
+    solve_time: float
+    makespan: float
+
+
+class SolverStats(BaseModel):
+    # Estadísticas de un solve CP-SAT (una por etapa); objetivo y cota en horas
+    stage: int
+    status: str
+    objective: Optional[float] = None
+    best_bound: float
+    gap: Optional[float] = None
+    branches: int
+    conflicts: int
+    wall_time: float
+
+
+class LowerBounds(BaseModel):
+    # Cotas inferiores del makespan en horas (ver `bounds_report`); gap relativo contra `best`
+    job_length: Optional[float] = None
+    machine_load: Optional[float] = None
+    jackson: Optional[float] = None
+    combinatorial: float
+    solver: Optional[float] = None
+    best: float
+    gap: Optional[float] = None
 
 
 class SolveResponse(BaseModel):
     status: str
     makespan: float
     schedule: List[TaskOutput]
+    solver_log: Optional[List[str]] = None
+    windows: Optional[List[WindowStats]] = None
+    timings: Optional[Dict[str, float]] = None
+    solver_stats: Optional[List[SolverStats]] = None
+    lower_bounds: Optional[LowerBounds] = None
+    objectives: Optional[Dict[str, Union[int, float]]] = None
+    # Memoria residente máxima del proceso que resolvió (MB), en `/solve_decomposition`
+    peak_rss_mb: Optional[float] = None
+    # Avisos del solve, por ejemplo si se devolvió el schedule heurístico
+    warnings: Optional[List[str]] = None
+    cached: bool = False
+
+    @field_validator("schedule", mode="before")
+    @classmethod
+    def _schedule_rows(cls, value):
+        # Los resultados del pool y de la caché traen el schedule por columnas
+        if isinstance(value, dict):
+            return [dict(zip(value, row)) for row in zip(*value.values())]
+        return value
+
+
+class Incumbent(BaseModel):
+    stage: int
+    makespan: float
+    objective: float
+    bound: float
+    wall_time: float
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    mode: str
+    status: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    stop_requested: bool = False
+    incumbents: List[Incumbent] = []
+    result: Optional[SolveResponse] = None
+
+
+class BatchSolveRequest(BaseModel):
+    items: List[SolveRequest] = Field(..., min_length=1)
+    mode: Literal[
+        "solve", "two_stage", "heuristic", "local_search", "decomposition", "flexible", "multi_objective"
+    ] = "solve"
+    max_parallel: Optional[int] = Field(None, ge=1)
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    job_id: str
+    status: str
+    result: Optional[SolveResponse] = None
+    error: Optional[str] = None
+
+
+class BatchSolveResponse(BaseModel):
+    items: List[BatchItemResult]
+    done: int
+    failed: int
+    wall_time: float
+
+
+class GanttTask(BaseModel):
+    # Subconjunto de TaskOutput necesario para dibujar: se puede enviar el schedule de una respuesta
+    job_id: int
+    operation_index: int
+    machine_id: int
+    start_time_hours: float
+    end_time_hours: float
+    setup_time_hours: Optional[float] = None
+
+
+class ColumnarGanttSchedule(BaseModel):
+    # Schedule por columnas, como en la respuesta `columnar`
+    job_id: List[int]
+    operation_index: List[int]
+    machine_id: List[int]
+    start_time_hours: List[float]
+    end_time_hours: List[float]
+    setup_time_hours: Optional[List[Optional[float]]] = None
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        lengths = {len(v) for v in self.model_dump(exclude_none=True).values()}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas de `schedule` deben tener el mismo largo")
+        return self
+
+
+class GanttRequest(BaseModel):
+    schedule: Union[List[GanttTask], ColumnarGanttSchedule]
+    H_daily_hours: int = Field(8, ge=1)
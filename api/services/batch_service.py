@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional
+
+from api.services.job_queue import QueueFullError, SolveJobQueue, get_solve_queue
+
+# Espera antes de reintentar cuando la cola está llena por otros requests
+QUEUE_RETRY_SECONDS = 0.2
+
+
+def _item_result(index: int, job) -> dict:
+    if job.status == "done":
+        return {"index": index, "job_id": job.id, "status": "done", "result": job.result, "error": None}
+    return {"index": index, "job_id": job.id, "status": job.status, "result": None, "error": job.error}
+
+
+async def iter_batch(
+    payloads: List[dict],
+    mode: str = "solve",
+    queue: Optional[SolveJobQueue] = None,
+    max_parallel: Optional[int] = None,
+) -> AsyncIterator[dict]:
+    """
+    Reparte los requests de `payloads` en el pool de `queue` y entrega el
+    resultado de cada uno a medida que termina, como dict con `index`
+    (posición en `payloads`), `status` ("done", "failed" o "cancelled"),
+    `result` y `error`.
+
+    A lo sumo `max_parallel` items (y nunca más que los procesos del pool)
+    quedan en vuelo, así un lote grande no llena la cola ni desplaza a los
+    demás requests; el tiempo de CPU total queda acotado por el presupuesto
+    de núcleos del pool. Si el consumidor deja de iterar, los items en curso
+    se detienen.
+    """
+    queue = queue or get_solve_queue()
+    parallelism = max(1, min(max_parallel or queue.max_workers, queue.max_workers))
+    pending = {}
+    next_index = 0
+    try:
+        while next_index < len(payloads) or pending:
+            while next_index < len(payloads) and len(pending) < parallelism:
+                try:
+                    job = queue.submit(payloads[next_index], mode)
+                except QueueFullError:
+                    break
+                pending[asyncio.ensure_future(asyncio.wrap_future(job.future))] = (next_index, job)
+                next_index += 1
+            if not pending:
+                # Cola llena por otros requests: esperar a que se libere
+                await asyncio.sleep(QUEUE_RETRY_SECONDS)
+                continue
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                index, job = pending.pop(fut)
+                if not fut.cancelled():
+                    # El error se informa en el item, no se propaga
+                    fut.exception()
+                yield _item_result(index, job)
+    finally:
+        for fut, (_, job) in pending.items():
+            fut.cancel()
+            queue.stop(job.id)
+
+
+async def run_batch(
+    payloads: List[dict],
+    mode: str = "solve",
+    queue: Optional[SolveJobQueue] = None,
+    max_parallel: Optional[int] = None,
+) -> dict:
+    """
+    Igual que `iter_batch`, pero espera a todos los items y los devuelve en
+    el orden de `payloads` junto con un resumen.
+    """
+    t0 = time.perf_counter()
+    items = [item async for item in iter_batch(payloads, mode, queue, max_parallel)]
+    items.sort(key=lambda item: item["index"])
+    return {
+        "items": items,
+        "done": sum(item["status"] == "done" for item in items),
+        "failed": sum(item["status"] != "done" for item in items),
+        "wall_time": round(time.perf_counter() - t0, 3),
+    }
+
+
+def solve_batch(
+    payloads: List[dict],
+    mode: str = "solve",
+    queue: Optional[SolveJobQueue] = None,
+    max_parallel: Optional[int] = None,
+) -> dict:
+    """
+    API de Python para scripts (por ejemplo, el plan nocturno de todas las
+    plantas): resuelve una lista de requests (dicts con el formato de
+    `SolveRequest`) en paralelo. Para fijar el presupuesto de CPU, pasar una
+    `SolveJobQueue(max_workers=..., core_budget=...)` propia.
+    """
+    return asyncio.run(run_batch(payloads, mode, queue, max_parallel))
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from api.services.wire_format import schedule_columns
+
+# Configuración vía variables de entorno
+DEFAULT_GANTT_MAX_BARS = int(os.environ.get("JSP_GANTT_MAX_BARS", "20000"))
+GANTT_CACHE_MAX_ENTRIES = int(os.environ.get("JSP_GANTT_CACHE_MAX_ENTRIES", "64"))
+
+GANTT_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+# Columnas del schedule que cambian el dibujo (las demás no entran en la clave)
+GANTT_COLUMNS = ("job_id", "operation_index", "machine_id", "start_time_hours", "end_time_hours", "setup_time_hours")
+
+
+def schedule_hash(columns: dict) -> str:
+    body = json.dumps({c: columns.get(c) for c in GANTT_COLUMNS}, separators=(",", ":"))
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+class GanttCache:
+    """
+    Imágenes ya renderizadas, con desalojo LRU. La clave es el hash del
+    schedule más las opciones de dibujo, así que el mismo schedule pedido por
+    distintos trabajos (por ejemplo, aciertos de la caché de resultados) se
+    dibuja una sola vez.
+    """
+
+    def __init__(self, max_entries: int = GANTT_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key: str, image: bytes):
+        with self._lock:
+            self._entries[key] = image
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_gantt_cache = GanttCache()
+
+
+def render_schedule_gantt(
+    schedule,
+    fmt: str = "png",
+    view: str = "job",
+    H_daily_hours: int = 8,
+    max_bars: Optional[int] = DEFAULT_GANTT_MAX_BARS,
+    cache: Optional[GanttCache] = _gantt_cache,
+) -> bytes:
+    """
+    Gantt de un schedule (por columnas o por filas) como PNG o SVG. Requiere
+    matplotlib; sin él lanza ImportError.
+    """
+    columns = schedule_columns(schedule)
+    key = f"{schedule_hash(columns)}:{fmt}:{view}:{H_daily_hours}:{max_bars}"
+    image = cache.get(key) if cache is not None else None
+    if image is not None:
+        return image
+    # pandas y matplotlib se importan recién con el primer Gantt (ver arranque en frío)
+    import pandas as pd
+
+    from src.reporting.plots import render_gantt
+
+    data = {c: columns.get(c, []) for c in GANTT_COLUMNS if c != "setup_time_hours"}
+    if columns.get("setup_time_hours") is not None:
+        data["setup_time_hours"] = columns["setup_time_hours"]
+    schedule_df = pd.DataFrame(data)
+    image = render_gantt(schedule_df, fmt=fmt, view=view, H_daily_hours=H_daily_hours, max_bars=max_bars)
+    if cache is not None:
+        cache.put(key, image)
+    return image
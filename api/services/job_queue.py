@@ -0,0 +1,387 @@
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from api.services.metrics import get_metrics
+from api.services.result_cache import ResultCache, get_result_cache
+
+
+# Configuración del pool vía variables de entorno
+DEFAULT_MAX_WORKERS = int(os.environ.get("JSP_SOLVE_WORKERS", "2"))
+DEFAULT_MAX_QUEUE = int(os.environ.get("JSP_SOLVE_MAX_QUEUE", "16"))
+DEFAULT_JOB_TTL = float(os.environ.get("JSP_SOLVE_JOB_TTL", "3600"))
+DEFAULT_CORE_BUDGET = int(os.environ.get("JSP_SOLVER_CORE_BUDGET", "0")) or None
+DEFAULT_MP_CONTEXT = os.environ.get("JSP_SOLVE_MP_CONTEXT") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+DEFAULT_WARM_UP = os.environ.get("JSP_SOLVE_WARM_UP", "1") != "0"
+
+# Stack del solver (pandas, NumPy, OR-Tools). La API no lo importa: se carga
+# en los procesos del pool antes del primer trabajo. Con `forkserver` se
+# importa una sola vez en el servidor y cada proceso lo hereda al crearse.
+WORKER_PRELOAD = ("api.services.solve_service",)
+
+
+def run_solve_job(payload: dict, mode: str = "solve", monitor: Optional["JobMonitor"] = None) -> dict:
+    from api.services import solve_service
+
+    return solve_service.run_solve_job(payload, mode, monitor)
+
+
+def _init_worker(core_budget: int, initializer: Optional[Callable] = None):
+    for module in WORKER_PRELOAD:
+        importlib.import_module(module)
+    from src.optimization.solver_config import set_core_budget
+
+    # Cada proceso del pool limita los hilos de CP-SAT a su parte de los núcleos
+    set_core_budget(core_budget)
+    if initializer is not None:
+        initializer()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_job(fn: Callable, payload: dict, mode: str, monitor: "JobMonitor") -> dict:
+    # Cancelado mientras esperaba en la cola interna del pool (ver `SolveJobQueue.cancel`)
+    if monitor.stop_requested():
+        raise CancelledError()
+    # Avisa a la API que el trabajo empezó antes de llamar a `fn` en el proceso del pool
+    monitor.on_start()
+    return fn(payload, mode, monitor)
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+# Mensaje de la cola de eventos que marca el inicio de un trabajo en el pool
+JOB_STARTED = "started"
+
+
+class JobMonitor:
+    """
+    Canal entre un solve en el pool y la API: el inicio del trabajo y los
+    incumbentes se envían por una cola compartida y los pedidos de detención
+    se leen de un dict compartido (ambos proxies de un
+    `multiprocessing.Manager`).
+    """
+
+    def __init__(self, job_id: str, events, stop_flags):
+        self.job_id = job_id
+        self.events = events
+        self.stop_flags = stop_flags
+
+    def on_start(self):
+        try:
+            self.events.put((self.job_id, JOB_STARTED))
+        except (EOFError, OSError):
+            pass
+
+    def on_incumbent(self, incumbent: dict):
+        try:
+            self.events.put((self.job_id, incumbent))
+        except (EOFError, OSError):
+            pass
+
+    def stop_requested(self) -> bool:
+        try:
+            return bool(self.stop_flags.get(self.job_id, False))
+        except (EOFError, OSError):
+            # La API se cerró: no tiene sentido seguir buscando
+            return True
+
+
+@dataclass
+class SolveJob:
+    id: str
+    mode: str
+    submitted_at: float
+    future: Any = field(repr=False, default=None)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+    stop_requested: bool = False
+    incumbents: List[dict] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        fut = self.future
+        if self.cancelled or (fut is not None and fut.cancelled()):
+            return "cancelled"
+        if fut is None or not fut.done():
+            # `started_at` lo fija el aviso del proceso del pool (ver `_run_job`)
+            return "running" if self.started_at is not None else "queued"
+        return "failed" if fut.exception() is not None else "done"
+
+    @property
+    def result(self) -> Optional[dict]:
+        if self.status != "done":
+            return None
+        return self.future.result()
+
+    @property
+    def error(self) -> Optional[str]:
+        if self.status != "failed":
+            return None
+        return repr(self.future.exception())
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "mode": self.mode,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "stop_requested": self.stop_requested,
+            "incumbents": list(self.incumbents),
+        }
+
+
+class SolveJobQueue:
+    """
+    Cola acotada de trabajos de resolución ejecutados en un pool de procesos.
+
+    `max_workers` limita los solves CP-SAT concurrentes y `max_queue` la
+    cantidad de trabajos en espera; al superarla se rechaza con QueueFullError.
+    `core_budget` es la cantidad de hilos CP-SAT por proceso; por defecto se
+    reparten los núcleos de la máquina entre los procesos del pool. Con
+    `cache`, los requests equivalentes a uno ya resuelto se responden sin
+    pasar por el pool. Los procesos se crean con el primer trabajo o con
+    `warm_up`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        job_ttl: float = DEFAULT_JOB_TTL,
+        mp_context: str = DEFAULT_MP_CONTEXT,
+        initializer: Optional[Callable] = None,
+        core_budget: Optional[int] = DEFAULT_CORE_BUDGET,
+        cache: Optional[ResultCache] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.job_ttl = job_ttl
+        self.core_budget = core_budget or max(1, (os.cpu_count() or 1) // self.max_workers)
+        self.mp_context = mp_context
+        context = multiprocessing.get_context(mp_context)
+        if mp_context == "forkserver":
+            context.set_forkserver_preload(list(WORKER_PRELOAD))
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.core_budget, initializer),
+        )
+        self.cache = cache
+        self._jobs: Dict[str, SolveJob] = {}
+        self._lock = threading.Lock()
+        self._warm_up: Optional[List[Future]] = None
+        # Incumbentes (pool -> API) y pedidos de detención (API -> pool). El
+        # Manager solo reenvía mensajes: se crea con spawn para que el arranque
+        # no espere la precarga del forkserver
+        self._manager = multiprocessing.get_context("spawn").Manager()
+        self._events = self._manager.Queue()
+        self._stop_flags = self._manager.dict()
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def warm_up(self, background: bool = True):
+        """
+        Crea los procesos del pool sin esperar al primer trabajo, de modo que
+        cada uno importe el stack del solver (`WORKER_PRELOAD`) mientras la
+        API ya atiende. `ready` pasa a True cuando todos respondieron.
+        """
+        with self._lock:
+            if self._warm_up is not None:
+                return
+            self._warm_up = []
+
+        def submit_pings():
+            # Con forkserver, crear el primer proceso espera a que termine la precarga
+            self._warm_up.extend(self._executor.submit(_ping) for _ in range(self.max_workers))
+
+        if background:
+            threading.Thread(target=submit_pings, daemon=True).start()
+        else:
+            submit_pings()
+
+    @property
+    def ready(self) -> bool:
+        # Sin `warm_up` el pool se considera listo: sus procesos se crean con el primer trabajo
+        if self._warm_up is None:
+            return True
+        pings = list(self._warm_up)
+        return len(pings) == self.max_workers and all(fut.done() and fut.exception() is None for fut in pings)
+
+    def _listen(self):
+        while True:
+            try:
+                item = self._events.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            job_id, event = item
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            if event == JOB_STARTED:
+                if job.started_at is None:
+                    job.started_at = time.time()
+            else:
+                job.incumbents.append(event)
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+
+    def _prune(self):
+        now = time.time()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.job_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _on_done(self, job: SolveJob, fut, payload: Optional[dict] = None):
+        job.finished_at = time.time()
+        if job.started_at is None:
+            job.started_at = job.finished_at
+        status = job.status
+        get_metrics().record_solve(
+            job.mode,
+            fut.result() if status == "done" else None,
+            job.finished_at - job.submitted_at,
+            outcome=None if status == "done" else status,
+        )
+        if job.stop_requested or job.cancelled:
+            self._stop_flags.pop(job.id, None)
+        elif self.cache is not None and payload is not None and job.status == "done":
+            # Un resultado detenido antes de tiempo no se cachea
+            self.cache.store(payload, job.mode, fut.result())
+
+    def submit(self, payload: dict, mode: str = "solve", fn: Callable = run_solve_job) -> SolveJob:
+        """
+        Encola `fn(payload, mode, monitor)`; si la caché tiene un resultado
+        equivalente, el trabajo se crea ya terminado.
+        """
+        cached = self.cache.lookup(payload, mode) if self.cache is not None else None
+        if cached is not None:
+            job = SolveJob(id=uuid.uuid4().hex, mode=mode, submitted_at=time.time())
+            job.future = Future()
+            job.future.set_result(cached)
+            job.started_at = job.finished_at = job.submitted_at
+            get_metrics().record_solve(mode, cached, 0.0)
+            with self._lock:
+                self._prune()
+                self._jobs[job.id] = job
+            return job
+        with self._lock:
+            self._prune()
+            if self._pending() >= self.max_workers + self.max_queue:
+                raise QueueFullError(
+                    f"Cola de resolución llena ({self.max_workers} en ejecución, {self.max_queue} en espera)"
+                )
+            job = SolveJob(id=uuid.uuid4().hex, mode=mode, submitted_at=time.time())
+            monitor = JobMonitor(job.id, self._events, self._stop_flags)
+            job.future = self._executor.submit(_run_job, fn, payload, mode, monitor)
+            job.future.add_done_callback(
+                lambda fut, job=job: self._on_done(job, fut, payload if fn is run_solve_job else None)
+            )
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[SolveJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        # Solo se pueden cancelar trabajos que aún no comenzaron
+        if job.future.cancel():
+            job.cancelled = True
+            return True
+        if job.started_at is None and not job.future.done():
+            # El pool ya tomó el trabajo de la cola (adelanta uno por proceso)
+            # pero no empezó: `_run_job` ve la bandera y no lo ejecuta
+            job.cancelled = True
+            self._stop_flags[job_id] = True
+            return True
+        return False
+
+    def stop(self, job_id: str) -> bool:
+        """
+        Pide detener un trabajo: si está en ejecución termina con la mejor
+        solución encontrada hasta ahora; si aún espera, se cancela.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return False
+        if self.cancel(job_id):
+            return True
+        job.stop_requested = True
+        self._stop_flags[job_id] = True
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "core_budget": self.core_budget,
+            "mp_context": self.mp_context,
+            "ready": self.ready,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "done": statuses.count("done"),
+            "failed": statuses.count("failed"),
+        }
+
+    def shutdown(self, wait: bool = False):
+        for job_id, job in list(self._jobs.items()):
+            if job.status == "running":
+                self._stop_flags[job_id] = True
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._events.put(None)
+        self._listener.join(timeout=1)
+        self._manager.shutdown()
+
+
+_queue: Optional[SolveJobQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_solve_queue() -> SolveJobQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = SolveJobQueue(cache=get_result_cache())
+        return _queue
+
+
+def current_solve_queue() -> Optional[SolveJobQueue]:
+    # La cola ya creada, sin crearla (chequeos de salud)
+    return _queue
+
+
+def shutdown_solve_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is not None:
+            _queue.shutdown()
+            _queue = None
@@ -0,0 +1,157 @@
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+# Buckets de latencia (segundos) y de gap relativo
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+GAP_BUCKETS = (0.0, 0.001, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{k}="{v}"' for k, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels[k]) for k in self.labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, labels
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[k]) for k in self.labels)
+        # [conteos por bucket..., suma, total]
+        series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                le = _labels(self.labels, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Métricas de los solves en formato de texto de Prometheus, sin depender
+    de `prometheus_client`. Se registran en el proceso de la API a partir de
+    los resultados que devuelve el pool (tiempos por fase y estadísticas de
+    CP-SAT incluidos en la respuesta).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.solves = Counter(
+            "jsp_solves_total", "Solves terminados por modo y estado", ("mode", "status", "cached")
+        )
+        self.latency = Histogram(
+            "jsp_solve_duration_seconds",
+            "Latencia de punta a punta (cola + solve) por modo y estado",
+            ("mode", "status", "cached"),
+        )
+        self.phases = Histogram(
+            "jsp_phase_duration_seconds", "Segundos por fase del solve", ("mode", "phase")
+        )
+        self.gap = Histogram(
+            "jsp_solver_gap", "Gap relativo final de CP-SAT por etapa", ("mode", "stage"), buckets=GAP_BUCKETS
+        )
+        self.bound_gap = Histogram(
+            "jsp_bound_gap",
+            "Gap relativo final contra la mejor cota inferior (combinatoria o de CP-SAT)",
+            ("mode",),
+            buckets=GAP_BUCKETS,
+        )
+        self.branches = Counter("jsp_solver_branches_total", "Ramas exploradas por CP-SAT", ("mode",))
+        self.conflicts = Counter("jsp_solver_conflicts_total", "Conflictos de CP-SAT", ("mode",))
+
+    def record_solve(self, mode: str, result: Optional[dict], elapsed: float, outcome: Optional[str] = None):
+        """
+        Registra un solve terminado. `result` es el dict de `SolveResponse`;
+        si falló o se canceló, `outcome` indica el estado y `result` es None.
+        """
+        status = outcome or (result or {}).get("status", "unknown")
+        cached = "true" if result and result.get("cached") else "false"
+        with self._lock:
+            self.solves.inc(mode=mode, status=status, cached=cached)
+            self.latency.observe(elapsed, mode=mode, status=status, cached=cached)
+            if not result or result.get("cached"):
+                # Un acierto de caché trae los tiempos del solve original
+                return
+            for phase, seconds in (result.get("timings") or {}).items():
+                self.phases.observe(seconds, mode=mode, phase=phase)
+            for stats in result.get("solver_stats") or []:
+                if stats.get("gap") is not None:
+                    self.gap.observe(stats["gap"], mode=mode, stage=stats["stage"])
+                self.branches.inc(stats.get("branches") or 0, mode=mode)
+                self.conflicts.inc(stats.get("conflicts") or 0, mode=mode)
+            lower_bounds = result.get("lower_bounds") or {}
+            if lower_bounds.get("gap") is not None:
+                self.bound_gap.observe(lower_bounds["gap"], mode=mode)
+
+    def render(
+        self,
+        gauges: Optional[Dict[str, Tuple[str, float]]] = None,
+        counters: Optional[Dict[str, Tuple[str, float]]] = None,
+    ) -> str:
+        """
+        Texto de exposición de Prometheus. `gauges` agrega valores
+        instantáneos (`{nombre: (ayuda, valor)}`), por ejemplo de la cola, y
+        `counters` totales monótonos llevados fuera del registro (con sufijo
+        `_total`), por ejemplo los de la caché.
+        """
+        with self._lock:
+            lines = []
+            for metric in (
+                self.solves,
+                self.latency,
+                self.phases,
+                self.gap,
+                self.bound_gap,
+                self.branches,
+                self.conflicts,
+            ):
+                lines += metric.render()
+        for kind, values in (("gauge", gauges), ("counter", counters)):
+            for name, (help, value) in (values or {}).items():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _registry
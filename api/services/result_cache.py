@@ -0,0 +1,354 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from api.services.wire_format import operation_records, schedule_columns
+
+
+# Configuración de la caché vía variables de entorno
+CACHE_ENABLED = os.environ.get("JSP_CACHE_ENABLED", "1") == "1"
+DEFAULT_MAX_ENTRIES = int(os.environ.get("JSP_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_TTL = float(os.environ.get("JSP_CACHE_TTL", "86400"))
+DEFAULT_PATH = os.environ.get("JSP_CACHE_PATH") or None
+
+# Modos cuyo resultado vale la pena cachear (el heurístico responde en ms)
+CACHED_MODES = ("solve", "two_stage", "local_search", "decomposition", "flexible", "multi_objective")
+# Modos por etapas: el estado de la respuesta es el de la primera etapa
+STAGED_MODES = ("two_stage", "multi_objective")
+
+
+def _effort(payload: dict, mode: str) -> Tuple[float, ...]:
+    """
+    Límites de tiempo del request. Un resultado cacheado sirve para otro
+    request si cada componente es mayor o igual.
+    """
+    max_time = payload.get("max_time") or 0
+    stage1 = payload.get("max_time_stage1")
+    if mode == "two_stage":
+        return (float(stage1 or max_time), float(payload.get("max_time_stage2") or 60))
+    if mode in ("local_search", "multi_objective"):
+        return (float(max_time),)
+    if mode == "decomposition":
+        return (float(max_time), float(payload.get("window_time") or 2.0))
+    return (float(stage1 if stage1 is not None else max_time), float(payload.get("polish_time") or 0))
+
+
+def _proven_optimal(result: dict, mode: str) -> bool:
+    """
+    Un resultado "optimal" sirve para cualquier límite de tiempo. En los
+    modos por etapas eso exige que todas las etapas resueltas sean óptimas:
+    un óptimo de la primera no dice nada de lo que haría la segunda con más
+    tiempo.
+    """
+    if result.get("status") != "optimal":
+        return False
+    if mode not in STAGED_MODES:
+        return True
+    stats = result.get("solver_stats") or []
+    return bool(stats) and all(stage.get("status") == "optimal" for stage in stats)
+
+
+def canonical_request(payload: dict, mode: str):
+    """
+    Forma canónica de un request: tiempos escalados como los ve el modelo y
+    trabajos/máquinas renombrados a 0..n-1, de modo que dos requests que solo
+    difieren en los ids generan la misma clave.
+
+    Los trabajos se ordenan por su firma de duraciones e inicios fijos (con el
+    id original como desempate) y las máquinas por orden de aparición. Devuelve
+    `(clave, ids de trabajos, ids de máquinas)`, donde las listas traducen los
+    índices canónicos a los ids del request.
+    """
+    time_scale = payload.get("time_scale") or 60
+    use_setup = bool(payload.get("use_setup_times"))
+    jobs = {}
+    for op in operation_records(payload["operations"]):
+        p = int(round((op.get("processing_time") or 0) * time_scale))
+        s = int(round((op.get("setup_time") or 0) * time_scale)) if use_setup else 0
+        jobs.setdefault(int(op["job_id"]), []).append(
+            (int(op["operation_index"]), int(op["machine_id"]), p, s)
+        )
+    fixed = {}
+    for job_id, items in (payload.get("fixed_starts") or {}).items():
+        job_id = int(job_id)
+        if job_id not in jobs:
+            continue
+        fixed[job_id] = sorted(
+            (int(item["operation_index"]), int(round(item["start_time_fixed"] * time_scale)))
+            for item in items
+            if item.get("start_time_fixed") is not None
+        )
+    # Fechas de entrega (escaladas) y pesos por trabajo: cambian los objetivos
+    due_dates = {
+        int(job_id): int(round(due * time_scale))
+        for job_id, due in (payload.get("due_dates") or {}).items()
+        if due is not None
+    }
+    job_weights = {int(job_id): float(w) for job_id, w in (payload.get("job_weights") or {}).items()}
+    for ops in jobs.values():
+        ops.sort()
+
+    def due_signature(job_id):
+        return [due_dates.get(job_id, -1), job_weights.get(job_id, 1.0)]
+
+    def signature(job_id):
+        # Firma independiente de los ids de máquina
+        ops = jobs[job_id]
+        return ([(p, s) for _, _, p, s in ops], fixed.get(job_id, []), due_signature(job_id), job_id)
+
+    job_order = sorted(jobs, key=signature)
+    machine_order = []
+    machine_index = {}
+    canonical_jobs = []
+    canonical_fixed = []
+    for k, job_id in enumerate(job_order):
+        ops = []
+        for op_index, machine, p, s in jobs[job_id]:
+            if machine not in machine_index:
+                machine_index[machine] = len(machine_order)
+                machine_order.append(machine)
+            if mode == "flexible":
+                # Varias filas por operación (una por máquina elegible)
+                ops.append((op_index, machine_index[machine], p, s))
+            else:
+                ops.append((machine_index[machine], p, s))
+        canonical_jobs.append(ops)
+        canonical_fixed += [(k, task, start) for task, start in fixed.get(job_id, [])]
+    solver = payload.get("solver") or {}
+    canonical = {
+        "mode": mode,
+        "time_scale": time_scale,
+        "H_daily_hours": payload.get("H_daily_hours"),
+        "enforce_daily_limit": bool(payload.get("enforce_daily_limit")),
+        "use_setup_times": use_setup,
+        "jobs": canonical_jobs,
+        "fixed": canonical_fixed,
+        "relative_gap_limit": solver.get("relative_gap_limit"),
+        "absolute_gap_limit": solver.get("absolute_gap_limit"),
+    }
+    if mode == "decomposition":
+        # El tamaño de las ventanas cambia el resultado, no solo su calidad
+        canonical["window"] = [payload.get("window_size"), payload.get("window_overlap")]
+    if due_dates or job_weights:
+        canonical["due"] = [due_signature(job_id) for job_id in job_order]
+    if mode == "multi_objective":
+        canonical["objectives"] = [
+            [item, 1.0] if isinstance(item, str) else [item["name"], item.get("weight", 1.0)]
+            for item in payload.get("objectives") or ()
+        ]
+        canonical["objective_mode"] = payload.get("objective_mode")
+    blob = json.dumps(canonical, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(blob.encode()).hexdigest(), job_order, machine_order
+
+
+def _relabel(result: dict, job_map, machine_map) -> dict:
+    columns = dict(schedule_columns(result["schedule"]))
+    if not columns:
+        return result
+    columns["job_id"] = [job_map[j] for j in columns["job_id"]]
+    columns["machine_id"] = [machine_map[m] for m in columns["machine_id"]]
+    order = sorted(
+        range(len(columns["job_id"])),
+        key=lambda i: (columns["job_id"][i], columns["operation_index"][i]),
+    )
+    schedule = {name: [values[i] for i in order] for name, values in columns.items()}
+    return {**result, "schedule": schedule}
+
+
+class _MemoryBackend:
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def delete(self, key):
+        self._entries.pop(key, None)
+
+    def evict(self, max_entries, ttl) -> int:
+        now = time.time()
+        expired = [k for k, e in self._entries.items() if now - e["created_at"] > ttl]
+        for key in expired:
+            del self._entries[key]
+        evicted = len(expired)
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _SQLiteBackend:
+    """
+    Persistencia en SQLite: la caché sobrevive reinicios y puede compartirse
+    entre réplicas que monten el mismo volumen.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, created_at REAL, last_access REAL, entry TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        row = self._conn.execute("SELECT entry FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self._conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, key, entry):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, entry["created_at"], time.time(), json.dumps(entry)),
+        )
+        self._conn.commit()
+
+    def delete(self, key):
+        self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def evict(self, max_entries, ttl) -> int:
+        cur = self._conn.execute("DELETE FROM results WHERE created_at < ?", (time.time() - ttl,))
+        evicted = cur.rowcount
+        cur = self._conn.execute(
+            "DELETE FROM results WHERE key NOT IN "
+            "(SELECT key FROM results ORDER BY last_access DESC LIMIT ?)",
+            (max_entries,),
+        )
+        evicted += cur.rowcount
+        self._conn.commit()
+        return evicted
+
+    def clear(self):
+        self._conn.execute("DELETE FROM results")
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Caché de resultados direccionada por contenido, con desalojo LRU + TTL.
+
+    La clave es el hash de la forma canónica del request (ver
+    `canonical_request`), sin los límites de tiempo: una entrada óptima o
+    obtenida con límites mayores o iguales a los pedidos se sirve
+    directamente; si el request pide más tiempo, se resuelve de nuevo y la
+    entrada se reemplaza.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        path: Optional[str] = DEFAULT_PATH,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.path = path
+        self._backend = _SQLiteBackend(path) if path else _MemoryBackend()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0, "insufficient_time_limit": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def cacheable(payload: dict, mode: str) -> bool:
+        # Con captura de log se espera el log del solve actual
+        solver = payload.get("solver") or {}
+        return mode in CACHED_MODES and not solver.get("log_search_progress")
+
+    def lookup(self, payload: dict, mode: str) -> Optional[dict]:
+        """
+        Devuelve el resultado cacheado (con los ids del request) o None.
+        """
+        if not self.cacheable(payload, mode):
+            return None
+        key, job_order, machine_order = canonical_request(payload, mode)
+        with self._lock:
+            entry = self._backend.get(key)
+            if entry is not None and time.time() - entry["created_at"] > self.ttl:
+                self._backend.delete(key)
+                entry = None
+            # Un óptimo probado sirve para cualquier límite de tiempo
+            if entry is not None and (
+                _proven_optimal(entry["result"], mode)
+                or all(have >= need for have, need in zip(entry["effort"], _effort(payload, mode)))
+            ):
+                self._metrics["hits"] += 1
+                return {**_relabel(entry["result"], job_order, machine_order), "cached": True}
+            if entry is not None:
+                self._metrics["insufficient_time_limit"] += 1
+            self._metrics["misses"] += 1
+        return None
+
+    def store(self, payload: dict, mode: str, result: dict):
+        if not self.cacheable(payload, mode):
+            return
+        key, job_order, machine_order = canonical_request(payload, mode)
+        job_index = {job_id: k for k, job_id in enumerate(job_order)}
+        machine_index = {m: k for k, m in enumerate(machine_order)}
+        entry = {
+            "effort": list(_effort(payload, mode)),
+            "created_at": time.time(),
+            "result": _relabel({**result, "solver_log": None}, job_index, machine_index),
+        }
+        with self._lock:
+            self._backend.put(key, entry)
+            self._metrics["stores"] += 1
+            self._metrics["evictions"] += self._backend.evict(self.max_entries, self.ttl)
+
+    def clear(self):
+        with self._lock:
+            self._backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+            size = len(self._backend)
+        lookups = metrics["hits"] + metrics["misses"]
+        return {
+            "backend": "sqlite" if self.path else "memory",
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            **metrics,
+            "hit_rate": metrics["hits"] / lookups if lookups else 0.0,
+        }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Caché compartida por el proceso de la API (None si está deshabilitada).
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
@@ -0,0 +1,341 @@
+from typing import Callable, Optional
+import pandas as pd
+from api.schemas.schedule_schema import (
+    ColumnarOperations,
+    RescheduleRequest,
+    SolveRequest,
+    SolveResponse,
+)
+from src.optimization.decomposition import solve_jobshop_decomposition
+from src.optimization.flexible import solve_flexible_jobshop
+from src.optimization.model_builder import (
+    solve_jobshop,
+    solve_jobshop_heuristic,
+    solve_jobshop_local_search,
+    solve_jobshop_two_stage,
+)
+from src.optimization.multi_objective import DEFAULT_OBJECTIVES, solve_jobshop_multi_objective
+from src.optimization.objectives import evaluate_schedule
+from src.optimization.rescheduling import apply_schedule_changes, reschedule_jobshop
+from src.optimization.solver_config import default_solver_config
+from src.utils.helpers import PhaseTimer, add_day_hour_columns
+
+
+SOLVE_MODES = (
+    "solve",
+    "two_stage",
+    "heuristic",
+    "local_search",
+    "reschedule",
+    "decomposition",
+    "flexible",
+    "multi_objective",
+)
+
+
+OUTPUT_INT_COLUMNS = ["job_id", "operation_index", "machine_id", "start_day", "end_day"]
+OUTPUT_FLOAT_COLUMNS = [
+    "start_time_hours",
+    "end_time_hours",
+    "duration_hours",
+    "start_hour_of_day",
+    "end_hour_of_day",
+]
+OUTPUT_OPTIONAL_COLUMNS = ["processing_time_hours", "setup_time_hours", "state"]
+
+
+def _build_output(schedule_df_human) -> dict:
+    """
+    Schedule por columnas (`{columna: lista}`): es lo que viaja desde el
+    pool y lo que guarda la caché; se convierte a una fila por operación
+    solo si la respuesta es JSON (ver `SolveResponse`).
+    """
+    columns = OUTPUT_INT_COLUMNS + OUTPUT_FLOAT_COLUMNS + [
+        c for c in OUTPUT_OPTIONAL_COLUMNS if c in schedule_df_human.columns
+    ]
+    out_df = schedule_df_human[columns].astype(
+        {c: "int64" for c in OUTPUT_INT_COLUMNS}
+    )
+    output = {c: out_df[c].tolist() for c in OUTPUT_INT_COLUMNS + OUTPUT_FLOAT_COLUMNS}
+    for c in columns[len(output):]:
+        # Valores faltantes como None (null), no NaN
+        output[c] = out_df[c].astype(object).where(out_df[c].notna(), None).tolist()
+    return output
+
+
+def _status_from_stats(solver_stats, found: bool) -> str:
+    # El estado de la primera etapa (makespan) define el de la respuesta
+    cp_status = solver_stats[0]["status"] if solver_stats else None
+    if found:
+        return "optimal" if cp_status == "optimal" else "feasible"
+    return "unknown" if cp_status == "unknown" else "infeasible"
+
+
+def _build_response(
+    schedule_df, H_daily_hours, status=None, timer=None, due_dates=None, job_weights=None
+) -> dict:
+    """
+    Arma la respuesta (dict con los campos de `SolveResponse` y el schedule
+    por columnas) a partir del DataFrame de resultados. Sin `status`
+    explícito, se deriva de las estadísticas de CP-SAT: "optimal" solo si
+    CP-SAT probó optimalidad. En cualquier caso, un schedule cuyo makespan
+    alcanza una cota inferior (gap 0 en `attrs["lower_bounds"]`) es
+    "optimal". Los tiempos de `attrs["timings"]` se completan con los de
+    `timer` y los de esta etapa. `objectives` evalúa el schedule con
+    `evaluate_schedule`, cualquiera sea el modo que lo produjo.
+    """
+    timer = timer or PhaseTimer()
+    attrs = schedule_df.attrs if schedule_df is not None else {}
+    solver_stats = attrs.get("solver_stats")
+    lower_bounds = attrs.get("lower_bounds")
+    found = schedule_df is not None and not schedule_df.empty
+    if status is None or not found:
+        status = _status_from_stats(solver_stats, found)
+    if found and lower_bounds and lower_bounds.get("gap") == 0:
+        status = "optimal"
+    if not found:
+        output, makespan, objectives = {}, 0.0, None
+    else:
+        with timer.phase("day_hour_columns"):
+            schedule_df_human = add_day_hour_columns(schedule_df, H_daily_hours=H_daily_hours)
+        makespan = float(schedule_df_human["end_time_hours"].max())
+        with timer.phase("response"):
+            output = _build_output(schedule_df_human)
+        with timer.phase("objectives"):
+            objectives = evaluate_schedule(schedule_df, due_dates, job_weights)
+    timings = {**attrs.get("timings", {}), **timer.timings}
+    return {
+        "status": status,
+        "makespan": makespan,
+        "schedule": output,
+        "solver_log": attrs.get("solver_log"),
+        "windows": attrs.get("windows"),
+        "timings": {phase: round(seconds, 6) for phase, seconds in timings.items()},
+        "solver_stats": solver_stats,
+        "lower_bounds": lower_bounds,
+        "objectives": objectives,
+        "peak_rss_mb": attrs.get("peak_rss_mb"),
+        "warnings": attrs.get("warnings"),
+        "cached": False,
+    }
+
+
+def _request_response(schedule_df, req: SolveRequest, status=None, timer=None) -> dict:
+    return _build_response(
+        schedule_df,
+        req.H_daily_hours,
+        status=status,
+        timer=timer,
+        due_dates=req.due_dates,
+        job_weights=req.job_weights,
+    )
+
+
+def _solver_config(req: SolveRequest):
+    # Opciones del request sobre los valores por defecto del servidor
+    overrides = req.solver.model_dump() if req.solver is not None else None
+    return default_solver_config().merged(overrides)
+
+
+def operations_frame(operations) -> pd.DataFrame:
+    # Las operaciones por columnas no pasan por un modelo por operación
+    if isinstance(operations, ColumnarOperations):
+        return pd.DataFrame(operations.model_dump(exclude_none=True))
+    return pd.DataFrame([t.model_dump() for t in operations])
+
+
+def run_solve(
+    req: SolveRequest,
+    mode: str = "solve",
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+) -> SolveResponse:
+    """
+    Igual que `solve_request`, pero devuelve el modelo `SolveResponse`.
+    """
+    return SolveResponse(**solve_request(req, mode, on_incumbent, stop_requested))
+
+
+def solve_request(
+    req: SolveRequest,
+    mode: str = "solve",
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+) -> dict:
+    """
+    Ejecuta el modelo indicado por `mode` ("solve", "two_stage", "heuristic",
+    "local_search", "reschedule", "decomposition", "flexible" o
+    "multi_objective") para un request y devuelve la respuesta como dict, con
+    el schedule por columnas. `on_incumbent` y `stop_requested` se pasan a los
+    modos con búsqueda (ver `solve_jobshop`).
+    """
+    if mode not in SOLVE_MODES:
+        raise ValueError(f"Modo de resolución desconocido: {mode}")
+    timer = PhaseTimer()
+    with timer.phase("dataframe"):
+        df = operations_frame(req.operations)
+    if mode == "reschedule":
+        return _run_reschedule(req, df, on_incumbent, stop_requested, timer)
+    if mode == "heuristic":
+        schedule_df = solve_jobshop_heuristic(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            fixed_starts=req.fixed_starts,
+            rule=req.heuristic_rule,
+            time_limit=req.heuristic_time_limit,
+        )
+        return _request_response(schedule_df, req, status="feasible", timer=timer)
+    if mode == "local_search":
+        schedule_df = solve_jobshop_local_search(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time=req.max_time,
+            fixed_starts=req.fixed_starts,
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+        return _request_response(schedule_df, req, status="feasible", timer=timer)
+    if mode == "decomposition":
+        schedule_df = solve_jobshop_decomposition(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time=req.max_time,
+            fixed_starts=req.fixed_starts,
+            window_size=req.window_size,
+            window_overlap=req.window_overlap,
+            window_time=req.window_time,
+            daily_limit_encoding=req.daily_limit_encoding,
+            solver_config=_solver_config(req),
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+        return _request_response(schedule_df, req, status="feasible", timer=timer)
+    if mode == "flexible":
+        schedule_df = solve_flexible_jobshop(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time=req.max_time,
+            fixed_starts=req.fixed_starts,
+            daily_limit_encoding=req.daily_limit_encoding,
+            warm_start=req.warm_start,
+            solver_config=_solver_config(req),
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+        return _request_response(schedule_df, req, timer=timer)
+    if mode == "multi_objective":
+        schedule_df = solve_jobshop_multi_objective(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time=req.max_time,
+            fixed_starts=req.fixed_starts,
+            objectives=req.objectives or DEFAULT_OBJECTIVES,
+            objective_mode=req.objective_mode,
+            due_dates=req.due_dates,
+            job_weights=req.job_weights,
+            daily_limit_encoding=req.daily_limit_encoding,
+            warm_start=req.warm_start,
+            solver_config=_solver_config(req),
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+        return _request_response(schedule_df, req, timer=timer)
+    if mode == "two_stage":
+        schedule_df = solve_jobshop_two_stage(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time_stage1=req.max_time_stage1 or req.max_time,
+            max_time_stage2=req.max_time_stage2 or 60,
+            fixed_starts=req.fixed_starts,
+            daily_limit_encoding=req.daily_limit_encoding,
+            warm_start=req.warm_start,
+            solver_config=_solver_config(req),
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+    else:
+        # Determinar el tiempo máximo a usar
+        max_time = (
+            req.max_time_stage1 if req.max_time_stage1 is not None else req.max_time
+        )
+        schedule_df = solve_jobshop(
+            df,
+            time_scale=req.time_scale,
+            H_daily_hours=req.H_daily_hours,
+            enforce_daily_limit=req.enforce_daily_limit,
+            use_setup_times=req.use_setup_times,
+            max_time=max_time,
+            fixed_starts=req.fixed_starts,
+            daily_limit_encoding=req.daily_limit_encoding,
+            warm_start=req.warm_start,
+            polish_time=req.polish_time,
+            solver_config=_solver_config(req),
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+    return _request_response(schedule_df, req, timer=timer)
+
+
+def _run_reschedule(req: RescheduleRequest, df, on_incumbent, stop_requested, timer):
+    df = apply_schedule_changes(
+        df,
+        added_operations=[t.model_dump() for t in req.added_operations],
+        removed_jobs=req.removed_jobs,
+        duration_updates=[u.model_dump() for u in req.duration_updates],
+    )
+    downtime = {}
+    for d in req.machine_downtime:
+        downtime.setdefault(d.machine_id, []).append((d.start_time_hours, d.end_time_hours))
+    schedule_df = reschedule_jobshop(
+        df,
+        pd.DataFrame([t.model_dump() for t in req.previous_schedule]),
+        now=req.now_hours,
+        time_scale=req.time_scale,
+        H_daily_hours=req.H_daily_hours,
+        enforce_daily_limit=req.enforce_daily_limit,
+        use_setup_times=req.use_setup_times,
+        max_time=req.max_time,
+        machine_downtime=downtime,
+        deviation_weight=req.deviation_weight,
+        daily_limit_encoding=req.daily_limit_encoding,
+        solver_config=_solver_config(req),
+        on_incumbent=on_incumbent,
+        stop_requested=stop_requested,
+    )
+    return _request_response(schedule_df, req, timer=timer)
+
+
+def run_solve_job(payload: dict, mode: str = "solve", monitor=None) -> dict:
+    """
+    Punto de entrada de los procesos del pool: recibe y devuelve dicts
+    para no depender del pickling de modelos pydantic. `monitor` (ver
+    `JobMonitor`) comunica incumbentes y pedidos de detención con la API.
+    """
+    request_model = RescheduleRequest if mode == "reschedule" else SolveRequest
+    req = request_model.model_validate(payload)
+    if monitor is None:
+        return solve_request(req, mode)
+    return solve_request(
+        req,
+        mode,
+        on_incumbent=monitor.on_incumbent,
+        stop_requested=monitor.stop_requested,
+    )
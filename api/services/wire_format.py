@@ -0,0 +1,96 @@
+import io
+import json
+from typing import Iterator, Optional
+
+# Formatos de respuesta y su media type (negociado por `Accept` o `?format=`)
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/vnd.jsp.columnar+json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+WIRE_FORMATS = tuple(MEDIA_TYPES)
+
+NDJSON_CHUNK_ROWS = 1000
+
+
+def negotiate_format(accept: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Formato de la respuesta: `requested` (parámetro `format`) si viene, si
+    no el primer media type conocido del header `Accept`; por defecto JSON.
+    """
+    if requested:
+        return requested
+    by_media_type = {media_type: name for name, media_type in MEDIA_TYPES.items()}
+    for part in (accept or "").split(","):
+        name = by_media_type.get(part.split(";")[0].strip().lower())
+        if name is not None:
+            return name
+    return "json"
+
+
+def schedule_columns(schedule) -> dict:
+    # Acepta el schedule por columnas o como lista de filas (entradas viejas de la caché)
+    if isinstance(schedule, dict):
+        return schedule
+    columns = {}
+    for row in schedule:
+        for key in row:
+            columns.setdefault(key, [])
+    for key, values in columns.items():
+        values.extend(row.get(key) for row in schedule)
+    return columns
+
+
+def operation_records(operations) -> list:
+    # Operaciones de un payload como lista de dicts, vengan por filas o por columnas
+    if isinstance(operations, dict):
+        columns = {k: v for k, v in operations.items() if v is not None}
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    return operations
+
+
+def _metadata(result: dict) -> dict:
+    return {k: v for k, v in result.items() if k != "schedule"}
+
+
+def encode_columnar(result: dict) -> bytes:
+    """
+    JSON con el schedule por columnas: `{"status": ..., "schedule":
+    {"job_id": [...], "start_time_hours": [...], ...}}`.
+    """
+    body = {**result, "schedule": schedule_columns(result["schedule"])}
+    return json.dumps(body, separators=(",", ":")).encode()
+
+
+def iter_ndjson(result: dict, chunk_rows: int = NDJSON_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    NDJSON: la primera línea trae los campos de la respuesta salvo el
+    schedule (con `n_tasks`) y cada línea siguiente es una operación.
+    """
+    columns = schedule_columns(result["schedule"])
+    names = list(columns)
+    rows = list(zip(*columns.values()))
+    header = {**_metadata(result), "n_tasks": len(rows)}
+    yield (json.dumps(header, separators=(",", ":")) + "\n").encode()
+    for start in range(0, len(rows), chunk_rows):
+        chunk = rows[start : start + chunk_rows]
+        yield "".join(
+            json.dumps(dict(zip(names, row)), separators=(",", ":")) + "\n" for row in chunk
+        ).encode()
+
+
+def encode_arrow(result: dict) -> bytes:
+    """
+    Arrow IPC (stream) con una columna por campo del schedule. El resto de
+    la respuesta va como JSON en la metadata del schema, clave `jsp`.
+    Requiere `pyarrow`; sin él lanza ImportError.
+    """
+    import pyarrow as pa
+
+    columns = schedule_columns(result["schedule"])
+    table = pa.table(columns).replace_schema_metadata({"jsp": json.dumps(_metadata(result))})
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
@@ -0,0 +1,95 @@
+"""
+Benchmark de las codificaciones de la restricción diaria.
+
+Para cada instancia y codificación mide el tiempo hasta la primera
+solución, el makespan final y el gap contra la mejor cota del solver:
+
+    python -m benchmarks.bench_daily_limit --sizes 10x5 30x10 50x10 --max-time 20
+"""
+import argparse
+import time
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from benchmarks.generators import random_jobshop_df
+from src.optimization.model_builder import DAILY_LIMIT_ENCODINGS, build_jobshop_model
+
+
+class _FirstSolutionTimer(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self._t0 = time.perf_counter()
+        self.first_solution_s = None
+
+    def on_solution_callback(self):
+        if self.first_solution_s is None:
+            self.first_solution_s = time.perf_counter() - self._t0
+
+
+def run_one(df, encoding, H_daily_hours, max_time, workers, seed):
+    t0 = time.perf_counter()
+    jsm = build_jobshop_model(
+        df,
+        H_daily_hours=H_daily_hours,
+        enforce_daily_limit=True,
+        daily_limit_encoding=encoding,
+    )
+    jsm.model.Minimize(jsm.makespan)
+    build_s = time.perf_counter() - t0
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = max_time
+    solver.parameters.num_workers = workers
+    solver.parameters.random_seed = seed
+    timer = _FirstSolutionTimer()
+    status = solver.Solve(jsm.model, timer)
+    row = {
+        "encoding": encoding,
+        "build_s": round(build_s, 3),
+        "status": solver.StatusName(status),
+        "first_solution_s": None if timer.first_solution_s is None else round(timer.first_solution_s, 3),
+        "makespan_h": None,
+        "gap": None,
+        "wall_s": round(solver.WallTime(), 2),
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        obj, bound = solver.ObjectiveValue(), solver.BestObjectiveBound()
+        row["makespan_h"] = round(obj / jsm.time_scale, 2)
+        row["gap"] = round((obj - bound) / obj, 4) if obj else 0.0
+    return row
+
+
+def run(sizes, H_daily_hours=8, max_time=20, workers=1, seed=0, encodings=None):
+    encodings = encodings or [e for e in DAILY_LIMIT_ENCODINGS if e != "auto"]
+    rows = []
+    for size in sizes:
+        n_jobs, n_machines = (int(x) for x in size.split("x"))
+        df = random_jobshop_df(n_jobs, n_machines, seed=seed)
+        for encoding in encodings:
+            row = run_one(df, encoding, H_daily_hours, max_time, workers, seed)
+            rows.append({"instance": size, **row})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", nargs="+", default=["10x5", "30x10", "50x10"])
+    parser.add_argument("--H-daily-hours", type=int, default=8)
+    parser.add_argument("--max-time", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--encodings", nargs="+", choices=DAILY_LIMIT_ENCODINGS)
+    args = parser.parse_args()
+    report = run(
+        args.sizes,
+        H_daily_hours=args.H_daily_hours,
+        max_time=args.max_time,
+        workers=args.workers,
+        seed=args.seed,
+        encodings=args.encodings,
+    )
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Descomposición por ventanas de tiempo frente a un único modelo CP-SAT:
+makespan, tiempo y memoria residente máxima de cada corrida.
+
+    python -m benchmarks.bench_decomposition --size 200x20 --max-time 60 --window-sizes 100 200
+
+Cada corrida se ejecuta en un proceso nuevo para que `peak_rss_mb` no
+arrastre la memoria de las anteriores.
+"""
+import argparse
+import multiprocessing as mp
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from benchmarks.generators import random_jobshop_df
+from src.optimization.decomposition import solve_jobshop_decomposition
+from src.optimization.model_builder import solve_jobshop
+from src.utils.helpers import peak_rss_mb
+
+
+def _run_one(size, method, window_size, max_time, window_time, enforce_daily_limit, H_daily_hours, seed):
+    n_jobs, n_machines = (int(x) for x in size.split("x"))
+    df = random_jobshop_df(n_jobs, n_machines, seed=seed)
+    common = dict(
+        H_daily_hours=H_daily_hours, enforce_daily_limit=enforce_daily_limit, max_time=max_time
+    )
+    t0 = time.perf_counter()
+    if method == "cp_sat":
+        schedule_df = solve_jobshop(df, **common)
+    else:
+        schedule_df = solve_jobshop_decomposition(
+            df, window_size=window_size, window_time=window_time, **common
+        )
+    windows = schedule_df.attrs.get("windows", [])
+    return {
+        "instance": size,
+        "method": method if method == "cp_sat" else f"decomposition_{window_size}",
+        "makespan_h": None if schedule_df.empty else float(schedule_df["end_time_hours"].max()),
+        "wall_s": round(time.perf_counter() - t0, 2),
+        "windows": len(windows),
+        "max_window_build_s": max((w["build_time"] for w in windows), default=None),
+        "max_window_solve_s": max((w["solve_time"] for w in windows), default=None),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run(size, max_time, window_sizes, window_time=2.0, enforce_daily_limit=False, H_daily_hours=8, seed=0):
+    runs = [("cp_sat", None)] + [("decomposition", w) for w in window_sizes]
+    rows = []
+    for method, window_size in runs:
+        with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+            rows.append(
+                pool.submit(
+                    _run_one,
+                    size,
+                    method,
+                    window_size,
+                    max_time,
+                    window_time,
+                    enforce_daily_limit,
+                    H_daily_hours,
+                    seed,
+                ).result()
+            )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="200x20")
+    parser.add_argument("--max-time", type=float, default=60)
+    parser.add_argument("--window-sizes", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--window-time", type=float, default=2.0)
+    parser.add_argument("--daily-limit", action="store_true")
+    parser.add_argument("--H-daily-hours", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = run(
+        args.size,
+        args.max_time,
+        args.window_sizes,
+        window_time=args.window_time,
+        enforce_daily_limit=args.daily_limit,
+        H_daily_hours=args.H_daily_hours,
+        seed=args.seed,
+    )
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Tiempo y tamaño del Gantt renderizado en el servidor según el tamaño del
+schedule:
+
+    python -m benchmarks.bench_gantt --sizes 1000 10000 50000
+
+Compara la implementación anterior (un `barh` y un `text` por operación)
+con la actual (una `PolyCollection` por capa y simplificación por nivel de
+detalle a `--max-bars` barras), en PNG y SVG. La anterior solo se mide hasta
+`--legacy-max` operaciones: por encima tarda minutos.
+"""
+import argparse
+import io
+import time
+
+import pandas as pd
+from matplotlib.figure import Figure
+
+from benchmarks.generators import random_jobshop_df
+from src.optimization.model_builder import solve_jobshop_heuristic
+from src.reporting.plots import render_gantt
+
+
+def legacy_render(schedule_df, fmt, H_daily_hours=8, figsize=(20, 8)):
+    schedule_df_sorted = schedule_df.sort_values(by="start_time_hours")
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    machines = schedule_df_sorted["machine_id"].unique()
+    color_map = {m: i % 20 for i, m in enumerate(machines)}
+    y = 0
+    for job_id, job_df in schedule_df_sorted.groupby("job_id"):
+        for _, row in job_df.iterrows():
+            ax.barh(
+                y,
+                row["duration_hours"],
+                left=row["start_time_hours"],
+                color=f"C{color_map[row['machine_id']] % 10}",
+                edgecolor="black",
+            )
+            ax.text(
+                row["start_time_hours"] + row["duration_hours"] / 2,
+                y,
+                int(row["operation_index"]),
+                va="center",
+                ha="center",
+                fontsize=8,
+                color="white",
+            )
+        y += 1
+    max_time = schedule_df_sorted["end_time_hours"].max()
+    for t in range(H_daily_hours, int(max_time) + H_daily_hours, H_daily_hours):
+        ax.axvline(x=t, color="red", linestyle="--", linewidth=1)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt)
+    return buf.getvalue()
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def run(sizes, n_machines=20, max_bars=20000, legacy_max=5000):
+    rows = []
+    for n_ops in sizes:
+        df = random_jobshop_df(max(1, n_ops // n_machines), n_machines, seed=0)
+        schedule_df = solve_jobshop_heuristic(df, enforce_daily_limit=False, rule="spt", time_limit=0.0)
+        for fmt in ("png", "svg"):
+            renders = {
+                "job": lambda: render_gantt(schedule_df, fmt=fmt, view="job", max_bars=max_bars),
+                "machine": lambda: render_gantt(schedule_df, fmt=fmt, view="machine", max_bars=max_bars),
+            }
+            if len(schedule_df) <= legacy_max:
+                renders["legacy"] = lambda: legacy_render(schedule_df, fmt)
+            for method, render in renders.items():
+                image, elapsed = _timed(render)
+                rows.append(
+                    {
+                        "operations": len(schedule_df),
+                        "format": fmt,
+                        "method": method,
+                        "time_s": round(elapsed, 3),
+                        "size_kb": round(len(image) / 1024, 1),
+                    }
+                )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--max-bars", type=int, default=20000)
+    parser.add_argument("--legacy-max", type=int, default=5000)
+    args = parser.parse_args()
+    report = run(args.sizes, n_machines=args.machines, max_bars=args.max_bars, legacy_max=args.legacy_max)
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Makespan por presupuesto de tiempo: CP-SAT solo (sin warm start) frente a
+reglas de despacho + búsqueda tabú, y CP-SAT con pulido tabú:
+
+    python -m benchmarks.bench_local_search --size 100x20 --budgets 5 10 20
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.generators import random_jobshop_df
+from src.optimization.model_builder import solve_jobshop, solve_jobshop_local_search
+
+
+def _makespan(schedule_df):
+    return None if schedule_df.empty else float(schedule_df["end_time_hours"].max())
+
+
+def run(size, budgets, enforce_daily_limit=False, H_daily_hours=8, seed=0):
+    n_jobs, n_machines = (int(x) for x in size.split("x"))
+    df = random_jobshop_df(n_jobs, n_machines, seed=seed)
+    common = dict(H_daily_hours=H_daily_hours, enforce_daily_limit=enforce_daily_limit)
+    rows = []
+    for budget in budgets:
+        runs = {
+            "cp_sat": lambda: solve_jobshop(df, max_time=budget, warm_start=False, **common),
+            "local_search": lambda: solve_jobshop_local_search(df, max_time=budget, seed=seed, **common),
+            "cp_sat_polish": lambda: solve_jobshop(
+                df, max_time=budget * 0.7, polish_time=budget * 0.3, **common
+            ),
+        }
+        for name, fn in runs.items():
+            t0 = time.perf_counter()
+            makespan = _makespan(fn())
+            rows.append(
+                {
+                    "instance": size,
+                    "budget_s": budget,
+                    "method": name,
+                    "makespan_h": makespan,
+                    "wall_s": round(time.perf_counter() - t0, 2),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", default="100x20")
+    parser.add_argument("--budgets", type=float, nargs="+", default=[5, 10, 20])
+    parser.add_argument("--daily-limit", action="store_true")
+    parser.add_argument("--H-daily-hours", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    report = run(
+        args.size,
+        args.budgets,
+        enforce_daily_limit=args.daily_limit,
+        H_daily_hours=args.H_daily_hours,
+        seed=args.seed,
+    )
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark del pre y post-procesamiento alrededor del solver.
+
+Compara la implementación anterior (groupby + iterrows y un dict por
+operación) con la vectorizada para tamaños de instancia crecientes:
+
+    python -m benchmarks.bench_preprocessing --sizes 1000 5000 20000
+"""
+import argparse
+import time
+
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from benchmarks.generators import random_jobshop_df
+from src.optimization.model_builder import (
+    build_jobs_data,
+    build_jobshop_results,
+    preprocess_jobshop_df,
+)
+
+
+def legacy_build_jobs_data(df, use_setup_times):
+    jobs_data = {}
+    for job_id, job_df in df.groupby("job_id"):
+        job_df = job_df.sort_values("operation_index")
+        if use_setup_times:
+            jobs_data[job_id] = [
+                (
+                    int(row["machine_id"]),
+                    int(row["processing_time_scaled"]),
+                    int(row["setup_time_scaled"] if not pd.isna(row["setup_time_scaled"]) else 0),
+                )
+                for _, row in job_df.iterrows()
+            ]
+        else:
+            jobs_data[job_id] = [
+                (int(row["machine_id"]), int(row["processing_time_scaled"]))
+                for _, row in job_df.iterrows()
+            ]
+    return jobs_data
+
+
+def legacy_build_jobshop_results(jobs_data, all_tasks, solver, time_scale, use_setup_times):
+    results = []
+    for job_id, operations in jobs_data.items():
+        for task_id, op in enumerate(operations):
+            start_var, end_var, _, machine = all_tasks[(job_id, task_id)]
+            start_h = solver.Value(start_var) / time_scale
+            end_h = solver.Value(end_var) / time_scale
+            row = {
+                "job_id": job_id,
+                "operation_index": task_id,
+                "machine_id": machine,
+                "start_time_hours": round(start_h, 2),
+                "end_time_hours": round(end_h, 2),
+                "duration_hours": round(end_h - start_h, 2),
+            }
+            if use_setup_times:
+                row["setup_time_hours"] = round(op[2] / time_scale, 2)
+            row["processing_time_hours"] = round(op[1] / time_scale, 2)
+            results.append(row)
+    return results
+
+
+def _solved_dummy_model(jobs_data, use_setup_times):
+    """
+    Modelo con variables de dominio fijo (schedule serial por trabajo) para
+    medir solo la extracción de resultados, sin costo de búsqueda.
+    """
+    model = cp_model.CpModel()
+    all_tasks = {}
+    t = 0
+    for job_id, operations in jobs_data.items():
+        for task_id, op in enumerate(operations):
+            total = op[1] + (op[2] if use_setup_times else 0)
+            start = model.NewConstant(t)
+            end = model.NewConstant(t + total)
+            all_tasks[(job_id, task_id)] = (start, end, None, op[0])
+            t += total
+    solver = cp_model.CpSolver()
+    solver.Solve(model)
+    return all_tasks, solver
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def run(sizes, n_machines=20, time_scale=60, use_setup_times=True):
+    rows = []
+    for n_ops in sizes:
+        n_jobs = max(1, n_ops // n_machines)
+        raw = random_jobshop_df(n_jobs, n_machines, setup_max=0.5 if use_setup_times else 0.0)
+        df, use_setup = preprocess_jobshop_df(raw, time_scale, use_setup_times)
+        jobs_legacy, t_pre_legacy = _timed(legacy_build_jobs_data, df, use_setup)
+        jobs_data, t_pre = _timed(build_jobs_data, df, use_setup)
+        all_tasks, solver = _solved_dummy_model(jobs_data, use_setup)
+        res_legacy, t_post_legacy = _timed(
+            lambda: pd.DataFrame(
+                legacy_build_jobshop_results(jobs_data, all_tasks, solver, time_scale, use_setup)
+            )
+        )
+        res, t_post = _timed(
+            lambda: pd.DataFrame(
+                build_jobshop_results(jobs_data, all_tasks, solver, time_scale, use_setup)
+            )
+        )
+        pd.testing.assert_frame_equal(res_legacy, res, check_dtype=False)
+        rows.append(
+            {
+                "operations": n_jobs * n_machines,
+                "pre_legacy_s": round(t_pre_legacy, 4),
+                "pre_vectorized_s": round(t_pre, 4),
+                "post_legacy_s": round(t_post_legacy, 4),
+                "post_vectorized_s": round(t_post, 4),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--machines", type=int, default=20)
+    parser.add_argument("--no-setup", action="store_true")
+    args = parser.parse_args()
+    report = run(args.sizes, n_machines=args.machines, use_setup_times=not args.no_setup)
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Arranque en frío de la API: tiempo de import de `api.main`, memoria
+residente del proceso ocioso, tiempo hasta que `/readyz` responde 200 y
+memoria de cada proceso del pool, según cómo se crean esos procesos:
+
+    python -m benchmarks.bench_startup --contexts spawn forkserver --repeats 3
+
+Cada medición corre en un intérprete nuevo (`--probe`), que importa solo la
+API: este módulo no importa pandas ni el solver a nivel de módulo para no
+contaminar la medición. `worker_private_mb` es la memoria propia de cada
+proceso del pool (sin las páginas compartidas con el servidor `forkserver`);
+`solver_import_s` y `api_rss_solver_mb` son el costo que el import diferido
+saca del arranque (y que la API solo paga si atiende `/solve_heuristic`).
+La memoria se lee de `/proc`, así que solo se informa en Linux.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ("pandas", "numpy", "ortools", "matplotlib")
+READY_TIMEOUT = 120.0
+
+# Instancia mínima para el primer solve después de `/readyz`
+_FIRST_SOLVE = {
+    "operations": [
+        {"job_id": j, "operation_index": o, "machine_id": (j + o) % 3, "processing_time": 30 + 10 * o}
+        for j in range(3)
+        for o in range(3)
+    ],
+    "enforce_daily_limit": False,
+    "max_time": 5,
+}
+
+
+def _memory_mb(pid="self"):
+    # (residente, privada) en MB a partir de /proc; (None, None) fuera de Linux
+    rss = private = None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) / 1024
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            private = sum(
+                int(line.split()[1]) for line in f if line.startswith(("Private_Clean:", "Private_Dirty:"))
+            ) / 1024
+    except OSError:
+        pass
+    return rss, private
+
+
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def probe():
+    t0 = time.perf_counter()
+    import api.main
+
+    import_s = time.perf_counter() - t0
+    api_rss, _ = _memory_mb()
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    from fastapi.testclient import TestClient
+
+    from api.services.job_queue import current_solve_queue
+
+    t0 = time.perf_counter()
+    with TestClient(api.main.app) as client:
+        startup_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        while client.get("/readyz").status_code != 200:
+            if time.perf_counter() - t0 > READY_TIMEOUT:
+                raise RuntimeError("El pool no quedó listo")
+            time.sleep(0.01)
+        ready_s = time.perf_counter() - t0
+        workers = [_memory_mb(p.pid) for p in current_solve_queue()._executor._processes.values()]
+        t0 = time.perf_counter()
+        client.post("/schedule/solve", json=_FIRST_SOLVE).raise_for_status()
+        first_solve_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        import api.services.solve_service  # noqa: F401
+
+        solver_import_s = time.perf_counter() - t0
+    return {
+        "import_s": round(import_s, 3),
+        "heavy_modules": ",".join(heavy) or "-",
+        "api_rss_mb": _mean([api_rss]),
+        "startup_s": round(startup_s, 3),
+        "ready_s": round(ready_s, 3),
+        "worker_rss_mb": _mean([rss for rss, _ in workers]),
+        "worker_private_mb": _mean([private for _, private in workers]),
+        "first_solve_s": round(first_solve_s, 3),
+        "solver_import_s": round(solver_import_s, 3),
+        "api_rss_solver_mb": _mean([_memory_mb()[0]]),
+    }
+
+
+def _run_probe(mp_context, workers):
+    env = {**os.environ, "JSP_SOLVE_MP_CONTEXT": mp_context, "JSP_SOLVE_WORKERS": str(workers)}
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--probe"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(contexts, repeats=3, workers=2):
+    import pandas as pd
+
+    rows = []
+    for mp_context in contexts:
+        for repeat in range(repeats):
+            rows.append({"mp_context": mp_context, "repeat": repeat, **_run_probe(mp_context, workers)})
+    report = pd.DataFrame(rows)
+    numeric = report.drop(columns=["repeat", "heavy_modules"])
+    summary = numeric.groupby("mp_context", sort=False).median()
+    summary.insert(0, "heavy_modules", report.groupby("mp_context", sort=False)["heavy_modules"].first())
+    return summary.reset_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contexts", nargs="+", default=["spawn", "forkserver"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.probe:
+        print(json.dumps(probe()))
+        return
+    report = run(args.contexts, repeats=args.repeats, workers=args.workers)
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Costo de serializar la respuesta y de validar el request según el formato
+de transporte, para schedules grandes:
+
+    python -m benchmarks.bench_wire_format --sizes 5000 50000
+
+Por formato de respuesta se mide el tiempo desde el DataFrame de resultados
+hasta los bytes enviados (incluido el paso por el pool, que se simula con
+pickle) y el tamaño. `legacy` es el camino anterior: un `TaskOutput` por
+operación en el proceso del pool, `model_dump`, y otra validación y
+serialización de `SolveResponse` en la API. Para el request se compara
+validar `operations` por filas y por columnas y armar el DataFrame.
+"""
+import argparse
+import json
+import pickle
+import time
+
+import pandas as pd
+
+from api.schemas.schedule_schema import SolveRequest, SolveResponse, TaskOutput
+from api.services.solve_service import _build_response, operations_frame
+from api.services.wire_format import encode_arrow, encode_columnar, iter_ndjson, schedule_columns
+from benchmarks.generators import random_jobshop_df
+from src.optimization.model_builder import solve_jobshop_heuristic
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def _legacy(result):
+    columns = schedule_columns(result["schedule"])
+    records = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    worker = SolveResponse(**{**result, "schedule": [TaskOutput(**r) for r in records]}).model_dump()
+    return SolveResponse(**pickle.loads(pickle.dumps(worker))).model_dump_json().encode()
+
+
+def _encoders():
+    encoders = {
+        "legacy": _legacy,
+        "json": lambda r: SolveResponse(**pickle.loads(pickle.dumps(r))).model_dump_json().encode(),
+        "columnar": lambda r: encode_columnar(pickle.loads(pickle.dumps(r))),
+        "ndjson": lambda r: b"".join(iter_ndjson(pickle.loads(pickle.dumps(r)))),
+    }
+    try:
+        import pyarrow  # noqa: F401
+
+        encoders["arrow"] = lambda r: encode_arrow(pickle.loads(pickle.dumps(r)))
+    except ImportError:
+        print("⚠️ pyarrow no está instalado: se omite el formato arrow")
+    return encoders
+
+
+def run(sizes, n_machines=20, H_daily_hours=8):
+    encoders = _encoders()
+    rows = []
+    for n_ops in sizes:
+        n_jobs = max(1, n_ops // n_machines)
+        df = random_jobshop_df(n_jobs, n_machines, seed=0)
+        schedule_df = solve_jobshop_heuristic(df, enforce_daily_limit=False, rule="spt", time_limit=0.0)
+        result, t_build = _timed(_build_response, schedule_df, H_daily_hours)
+        for fmt, encode in encoders.items():
+            body, t_encode = _timed(encode, result)
+            rows.append(
+                {
+                    "operations": len(schedule_df),
+                    "direction": "response",
+                    "format": fmt,
+                    "time_s": round(t_build + t_encode, 4),
+                    "size_mb": round(len(body) / 1e6, 2),
+                }
+            )
+        ops = df[["job_id", "operation_index", "machine_id", "processing_time"]]
+        bodies = {
+            "rows": json.dumps({"operations": ops.to_dict("records")}),
+            "columnar": json.dumps({"operations": {c: ops[c].tolist() for c in ops.columns}}),
+        }
+        for fmt, body in bodies.items():
+            _, t_parse = _timed(lambda b: operations_frame(SolveRequest.model_validate_json(b).operations), body)
+            rows.append(
+                {
+                    "operations": len(ops),
+                    "direction": "request",
+                    "format": fmt,
+                    "time_s": round(t_parse, 4),
+                    "size_mb": round(len(body) / 1e6, 2),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--machines", type=int, default=20)
+    args = parser.parse_args()
+    report = run(args.sizes, n_machines=args.machines)
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
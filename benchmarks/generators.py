@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+
+def random_jobshop_df(
+    n_jobs: int,
+    n_machines: int,
+    min_time: float = 0.25,
+    max_time: float = 3.0,
+    setup_max: float = 0.0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Genera una instancia JSP aleatoria con el mismo formato que recibe la API:
+    cada trabajo visita todas las máquinas en una permutación aleatoria.
+    Si `setup_max > 0` agrega la columna `setup_time`.
+    """
+    rng = np.random.default_rng(seed)
+    n_ops = n_jobs * n_machines
+    machines = np.argsort(rng.random((n_jobs, n_machines)), axis=1).ravel()
+    data = {
+        "job_id": np.repeat(np.arange(n_jobs), n_machines),
+        "operation_index": np.tile(np.arange(n_machines), n_jobs),
+        "machine_id": machines,
+        "processing_time": np.round(rng.uniform(min_time, max_time, n_ops), 2),
+    }
+    if setup_max > 0:
+        data["setup_time"] = np.round(rng.uniform(0, setup_max, n_ops), 2)
+    return pd.DataFrame(data)
+
+
+def random_flexible_jobshop_df(
+    n_jobs: int,
+    n_centers: int,
+    machines_per_center: int = 2,
+    min_time: float = 0.25,
+    max_time: float = 3.0,
+    speed_spread: float = 0.0,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Genera una instancia JSP flexible: cada trabajo visita todos los centros
+    de trabajo en una permutación aleatoria y cada operación puede hacerse en
+    cualquiera de las `machines_per_center` máquinas paralelas de su centro
+    (una fila por máquina elegible). Con `speed_spread = 0` las máquinas de
+    un centro son idénticas; si no, cada una tiene su propia duración, hasta
+    `speed_spread` veces más lenta.
+    """
+    rng = np.random.default_rng(seed)
+    centers = np.argsort(rng.random((n_jobs, n_centers)), axis=1).ravel()
+    base = rng.uniform(min_time, max_time, n_jobs * n_centers)
+    k = machines_per_center
+    factors = 1 + speed_spread * rng.random((n_jobs * n_centers, k))
+    data = {
+        "job_id": np.repeat(np.arange(n_jobs), n_centers * k),
+        "operation_index": np.repeat(np.tile(np.arange(n_centers), n_jobs), k),
+        "machine_id": (np.repeat(centers, k) * k + np.tile(np.arange(k), n_jobs * n_centers)),
+        "processing_time": np.round((base[:, None] * factors).ravel(), 2),
+    }
+    return pd.DataFrame(data)
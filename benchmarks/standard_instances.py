@@ -0,0 +1,88 @@
+"""
+Instancias JSP estándar (OR-Library / Taillard) guardadas en `benchmarks/data`.
+
+Se aceptan los dos formatos de texto habituales:
+
+- OR-Library (`ft06`, `la01`): una línea `n_trabajos n_máquinas` y luego una
+  línea por trabajo con pares `máquina duración` (máquinas desde 0). Las
+  líneas que no son numéricas (comentarios, encabezados) se ignoran.
+- Taillard (`ta01`): encabezado con semillas y cotas, una matriz `Times` y
+  otra `Machines` (máquinas desde 1).
+
+Las duraciones son enteras: con `time_scale=1` el modelo las usa tal cual y
+el makespan en "horas" coincide con el de la literatura.
+"""
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# Mejores makespans conocidos (óptimos probados en los tres casos)
+BEST_KNOWN = {"ft06": 55, "la01": 666, "ta01": 1231}
+
+
+def _int_rows(lines: List[str]) -> List[List[int]]:
+    rows = []
+    for line in lines:
+        tokens = line.split()
+        if tokens and all(t.lstrip("-").isdigit() for t in tokens):
+            rows.append([int(t) for t in tokens])
+    return rows
+
+
+def _to_df(machines, durations) -> pd.DataFrame:
+    records = [
+        {
+            "job_id": job_id,
+            "operation_index": k,
+            "machine_id": machine,
+            "processing_time": duration,
+        }
+        for job_id, (job_machines, job_durations) in enumerate(zip(machines, durations))
+        for k, (machine, duration) in enumerate(zip(job_machines, job_durations))
+    ]
+    return pd.DataFrame(records)
+
+
+def parse_orlib(text: str) -> pd.DataFrame:
+    rows = _int_rows(text.splitlines())
+    n_jobs, n_machines = rows[0][:2]
+    jobs = rows[1 : 1 + n_jobs]
+    if len(jobs) < n_jobs or any(len(row) != 2 * n_machines for row in jobs):
+        raise ValueError("Formato OR-Library inválido: se esperaban pares máquina/duración por trabajo")
+    return _to_df([row[0::2] for row in jobs], [row[1::2] for row in jobs])
+
+
+def parse_taillard(text: str) -> pd.DataFrame:
+    lines = text.splitlines()
+    headers = [line.strip().lower() for line in lines]
+    times_at, machines_at = headers.index("times"), headers.index("machines")
+    n_jobs, n_machines = _int_rows(lines[:times_at])[0][:2]
+    durations = _int_rows(lines[times_at + 1 : machines_at])[:n_jobs]
+    machines = _int_rows(lines[machines_at + 1 :])[:n_jobs]
+    if len(durations) < n_jobs or len(machines) < n_jobs:
+        raise ValueError("Formato Taillard inválido: faltan filas en Times o Machines")
+    return _to_df([[m - 1 for m in row[:n_machines]] for row in machines], durations)
+
+
+def parse_instance(text: str) -> pd.DataFrame:
+    """
+    DataFrame con el formato de la API (`job_id`, `operation_index`,
+    `machine_id`, `processing_time`) a partir del texto de una instancia.
+    """
+    if any(line.strip().lower() == "times" for line in text.splitlines()):
+        return parse_taillard(text)
+    return parse_orlib(text)
+
+
+def available_instances() -> List[str]:
+    return sorted(path.stem for path in DATA_DIR.glob("*.txt"))
+
+
+def load_instance(name: str) -> pd.DataFrame:
+    path = DATA_DIR / f"{name}.txt"
+    if not path.exists():
+        raise ValueError(f"Instancia desconocida: {name} (disponibles: {available_instances()})")
+    return parse_instance(path.read_text())
@@ -0,0 +1,309 @@
+"""
+Suite de benchmarks con reporte JSON y comparación contra una línea base:
+
+    python -m benchmarks.suite run --suite standard --budget 10 --output report.json
+    python -m benchmarks.suite compare report.json benchmarks/baselines/standard.json
+
+`run` ejecuta cada modo sobre cada instancia de la suite con el mismo
+presupuesto de tiempo y semilla, cada corrida en un proceso nuevo para que
+la memoria máxima sea la suya. CP-SAT corre en modo determinista (el
+presupuesto es tiempo determinista y el makespan es reproducible; el tiempo
+de reloj puede ser mayor) salvo con `--wall-clock`. Por corrida se
+registra el tiempo de construcción del modelo, el de resolución, el
+makespan, el gap contra el mejor valor conocido y la memoria residente
+máxima. `compare` marca como regresión un makespan peor, o tiempos de
+construcción y memoria por encima de la tolerancia, y termina con código 1.
+"""
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmarks.generators import random_jobshop_df
+from benchmarks.standard_instances import BEST_KNOWN, load_instance
+from src.optimization.decomposition import solve_jobshop_decomposition
+from src.optimization.model_builder import (
+    BUILD_PHASES,
+    SOLVE_PHASES,
+    solve_jobshop,
+    solve_jobshop_heuristic,
+    solve_jobshop_local_search,
+    solve_jobshop_two_stage,
+)
+from src.optimization.solver_config import SolverConfig
+from src.utils.helpers import peak_rss_mb
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    Instancia de la suite con los parámetros del request que la acompañan.
+    """
+
+    name: str
+    time_scale: int = 1
+    H_daily_hours: int = 8
+    enforce_daily_limit: bool = False
+    use_setup_times: bool = False
+    best_known: Optional[float] = None
+
+    def load(self) -> pd.DataFrame:
+        if self.name in BEST_KNOWN:
+            return load_instance(self.name)
+        # Sintéticas: "rand_<trabajos>x<máquinas>[_setup]", semilla fija
+        size = self.name.split("_")[1]
+        n_jobs, n_machines = (int(x) for x in size.split("x"))
+        setup_max = 0.5 if self.use_setup_times else 0.0
+        return random_jobshop_df(n_jobs, n_machines, setup_max=setup_max, seed=0)
+
+
+SUITES: Dict[str, List[BenchmarkCase]] = {
+    "standard": [BenchmarkCase(name, best_known=bk) for name, bk in BEST_KNOWN.items()],
+    "synthetic": [
+        BenchmarkCase("rand_20x5_setup", time_scale=60, enforce_daily_limit=True, use_setup_times=True),
+        BenchmarkCase("rand_30x10", time_scale=60, enforce_daily_limit=True),
+        BenchmarkCase("rand_50x10_setup", time_scale=60, enforce_daily_limit=True, use_setup_times=True),
+        BenchmarkCase("rand_100x20", time_scale=60, enforce_daily_limit=False),
+    ],
+}
+
+MODES = ("solve", "two_stage", "local_search", "heuristic", "decomposition")
+
+
+def _mode_runner(mode: str, budget: float, seed: int, deterministic: bool = True) -> Callable:
+    # Todos los modos con el mismo presupuesto total de tiempo
+    config = SolverConfig(deterministic=deterministic, random_seed=seed)
+    if mode == "solve":
+        return lambda df, **kw: solve_jobshop(df, max_time=budget, solver_config=config, **kw)
+    if mode == "two_stage":
+        return lambda df, **kw: solve_jobshop_two_stage(
+            df,
+            max_time_stage1=budget * 0.7,
+            max_time_stage2=budget * 0.3,
+            solver_config=config,
+            **kw,
+        )
+    if mode == "local_search":
+        return lambda df, **kw: solve_jobshop_local_search(df, max_time=budget, seed=seed, **kw)
+    if mode == "heuristic":
+        return lambda df, **kw: solve_jobshop_heuristic(df, time_limit=min(budget, 0.5), seed=seed, **kw)
+    if mode == "decomposition":
+        return lambda df, **kw: solve_jobshop_decomposition(
+            df, max_time=budget, solver_config=config, **kw
+        )
+    raise ValueError(f"Modo desconocido: {mode}")
+
+
+def run_case(case: BenchmarkCase, mode: str, budget: float, seed: int, deterministic: bool = True) -> dict:
+    """
+    Ejecuta un modo sobre una instancia y devuelve la fila del reporte.
+    """
+    df = case.load()
+    t0 = time.perf_counter()
+    schedule_df = _mode_runner(mode, budget, seed, deterministic)(
+        df,
+        time_scale=case.time_scale,
+        H_daily_hours=case.H_daily_hours,
+        enforce_daily_limit=case.enforce_daily_limit,
+        use_setup_times=case.use_setup_times,
+    )
+    wall_time = time.perf_counter() - t0
+    timings = schedule_df.attrs.get("timings", {})
+    makespan = None if schedule_df.empty else float(schedule_df["end_time_hours"].max())
+    gap = None
+    if makespan is not None and case.best_known:
+        gap = round((makespan - case.best_known) / case.best_known, 4)
+    return {
+        "instance": case.name,
+        "mode": mode,
+        "n_operations": len(df),
+        "budget_s": budget,
+        "seed": seed,
+        "makespan": makespan,
+        "best_known": case.best_known,
+        "gap": gap,
+        "build_time_s": round(sum(timings.get(k, 0.0) for k in BUILD_PHASES), 4),
+        "solve_time_s": round(sum(timings.get(k, 0.0) for k in SOLVE_PHASES), 4),
+        "wall_time_s": round(wall_time, 4),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(
+    suite: str, modes, budget: float, seed: int = 0, instances=None, deterministic: bool = True
+) -> dict:
+    """
+    Ejecuta la suite y devuelve el reporte `{"meta": ..., "runs": [...]}`.
+    """
+    import ortools
+
+    cases = [c for c in SUITES[suite] if not instances or c.name in instances]
+    runs = []
+    for case in cases:
+        for mode in modes:
+            # Un proceso por corrida: la memoria máxima no se acumula
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+                row = pool.submit(run_case, case, mode, budget, seed, deterministic).result()
+            print(
+                f"📊 {row['instance']:<18} {row['mode']:<14} makespan={row['makespan']} "
+                f"gap={row['gap']} build={row['build_time_s']}s solve={row['solve_time_s']}s "
+                f"rss={row['peak_rss_mb']}MB"
+            )
+            runs.append(row)
+    meta = {
+        "suite": suite,
+        "cases": [asdict(c) for c in cases],
+        "modes": list(modes),
+        "budget_s": budget,
+        "seed": seed,
+        "deterministic": deterministic,
+        "commit": _git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "ortools": ortools.__version__,
+        "platform": platform.platform(),
+    }
+    return {"meta": meta, "runs": runs}
+
+
+def compare_reports(
+    report: dict,
+    baseline: dict,
+    makespan_tol: float = 0.01,
+    time_tol: float = 0.5,
+    rss_tol: float = 0.25,
+    min_time_delta: float = 0.05,
+) -> List[dict]:
+    """
+    Compara corrida por corrida (`instance`, `mode`) contra la línea base.
+    Devuelve las regresiones: makespan mayor en más de `makespan_tol`
+    (relativo), tiempo de construcción mayor en más de `time_tol` (y de
+    `min_time_delta` segundos, para ignorar ruido), memoria máxima mayor en
+    más de `rss_tol`, o corridas que ya no encuentran solución. El tiempo
+    de resolución no se compara: está acotado por el presupuesto.
+    """
+    base = {(r["instance"], r["mode"]): r for r in baseline["runs"]}
+    regressions = []
+
+    def flag(row, metric, old, new):
+        regressions.append(
+            {"instance": row["instance"], "mode": row["mode"], "metric": metric, "baseline": old, "current": new}
+        )
+
+    for row in report["runs"]:
+        old = base.get((row["instance"], row["mode"]))
+        if old is None:
+            continue
+        if old["makespan"] is not None and row["makespan"] is None:
+            flag(row, "makespan", old["makespan"], None)
+        elif old["makespan"] is not None and row["makespan"] > old["makespan"] * (1 + makespan_tol):
+            flag(row, "makespan", old["makespan"], row["makespan"])
+        build, old_build = row["build_time_s"], old["build_time_s"]
+        if build > old_build * (1 + time_tol) and build - old_build > min_time_delta:
+            flag(row, "build_time_s", old_build, build)
+        rss, old_rss = row.get("peak_rss_mb"), old.get("peak_rss_mb")
+        if rss is not None and old_rss is not None and rss > old_rss * (1 + rss_tol):
+            flag(row, "peak_rss_mb", old_rss, rss)
+    return regressions
+
+
+def _print_comparison(report, baseline, regressions):
+    base = {(r["instance"], r["mode"]): r for r in baseline["runs"]}
+    rows = []
+    for row in report["runs"]:
+        old = base.get((row["instance"], row["mode"]), {})
+        rows.append(
+            {
+                "instance": row["instance"],
+                "mode": row["mode"],
+                "makespan": row["makespan"],
+                "baseline_makespan": old.get("makespan"),
+                "gap": row["gap"],
+                "build_time_s": row["build_time_s"],
+                "baseline_build_time_s": old.get("build_time_s"),
+                "peak_rss_mb": row["peak_rss_mb"],
+                "baseline_peak_rss_mb": old.get("peak_rss_mb"),
+            }
+        )
+    print(pd.DataFrame(rows).to_string(index=False))
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresiones:")
+        print(pd.DataFrame(regressions).to_string(index=False))
+    else:
+        print("\n✅ Sin regresiones respecto de la línea base.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_p = sub.add_parser("run", help="ejecuta una suite y escribe el reporte JSON")
+    run_p.add_argument("--suite", choices=sorted(SUITES), default="standard")
+    run_p.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    run_p.add_argument("--instances", nargs="+", default=None)
+    run_p.add_argument("--budget", type=float, default=10)
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--wall-clock", action="store_true", help="CP-SAT con límite de tiempo de reloj")
+    run_p.add_argument("--output", default=None)
+    run_p.add_argument("--baseline", default=None, help="compara el reporte con esta línea base")
+    cmp_p = sub.add_parser("compare", help="compara un reporte con una línea base")
+    cmp_p.add_argument("report")
+    cmp_p.add_argument("baseline")
+    for p in (run_p, cmp_p):
+        p.add_argument("--makespan-tol", type=float, default=0.01)
+        p.add_argument("--time-tol", type=float, default=0.5)
+        p.add_argument("--rss-tol", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.command == "run":
+        report = run_suite(
+            args.suite,
+            args.modes,
+            args.budget,
+            seed=args.seed,
+            instances=args.instances,
+            deterministic=not args.wall_clock,
+        )
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Reporte guardado en {args.output}")
+        if not args.baseline:
+            return
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        with open(args.report) as f:
+            report = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare_reports(
+        report,
+        baseline,
+        makespan_tol=args.makespan_tol,
+        time_tol=args.time_tol,
+        rss_tol=args.rss_tol,
+    )
+    _print_comparison(report, baseline, regressions)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
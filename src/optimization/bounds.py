@@ -0,0 +1,291 @@
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+from src.optimization.instance import JobShopInstance
+
+
+@dataclass
+class ScheduleBounds:
+    """
+    Cotas precalculadas para el modelo CP-SAT, alineadas con el orden de
+    operaciones de `JobShopInstance`.
+
+    - `horizon`: cota superior del makespan (greedy o trivial).
+    - `lower_bound`: cota inferior del makespan, máximo de `components`
+      redondeado por la jornada si hay límite diario.
+    - `components`: cada cota inferior combinatoria (`job_length`,
+      `machine_load`, `jackson`).
+    - `start_min` / `end_max`: ventana [release, deadline] de cada operación.
+    - `day_min` / `day_max`: rango de días posible si hay límite diario.
+    """
+
+    horizon: int
+    lower_bound: int
+    start_min: np.ndarray
+    end_max: np.ndarray
+    day_min: Optional[np.ndarray] = None
+    day_max: Optional[np.ndarray] = None
+    greedy_makespan: Optional[int] = None
+    components: dict = field(default_factory=dict)
+
+    def time_windows(self, instance: JobShopInstance) -> dict:
+        return {
+            key: window
+            for key, window in zip(
+                zip(instance.job_ids.tolist(), instance.task_ids.tolist()),
+                zip(self.start_min.tolist(), self.end_max.tolist()),
+            )
+        }
+
+    def day_windows(self, instance: JobShopInstance) -> Optional[dict]:
+        if self.day_min is None:
+            return None
+        return {
+            key: window
+            for key, window in zip(
+                zip(instance.job_ids.tolist(), instance.task_ids.tolist()),
+                zip(self.day_min.tolist(), self.day_max.tolist()),
+            )
+        }
+
+
+def fits_in_day(start: int, duration: int, H_daily: int) -> bool:
+    # Misma semántica que el modelo: inicio y término caen en el mismo día
+    return duration == 0 or start // H_daily == (start + duration) // H_daily
+
+
+def earliest_day_start(start: int, duration: int, H_daily: Optional[int]) -> int:
+    if not H_daily or fits_in_day(start, duration, H_daily):
+        return start
+    return (start // H_daily + 1) * H_daily
+
+
+def latest_day_end(end: int, duration: int, H_daily: Optional[int]) -> int:
+    if not H_daily or fits_in_day(end - duration, duration, H_daily):
+        return end
+    return (end // H_daily) * H_daily - 1
+
+
+def jackson_preemptive_bound(machines: np.ndarray, p: np.ndarray, heads: np.ndarray, tails: np.ndarray) -> int:
+    """
+    Cota de Jackson: para cada máquina, óptimo del problema de una máquina
+    con cabezas (release), colas (entrega) e interrupciones permitidas, que
+    resuelve exactamente la regla de mayor cola primero. El máximo sobre las
+    máquinas es cota inferior del job shop y domina a cabeza mínima + carga +
+    cola mínima. O(n log n).
+    """
+    if len(p) == 0:
+        return 0
+    order = np.lexsort((heads, machines))
+    boundaries = np.flatnonzero(np.diff(machines[order])) + 1
+    best = 0
+    for group in np.split(order, boundaries):
+        r, d, q = heads[group].tolist(), p[group].tolist(), tails[group].tolist()
+        n = len(r)
+        heap = []
+        t = i = 0
+        while i < n or heap:
+            if not heap:
+                t = max(t, r[i])
+            while i < n and r[i] <= t:
+                heapq.heappush(heap, (-q[i], d[i]))
+                i += 1
+            neg_q, remaining = heapq.heappop(heap)
+            if i < n and t + remaining > r[i]:
+                # Llega otra operación antes de terminar: se interrumpe y se re-elige
+                heapq.heappush(heap, (neg_q, remaining - (r[i] - t)))
+                t = r[i]
+            else:
+                t += remaining
+                best = max(best, t - neg_q)
+    return best
+
+
+def round_to_day(lower_bound: int, H_daily: int, last_duration: int) -> int:
+    """
+    Con límite diario, el makespan es el término de la última operación de
+    algún trabajo, que cae al menos `last_duration` (la menor duración de
+    una última operación) después del inicio de su jornada.
+    """
+    if last_duration <= 0 or lower_bound % H_daily >= last_duration:
+        return lower_bound
+    return (lower_bound // H_daily) * H_daily + last_duration
+
+
+def bounds_report(
+    bounds: ScheduleBounds,
+    time_scale: int,
+    makespan: Optional[int] = None,
+    solver_bound: Optional[float] = None,
+) -> dict:
+    """
+    Cotas inferiores del makespan en horas: las combinatorias de
+    `compute_bounds`, `combinatorial` (su máximo), la de CP-SAT (`solver`,
+    `BestObjectiveBound`) y `best`, la mayor. Con `makespan` (escalado) se
+    informa el gap relativo contra `best`: un gap 0 prueba optimalidad
+    aunque el solver no haya terminado.
+    """
+    best = bounds.lower_bound
+    if solver_bound is not None:
+        solver_bound = int(math.ceil(solver_bound - 1e-6))
+        best = max(best, solver_bound)
+    report = {name: round(value / time_scale, 2) for name, value in bounds.components.items()}
+    report.update(
+        {
+            "combinatorial": round(bounds.lower_bound / time_scale, 2),
+            "solver": round(solver_bound / time_scale, 2) if solver_bound is not None else None,
+            "best": round(best / time_scale, 2),
+            "gap": round(max(0, makespan - best) / max(1, makespan), 6) if makespan is not None else None,
+        }
+    )
+    return report
+
+
+def greedy_upper_bound(
+    instance: JobShopInstance, H_daily: Optional[int] = None
+) -> Optional[int]:
+    """
+    Makespan de un schedule constructivo (regla de menor inicio posible).
+    Devuelve None si alguna operación no cabe en una jornada.
+    """
+    p = instance.total_durations.tolist()
+    machines = instance.machines.tolist()
+    offsets = instance.job_offsets.tolist()
+    if H_daily and any(d >= H_daily for d in p if d > 0):
+        return None
+    machine_ready = {}
+    job_ready = [0] * len(instance.jobs)
+    heap = [(0, k, offsets[k]) for k in range(len(instance.jobs)) if offsets[k] < offsets[k + 1]]
+    heapq.heapify(heap)
+    makespan = 0
+    while heap:
+        key, k, i = heapq.heappop(heap)
+        start = max(job_ready[k], machine_ready.get(machines[i], 0))
+        start = earliest_day_start(start, p[i], H_daily)
+        if start > key:
+            # La máquina se ocupó desde que se encoló: reevaluar
+            heapq.heappush(heap, (start, k, i))
+            continue
+        end = start + p[i]
+        machine_ready[machines[i]] = end
+        job_ready[k] = end
+        makespan = max(makespan, end)
+        if i + 1 < offsets[k + 1]:
+            heapq.heappush(heap, (end, k, i + 1))
+    return makespan
+
+
+def compute_bounds(
+    instance: JobShopInstance,
+    enforce_daily_limit: bool = False,
+    H_daily: Optional[int] = None,
+    start_time_fixed_map: Optional[dict] = None,
+    time_scale: int = 60,
+    upper_bound: Optional[int] = None,
+    release_time: int = 0,
+    machine_downtime: Optional[dict] = None,
+    tight_horizon: bool = True,
+) -> ScheduleBounds:
+    """
+    Calcula horizonte, cota inferior y ventanas por operación a partir de
+    cabezas/colas de cada cadena de trabajo, cargas de máquina y una cota
+    superior greedy. `upper_bound` es el makespan de un schedule factible
+    conocido (por ejemplo, heurístico) y puede acotar aún más el horizonte.
+    Ambas cotas superiores solo valen si el objetivo es el makespan: con
+    `tight_horizon=False` (otros objetivos, donde el óptimo puede terminar
+    más tarde) se usa el horizonte trivial, ampliado hasta `upper_bound` si
+    hace falta para que el schedule conocido siga siendo factible.
+    Las operaciones sin inicio fijo no comienzan antes de `release_time`;
+    `machine_downtime` (`{máquina: [(inicio, fin), ...]}`) solo extiende el
+    horizonte de respaldo. Todos los tiempos están escalados.
+    """
+    H = int(H_daily) if enforce_daily_limit and H_daily else None
+    p = instance.total_durations
+    p_list = p.tolist()
+    offsets = instance.job_offsets.tolist()
+    n = instance.n_operations
+    fixed = instance.scaled_fixed_starts(start_time_fixed_map, time_scale)
+
+    # Cabezas: inicio más temprano por precedencia (y jornada)
+    start_min = [0] * n
+    for k in range(len(offsets) - 1):
+        t = release_time
+        for i in range(offsets[k], offsets[k + 1]):
+            t = earliest_day_start(max(t, release_time), p_list[i], H)
+            if i in fixed:
+                t = fixed[i]
+            start_min[i] = t
+            t += p_list[i]
+    start_min = np.asarray(start_min, dtype=np.int64)
+    last_ops = np.asarray(offsets[1:], dtype=np.int64) - 1
+    job_lengths = start_min[last_ops] + p[last_ops]
+
+    # Colas: trabajo restante luego de cada operación
+    tails = np.zeros(n, dtype=np.int64)
+    for k in range(len(offsets) - 1):
+        acc = 0
+        for i in range(offsets[k + 1] - 1, offsets[k] - 1, -1):
+            tails[i] = acc
+            acc += p_list[i]
+
+    # Cotas inferiores: trabajo más largo, carga de máquina con cabeza/cola
+    # mínimas y relajación de una máquina con interrupciones (Jackson)
+    components = {"job_length": int(job_lengths.max()) if n else 0, "machine_load": 0, "jackson": 0}
+    if n:
+        machine_codes, machine_idx = np.unique(instance.machines, return_inverse=True)
+        load = np.bincount(machine_idx, weights=p, minlength=len(machine_codes))
+        min_head = np.full(len(machine_codes), np.iinfo(np.int64).max)
+        min_tail = np.full(len(machine_codes), np.iinfo(np.int64).max)
+        np.minimum.at(min_head, machine_idx, start_min)
+        np.minimum.at(min_tail, machine_idx, tails)
+        components["machine_load"] = int((min_head + load + min_tail).max())
+        components["jackson"] = jackson_preemptive_bound(machine_idx, p, start_min, tails)
+    lower_bound = max(components.values())
+    if H and n:
+        lower_bound = round_to_day(lower_bound, H, int(p[last_ops].min()))
+
+    downtime_end = max(
+        (end for intervals in (machine_downtime or {}).values() for _, end in intervals),
+        default=0,
+    )
+    constrained = fixed or release_time or downtime_end
+    greedy = None if constrained or not tight_horizon else greedy_upper_bound(instance, H)
+    if tight_horizon and (greedy is not None or upper_bound is not None):
+        horizon = min(b for b in (greedy, upper_bound) if b is not None)
+    else:
+        # Respaldo: mismo horizonte trivial que antes, extendido por inicios fijos
+        total = int(p.sum())
+        horizon = 2 * total
+        if fixed:
+            horizon = max(horizon, max(fixed[i] + p_list[i] for i in fixed) + total)
+        horizon = max(horizon, max(release_time, downtime_end) + 2 * total, upper_bound or 0)
+    horizon = max(horizon, lower_bound)
+
+    # Deadlines: término más tardío compatible con el horizonte y sucesores
+    end_max = [0] * n
+    for k in range(len(offsets) - 1):
+        t = horizon
+        for i in range(offsets[k + 1] - 1, offsets[k] - 1, -1):
+            if i in fixed:
+                t = min(t, fixed[i] + p_list[i])
+            t = latest_day_end(t, p_list[i], H)
+            end_max[i] = max(t, start_min[i] + p_list[i])
+            t = end_max[i] - p_list[i]
+    end_max = np.asarray(end_max, dtype=np.int64)
+
+    day_min = day_max = None
+    if H:
+        day_min = start_min // H
+        day_max = np.maximum(end_max // H, day_min)
+    return ScheduleBounds(
+        horizon=int(horizon),
+        lower_bound=int(lower_bound),
+        start_min=start_min,
+        end_max=end_max,
+        day_min=day_min,
+        day_max=day_max,
+        greedy_makespan=greedy,
+        components=components,
+    )
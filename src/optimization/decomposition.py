@@ -0,0 +1,276 @@
+import time
+from typing import Callable, Optional
+from ortools.sat.python import cp_model
+import numpy as np
+import pandas as pd
+from src.optimization.bounds import bounds_report, compute_bounds
+from src.optimization.heuristics import best_dispatch
+from src.optimization.incumbents import watch_stop
+from src.optimization.instance import build_instance
+from src.optimization.local_search import left_shift
+from src.optimization.model_builder import (
+    NO_DISPATCH,
+    WARM_START_RULES,
+    add_solution_hint,
+    attach_solve_info,
+    build_start_time_fixed_map,
+    create_cp_variables_and_constraints,
+    preprocess_jobshop_df,
+    solution_values,
+)
+from src.optimization.solver_config import SolverConfig, make_solver
+from src.utils.helpers import PhaseTimer, peak_rss_mb
+
+
+def time_windows_by_count(starts, movable, window_size, overlap):
+    """
+    Parte las operaciones movibles, ordenadas por inicio, en ventanas de
+    `window_size` operaciones que se solapan en `overlap`.
+    """
+    order = np.flatnonzero(movable)
+    order = order[np.argsort(starts[order], kind="stable")]
+    step = max(1, window_size - overlap)
+    windows = []
+    for a in range(0, len(order), step):
+        windows.append(np.sort(order[a : a + window_size]))
+        if a + window_size >= len(order):
+            break
+    return windows
+
+
+def _solve_window(
+    instance,
+    starts,
+    free,
+    makespan,
+    enforce_daily_limit,
+    H_daily_hours,
+    time_scale,
+    daily_limit_encoding,
+    time_limit,
+    solver_config,
+    stop_requested,
+):
+    """
+    Re-optimiza las operaciones `free` con el resto fijo: cada una queda
+    entre el término de la operación fija anterior de su trabajo y el inicio
+    de la siguiente (o el makespan actual), y las operaciones fijas de sus
+    máquinas entran al modelo como intervalos de indisponibilidad. Minimiza
+    el término de la ventana y, en segundo lugar, la suma de términos.
+    Devuelve `(estado, nuevos inicios de free o None, tiempo de construcción,
+    tiempo de resolución)`.
+    """
+    t0 = time.perf_counter()
+    p = instance.total_durations
+    ends = starts + p
+    is_free = np.zeros(instance.n_operations, dtype=bool)
+    is_free[free] = True
+    offsets = instance.job_offsets
+    job_of = np.repeat(np.arange(len(instance.jobs)), np.diff(offsets))
+
+    jobs_data = {}
+    time_windows = {}
+    for i in free.tolist():
+        first, last = offsets[job_of[i]], offsets[job_of[i] + 1]
+        prev = i - 1
+        while prev >= first and is_free[prev]:
+            prev -= 1
+        nxt = i + 1
+        while nxt < last and is_free[nxt]:
+            nxt += 1
+        start_min = int(ends[prev]) if prev >= first else 0
+        end_max = int(starts[nxt]) if nxt < last else int(makespan)
+        jobs_data[i] = [(int(instance.machines[i]), int(p[i]))]
+        time_windows[(i, 0)] = (start_min, end_max)
+
+    # Operaciones fijas que pueden interferir con la ventana
+    blocked = {}
+    for machine in np.unique(instance.machines[free]).tolist():
+        on_machine = free[instance.machines[free] == machine]
+        lo = min(time_windows[(i, 0)][0] for i in on_machine.tolist())
+        hi = max(time_windows[(i, 0)][1] for i in on_machine.tolist())
+        others = np.flatnonzero(
+            (instance.machines == machine) & ~is_free & (p > 0) & (ends > lo) & (starts < hi)
+        )
+        if len(others):
+            blocked[machine] = list(zip(starts[others].tolist(), ends[others].tolist()))
+
+    model = cp_model.CpModel()
+    all_tasks, job_ends = create_cp_variables_and_constraints(
+        model,
+        jobs_data,
+        int(makespan),
+        enforce_daily_limit,
+        H_daily_hours,
+        time_scale,
+        False,
+        time_windows=time_windows,
+        daily_limit_encoding=daily_limit_encoding,
+        machine_downtime=blocked,
+    )
+    free_list = free.tolist()
+    for a, b in zip(free_list, free_list[1:]):
+        if job_of[a] == job_of[b] and b == a + 1:
+            model.Add(all_tasks[(b, 0)][0] >= all_tasks[(a, 0)][1])
+    end_vars = [job_ends[i] for i in free_list]
+    window_end = model.NewIntVar(0, int(makespan), "window_end")
+    model.AddMaxEquality(window_end, end_vars)
+    model.Minimize(len(free_list) * window_end + cp_model.LinearExpr.Sum(end_vars))
+    start_vars = [all_tasks[(i, 0)][0] for i in free_list]
+    add_solution_hint(model, start_vars, starts[free])
+    build_time = time.perf_counter() - t0
+
+    solver, _ = make_solver(time_limit, solver_config)
+    done = watch_stop(solver, stop_requested)
+    try:
+        status = solver.Solve(model)
+    finally:
+        done()
+    solve_time = time.perf_counter() - t0 - build_time
+    values = None
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        values = solution_values(solver, start_vars)
+    return solver.StatusName(status), values, build_time, solve_time
+
+
+def solve_jobshop_decomposition(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    max_time: float = 60,
+    fixed_starts: dict = None,
+    window_size: int = 100,
+    window_overlap: Optional[int] = None,
+    window_time: float = 2.0,
+    daily_limit_encoding: str = "auto",
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+):
+    """
+    Descomposición por ventanas de tiempo (LNS) para instancias demasiado
+    grandes para un único modelo CP-SAT.
+
+    Parte del mejor schedule de las reglas de despacho y recorre el horizonte
+    en ventanas de `window_size` operaciones consecutivas por inicio
+    (solapadas en `window_overlap`, por defecto un cuarto). En cada ventana se
+    resuelve un modelo pequeño con las demás operaciones fijas durante a lo
+    sumo `window_time` segundos; como el schedule actual se usa de hint, el
+    resultado nunca empeora. Después de cada ventana el schedule se desplaza a
+    la izquierda para que las operaciones siguientes aprovechen el espacio
+    liberado. Los barridos se repiten hasta agotar `max_time`
+    o hasta un barrido sin mejoras.
+
+    `attrs["windows"]` del resultado registra, por ventana, el número de
+    operaciones, los tiempos de construcción y resolución, el makespan
+    alcanzado; `attrs["peak_rss_mb"]`, la memoria residente máxima del
+    proceso al terminar (`ru_maxrss` es acumulada, así que no se informa por
+    ventana) y `attrs["timings"]`, los segundos de cada fase (la búsqueda es
+    `solve`).
+    """
+    t0 = time.perf_counter()
+    timer = PhaseTimer()
+    with timer.phase("preprocess"):
+        df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
+    with timer.phase("jobs_data"):
+        instance = build_instance(df, use_setup_times)
+    start_time_fixed_map = build_start_time_fixed_map(fixed_starts)
+    H_daily = int(H_daily_hours * time_scale) if enforce_daily_limit else None
+    fixed = instance.scaled_fixed_starts(start_time_fixed_map, time_scale)
+    with timer.phase("warm_start"):
+        initial = best_dispatch(instance, rules=WARM_START_RULES, H_daily=H_daily, fixed=fixed)
+    if initial is None:
+        return attach_solve_info(pd.DataFrame(), warnings=[NO_DISPATCH], timings=timer.timings)
+    with timer.phase("bounds"):
+        bounds = compute_bounds(
+            instance,
+            enforce_daily_limit=enforce_daily_limit,
+            H_daily=H_daily,
+            start_time_fixed_map=start_time_fixed_map,
+            time_scale=time_scale,
+            upper_bound=initial.makespan,
+        )
+    lower_bound = bounds.lower_bound
+    p = instance.total_durations
+    starts = initial.starts.copy()
+    makespan = initial.makespan
+    movable = np.ones(instance.n_operations, dtype=bool)
+    movable[list(fixed)] = False
+    overlap = window_size // 4 if window_overlap is None else window_overlap
+    incumbents = []
+    windows = []
+
+    def record():
+        incumbent = {
+            "stage": 1,
+            "makespan": round(makespan / time_scale, 2),
+            "objective": round(makespan / time_scale, 2),
+            "bound": round(lower_bound / time_scale, 2),
+            "wall_time": round(time.perf_counter() - t0, 3),
+        }
+        incumbents.append(incumbent)
+        if on_incumbent is not None:
+            on_incumbent(incumbent)
+
+    def out_of_time():
+        stopped = stop_requested is not None and stop_requested()
+        return stopped or time.perf_counter() - t0 >= max_time
+
+    record()
+    sweep = 0
+    with timer.phase("solve"):
+        while makespan > lower_bound and not out_of_time():
+            total_end = int((starts + p).sum())
+            for k, free in enumerate(time_windows_by_count(starts, movable, window_size, overlap)):
+                remaining = max_time - (time.perf_counter() - t0)
+                if remaining <= 0 or out_of_time():
+                    break
+                status, new_starts, build_time, solve_time = _solve_window(
+                    instance,
+                    starts,
+                    free,
+                    makespan,
+                    enforce_daily_limit,
+                    H_daily_hours,
+                    time_scale,
+                    daily_limit_encoding,
+                    min(window_time, remaining),
+                    solver_config,
+                    stop_requested,
+                )
+                if new_starts is not None:
+                    starts[free] = new_starts
+                    # Las operaciones posteriores aprovechan el espacio liberado
+                    starts = left_shift(instance, starts, H_daily=H_daily, fixed=fixed)
+                    new_makespan = int((starts + p).max())
+                    if new_makespan < makespan:
+                        makespan = new_makespan
+                        record()
+                windows.append(
+                    {
+                        "sweep": sweep,
+                        "window": k,
+                        "n_operations": len(free),
+                        "start_hours": round(float(starts[free].min()) / time_scale, 2),
+                        "end_hours": round(float((starts[free] + p[free]).max()) / time_scale, 2),
+                        "status": status,
+                        "build_time": round(build_time, 3),
+                        "solve_time": round(solve_time, 3),
+                        "makespan": round(makespan / time_scale, 2),
+                    }
+                )
+            sweep += 1
+            if int((starts + p).sum()) >= total_end:
+                break
+    with timer.phase("results"):
+        results = pd.DataFrame(instance.schedule_columns(starts, time_scale))
+    return attach_solve_info(
+        results,
+        incumbents=incumbents,
+        windows=windows,
+        timings=timer.timings,
+        lower_bounds=bounds_report(bounds, time_scale, makespan),
+        peak_rss_mb=peak_rss_mb(),
+    )
@@ -0,0 +1,575 @@
+import heapq
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from ortools.sat.python import cp_model
+import numpy as np
+import pandas as pd
+from src.optimization.bounds import earliest_day_start, fits_in_day
+from src.optimization.heuristics import avoid_reservations
+from src.optimization.instance import JobShopInstance
+from src.optimization.model_builder import (
+    HEURISTIC_FALLBACK,
+    NO_SOLUTION,
+    add_daily_limit_constraints,
+    add_solution_hint,
+    attach_solve_info,
+    build_start_time_fixed_map,
+    preprocess_jobshop_df,
+    solution_values,
+    solve_with_monitor,
+    solver_stats,
+)
+from src.optimization.solver_config import SolverConfig, make_solver
+from src.utils.helpers import PhaseTimer
+
+
+@dataclass
+class FlexibleInstance:
+    """
+    Instancia JSP flexible en arreglos. Las operaciones quedan ordenadas por
+    (job_id, operation_index) como en `JobShopInstance`; las alternativas
+    (máquina elegible con sus duraciones escaladas) de la operación `i` son
+    las posiciones `alt_offsets[i]:alt_offsets[i + 1]` de `alt_machines`,
+    `alt_durations` y `alt_setups`.
+    """
+
+    jobs: np.ndarray
+    job_offsets: np.ndarray
+    job_ids: np.ndarray
+    task_ids: np.ndarray
+    alt_offsets: np.ndarray
+    alt_machines: np.ndarray
+    alt_durations: np.ndarray
+    alt_setups: np.ndarray
+    use_setup_times: bool
+
+    @property
+    def n_operations(self) -> int:
+        return len(self.job_ids)
+
+    @property
+    def n_alternatives(self) -> int:
+        return len(self.alt_machines)
+
+    @property
+    def alt_totals(self) -> np.ndarray:
+        return self.alt_durations + self.alt_setups
+
+    @property
+    def alt_operations(self) -> np.ndarray:
+        # Operación a la que pertenece cada alternativa
+        return np.repeat(np.arange(self.n_operations), np.diff(self.alt_offsets))
+
+    @property
+    def min_totals(self) -> np.ndarray:
+        return np.minimum.reduceat(self.alt_totals, self.alt_offsets[:-1])
+
+    def heads_and_tails(self):
+        """
+        Trabajo mínimo (con la alternativa más corta de cada operación) antes
+        y después de cada operación dentro de su trabajo.
+        """
+        p = self.min_totals
+        cum = np.cumsum(p)
+        counts = np.diff(self.job_offsets)
+        first = np.repeat(self.job_offsets[:-1], counts)
+        last = np.repeat(self.job_offsets[1:] - 1, counts)
+        heads = (cum - p) - (cum[first] - p[first])
+        tails = cum[last] - cum
+        return heads, tails
+
+    def assign(self, choice) -> JobShopInstance:
+        """
+        Instancia JSP clásica con la alternativa `choice[i]` (posición en los
+        arreglos de alternativas) para cada operación.
+        """
+        choice = np.asarray(choice, dtype=np.int64)
+        return JobShopInstance(
+            jobs=self.jobs,
+            job_offsets=self.job_offsets,
+            job_ids=self.job_ids,
+            task_ids=self.task_ids,
+            machines=self.alt_machines[choice],
+            durations=self.alt_durations[choice],
+            setups=self.alt_setups[choice],
+            use_setup_times=self.use_setup_times,
+        )
+
+    def keep(self, mask) -> "FlexibleInstance":
+        # Subconjunto de alternativas; cada operación debe conservar al menos una
+        mask = np.asarray(mask, dtype=bool)
+        counts = np.add.reduceat(mask.astype(np.int64), self.alt_offsets[:-1])
+        return FlexibleInstance(
+            jobs=self.jobs,
+            job_offsets=self.job_offsets,
+            job_ids=self.job_ids,
+            task_ids=self.task_ids,
+            alt_offsets=np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+            alt_machines=self.alt_machines[mask],
+            alt_durations=self.alt_durations[mask],
+            alt_setups=self.alt_setups[mask],
+            use_setup_times=self.use_setup_times,
+        )
+
+
+def build_flexible_instance(df: pd.DataFrame, use_setup_times: bool) -> FlexibleInstance:
+    """
+    Construye la instancia a partir del DataFrame preprocesado, con una fila
+    por alternativa: una operación `(job_id, operation_index)` aparece una
+    vez por cada máquina elegible, con su propia duración. Si una máquina
+    aparece dos veces para la misma operación se conserva la más corta.
+    """
+    job_col = df["job_id"].to_numpy()
+    op_col = df["operation_index"].to_numpy()
+    machine_col = df["machine_id"].to_numpy().astype(np.int64)
+    durations = df["processing_time_scaled"].to_numpy().astype(np.int64)
+    if use_setup_times:
+        setups = pd.to_numeric(df["setup_time_scaled"], errors="coerce").fillna(0).to_numpy().astype(np.int64)
+    else:
+        setups = np.zeros(len(df), dtype=np.int64)
+    order = np.lexsort((durations + setups, machine_col, op_col, job_col))
+    job_col, op_col, machine_col = job_col[order], op_col[order], machine_col[order]
+    durations, setups = durations[order], setups[order]
+    new_op = np.ones(len(order), dtype=bool)
+    new_op[1:] = (job_col[1:] != job_col[:-1]) | (op_col[1:] != op_col[:-1])
+    # Misma máquina repetida en una operación: queda la primera (la más corta)
+    unique = new_op.copy()
+    unique[1:] |= machine_col[1:] != machine_col[:-1]
+    job_col, machine_col = job_col[unique], machine_col[unique]
+    durations, setups, new_op = durations[unique], setups[unique], new_op[unique]
+    op_starts = np.flatnonzero(new_op)
+    job_ids = job_col[op_starts]
+    jobs, job_starts = np.unique(job_ids, return_index=True)
+    job_offsets = np.append(job_starts, len(job_ids)).astype(np.int64)
+    counts = np.diff(job_offsets)
+    task_ids = np.arange(len(job_ids), dtype=np.int64) - np.repeat(job_starts, counts)
+    return FlexibleInstance(
+        jobs=jobs,
+        job_offsets=job_offsets,
+        job_ids=job_ids,
+        task_ids=task_ids,
+        alt_offsets=np.append(op_starts, len(machine_col)).astype(np.int64),
+        alt_machines=machine_col,
+        alt_durations=durations,
+        alt_setups=setups,
+        use_setup_times=use_setup_times,
+    )
+
+
+def prune_alternatives(
+    instance: FlexibleInstance, horizon: int, H_daily: Optional[int] = None
+) -> Optional[FlexibleInstance]:
+    """
+    Descarta alternativas dominadas: las que no caben antes de `horizon`
+    aun con el trabajo mínimo antes y después en su trabajo
+    (cabeza + duración + cola > horizonte) y, con jornada de `H_daily`
+    unidades, las que no caben en un día. Devuelve None si alguna operación
+    se queda sin alternativas.
+    """
+    heads, tails = instance.heads_and_tails()
+    ops = instance.alt_operations
+    totals = instance.alt_totals
+    mask = heads[ops] + totals + tails[ops] <= horizon
+    if H_daily:
+        mask &= totals < H_daily
+    if np.any(np.add.reduceat(mask.astype(np.int64), instance.alt_offsets[:-1]) == 0):
+        return None
+    return instance.keep(mask)
+
+
+def identical_machine_classes(instance: FlexibleInstance) -> List[List[int]]:
+    """
+    Grupos de máquinas intercambiables: elegibles para las mismas
+    operaciones con las mismas duraciones. Permutar sus asignaciones no
+    cambia el schedule, así que se puede fijar un orden entre ellas.
+    """
+    signatures: Dict[int, list] = {}
+    ops = instance.alt_operations.tolist()
+    for op, machine, duration, setup in zip(
+        ops,
+        instance.alt_machines.tolist(),
+        instance.alt_durations.tolist(),
+        instance.alt_setups.tolist(),
+    ):
+        signatures.setdefault(machine, []).append((op, duration, setup))
+    groups: Dict[tuple, List[int]] = {}
+    for machine, signature in signatures.items():
+        groups.setdefault(tuple(signature), []).append(machine)
+    return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+@dataclass
+class FlexibleSchedule:
+    """
+    Schedule constructivo: `choice` es la alternativa elegida por operación
+    y `starts` los inicios escalados.
+    """
+
+    choice: np.ndarray
+    starts: np.ndarray
+    makespan: int
+
+
+def flexible_dispatch(
+    instance: FlexibleInstance,
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+) -> Optional[FlexibleSchedule]:
+    """
+    Schedule por menor término: en cada paso se programa, entre la próxima
+    operación de cada trabajo, la combinación de operación y máquina que
+    termina antes (repartiendo la carga entre máquinas paralelas),
+    respetando la jornada. Las operaciones de `fixed` (`{posición: inicio
+    escalado}`) se reservan de antemano en su alternativa más corta que no
+    choque con otra reserva ni, con `H_daily`, cruce el fin de la jornada.
+    Devuelve None si un inicio fijo no es alcanzable.
+    """
+    fixed = fixed or {}
+    H = int(H_daily) if H_daily else None
+    offsets = instance.alt_offsets.tolist()
+    machines = instance.alt_machines.tolist()
+    totals = instance.alt_totals.tolist()
+    job_offsets = instance.job_offsets.tolist()
+    n = instance.n_operations
+    choice = [0] * n
+    starts = [0] * n
+    reservations: Dict[int, list] = {}
+    for i, start in sorted(fixed.items()):
+        alts = sorted(range(offsets[i], offsets[i + 1]), key=lambda a: totals[a])
+        for a in alts:
+            if H and not fits_in_day(start, totals[a], H):
+                continue
+            busy = reservations.get(machines[a], [])
+            if all(start + totals[a] <= r0 or r1 <= start for r0, r1 in busy):
+                choice[i], starts[i] = a, start
+                reservations.setdefault(machines[a], []).append((start, start + totals[a]))
+                break
+        else:
+            return None
+    machine_ready: Dict[int, int] = {}
+    job_ready = [0] * len(instance.jobs)
+
+    def best_option(k, i):
+        if i in fixed:
+            return starts[i] + totals[choice[i]], choice[i], starts[i]
+        best = None
+        for a in range(offsets[i], offsets[i + 1]):
+            if H and totals[a] >= H and totals[a] > 0:
+                continue
+            m = machines[a]
+            start = earliest_day_start(max(job_ready[k], machine_ready.get(m, 0)), totals[a], H)
+            start = avoid_reservations(start, totals[a], reservations.get(m, ()), H)
+            option = (start + totals[a], a, start)
+            if best is None or option < best:
+                best = option
+        return best
+
+    heap = []
+    for k in range(len(job_offsets) - 1):
+        if job_offsets[k] < job_offsets[k + 1]:
+            option = best_option(k, job_offsets[k])
+            if option is None:
+                return None
+            heapq.heappush(heap, (option[0], k, job_offsets[k]))
+    while heap:
+        key, k, i = heapq.heappop(heap)
+        option = best_option(k, i)
+        if option is None:
+            return None
+        end, a, start = option
+        if end > key:
+            # Las máquinas se ocuparon desde que se encoló: reevaluar
+            heapq.heappush(heap, (end, k, i))
+            continue
+        if i in fixed:
+            if job_ready[k] > start:
+                return None
+        else:
+            choice[i], starts[i] = a, start
+            machine_ready[machines[a]] = end
+        job_ready[k] = end
+        if i + 1 < job_offsets[k + 1]:
+            next_option = best_option(k, i + 1)
+            if next_option is None:
+                return None
+            heapq.heappush(heap, (next_option[0], k, i + 1))
+    choice = np.asarray(choice, dtype=np.int64)
+    starts = np.asarray(starts, dtype=np.int64)
+    makespan = int((starts + instance.alt_totals[choice]).max()) if n else 0
+    return FlexibleSchedule(choice=choice, starts=starts, makespan=makespan)
+
+
+def canonical_assignment(instance: FlexibleInstance, choice, classes) -> np.ndarray:
+    """
+    Reasigna las máquinas de cada grupo idéntico para que su carga quede en
+    orden no creciente (el orden que impone la ruptura de simetría); el
+    schedule no cambia.
+    """
+    choice = np.asarray(choice, dtype=np.int64).copy()
+    alt_index = {
+        (op, machine): a
+        for a, (op, machine) in enumerate(
+            zip(instance.alt_operations.tolist(), instance.alt_machines.tolist())
+        )
+    }
+    chosen_machines = instance.alt_machines[choice]
+    chosen_totals = instance.alt_totals[choice]
+    for group in classes:
+        loads = {m: int(chosen_totals[chosen_machines == m].sum()) for m in group}
+        by_load = sorted(group, key=lambda m: (-loads[m], m))
+        relabel = dict(zip(by_load, group))
+        for i in np.flatnonzero(np.isin(chosen_machines, group)).tolist():
+            choice[i] = alt_index[(i, relabel[int(chosen_machines[i])])]
+    return choice
+
+
+@dataclass
+class FlexibleJobShopModel:
+    """
+    Modelo CP-SAT del JSP flexible: una variable de inicio y término por
+    operación y un intervalo opcional por alternativa, con su literal de
+    presencia (None si la operación tiene una sola alternativa).
+    """
+
+    model: cp_model.CpModel
+    starts: list
+    presences: list
+    makespan: cp_model.IntVar
+    instance: FlexibleInstance
+    time_scale: int
+    horizon: int
+    lower_bound: int
+    heuristic: Optional[FlexibleSchedule] = None
+    pruned: int = 0
+    machine_classes: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)
+
+    def choice(self, solver) -> np.ndarray:
+        choice = self.instance.alt_offsets[:-1].copy()
+        optional = [a for a, lit in enumerate(self.presences) if lit is not None]
+        if optional:
+            values = solution_values(solver, [self.presences[a] for a in optional])
+            chosen = np.asarray(optional, dtype=np.int64)[values == 1]
+            choice[self.instance.alt_operations[chosen]] = chosen
+        return choice
+
+    def results(self, solver) -> pd.DataFrame:
+        starts = solution_values(solver, self.starts)
+        assigned = self.instance.assign(self.choice(solver))
+        return pd.DataFrame(assigned.schedule_columns(starts, self.time_scale))
+
+    def heuristic_results(self) -> pd.DataFrame:
+        assigned = self.instance.assign(self.heuristic.choice)
+        return pd.DataFrame(assigned.schedule_columns(self.heuristic.starts, self.time_scale))
+
+
+def build_flexible_model(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    fixed_starts: dict = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    prune: bool = True,
+    symmetry_breaking: bool = True,
+) -> Optional[FlexibleJobShopModel]:
+    """
+    Construye el modelo del JSP flexible (sin objetivo). Cada alternativa es
+    un intervalo opcional en el `NoOverlap` de su máquina y exactamente una
+    por operación queda presente.
+
+    El schedule por menor término acota el horizonte y, con `warm_start`,
+    se usa como hint. Con `prune` se descartan las alternativas que no
+    caben en el horizonte (ver `prune_alternatives`) y con
+    `symmetry_breaking` las cargas de cada grupo de máquinas idénticas
+    quedan en orden no creciente. Devuelve None si alguna operación no
+    tiene alternativa factible.
+    """
+    timer = PhaseTimer()
+    with timer.phase("preprocess"):
+        df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
+    with timer.phase("jobs_data"):
+        instance = build_flexible_instance(df, use_setup_times)
+    H_daily = int(H_daily_hours * time_scale) if enforce_daily_limit else None
+    start_time_fixed_map = build_start_time_fixed_map(fixed_starts) or {}
+    op_index = {key: i for i, key in enumerate(zip(instance.job_ids.tolist(), instance.task_ids.tolist()))}
+    fixed = {
+        op_index[key]: int(round(value * time_scale))
+        for key, value in start_time_fixed_map.items()
+        if value is not None and key in op_index
+    }
+    with timer.phase("warm_start"):
+        heuristic = flexible_dispatch(instance, H_daily=H_daily, fixed=fixed)
+    with timer.phase("bounds"):
+        if heuristic is not None:
+            horizon = heuristic.makespan
+        else:
+            total = int(instance.alt_totals.max(initial=0)) * instance.n_operations
+            horizon = max([2 * total] + [s + total for s in fixed.values()])
+        original = instance
+        if prune:
+            instance = prune_alternatives(instance, horizon, H_daily)
+            if instance is None:
+                return None
+            if heuristic is not None:
+                # Las alternativas del schedule heurístico sobreviven a la poda
+                kept = {
+                    key: a
+                    for a, key in enumerate(
+                        zip(instance.alt_operations.tolist(), instance.alt_machines.tolist())
+                    )
+                }
+                machines_chosen = original.alt_machines[heuristic.choice].tolist()
+                heuristic.choice = np.asarray(
+                    [kept[(i, m)] for i, m in enumerate(machines_chosen)], dtype=np.int64
+                )
+        classes = identical_machine_classes(instance) if symmetry_breaking else []
+        if heuristic is not None and classes:
+            heuristic.choice = canonical_assignment(instance, heuristic.choice, classes)
+        heads, tails = instance.heads_and_tails()
+        min_totals = instance.min_totals
+        job_lengths = np.add.reduceat(min_totals, instance.job_offsets[:-1]) if instance.n_operations else [0]
+        n_machines = len(np.unique(instance.alt_machines))
+        lower_bound = max(int(np.max(job_lengths)), -(-int(min_totals.sum()) // max(n_machines, 1)))
+        lower_bound = min(lower_bound, horizon)
+    with timer.phase("model_build"):
+        model = cp_model.CpModel()
+        ops = instance.alt_operations.tolist()
+        offsets = instance.alt_offsets.tolist()
+        machines = instance.alt_machines.tolist()
+        totals = instance.alt_totals.tolist()
+        starts, ends, task_vars = [], [], {}
+        for i, (job_id, task_id) in enumerate(zip(instance.job_ids.tolist(), instance.task_ids.tolist())):
+            suffix = f"_{job_id}_{task_id}"
+            lo, hi = int(heads[i]), horizon - int(tails[i])
+            starts.append(model.NewIntVar(lo, hi - int(min_totals[i]), "start" + suffix))
+            ends.append(model.NewIntVar(lo + int(min_totals[i]), hi, "end" + suffix))
+            task_vars[(job_id, task_id)] = (starts[i], ends[i])
+            if i in fixed:
+                model.Add(starts[i] == fixed[i])
+            if task_id > 0:
+                model.Add(starts[i] >= ends[i - 1])
+        presences = [None] * instance.n_alternatives
+        machine_to_intervals: Dict[int, list] = {}
+        load_terms: Dict[int, list] = {}
+        for i in range(instance.n_operations):
+            alts = range(offsets[i], offsets[i + 1])
+            if len(alts) == 1:
+                a = alts[0]
+                interval = model.NewIntervalVar(starts[i], totals[a], ends[i], f"interval_{i}_{machines[a]}")
+                machine_to_intervals.setdefault(machines[a], []).append(interval)
+                load_terms.setdefault(machines[a], []).append(totals[a])
+                continue
+            for a in alts:
+                presences[a] = model.NewBoolVar(f"x_{i}_{machines[a]}")
+                interval = model.NewOptionalIntervalVar(
+                    starts[i], totals[a], ends[i], presences[a], f"interval_{i}_{machines[a]}"
+                )
+                machine_to_intervals.setdefault(machines[a], []).append(interval)
+                load_terms.setdefault(machines[a], []).append(totals[a] * presences[a])
+            model.AddExactlyOne(presences[a] for a in alts)
+            # Redundante con los intervalos opcionales, pero propaga mejor la duración
+            model.Add(ends[i] == starts[i] + sum(totals[a] * presences[a] for a in alts))
+        if H_daily:
+            add_daily_limit_constraints(
+                model, task_vars, machine_to_intervals, horizon, H_daily, daily_limit_encoding
+            )
+        for intervals in machine_to_intervals.values():
+            model.AddNoOverlap(intervals)
+        for group in classes:
+            # Máquinas idénticas: carga no creciente según el id
+            for m1, m2 in zip(group, group[1:]):
+                model.Add(sum(load_terms[m1]) >= sum(load_terms[m2]))
+        makespan = model.NewIntVar(lower_bound, horizon, "makespan")
+        last_ops = (instance.job_offsets[1:] - 1).tolist()
+        model.AddMaxEquality(makespan, [ends[i] for i in last_ops])
+        if heuristic is not None and warm_start:
+            add_solution_hint(model, starts, heuristic.starts)
+            chosen = set(heuristic.choice.tolist())
+            for a, lit in enumerate(presences):
+                if lit is not None:
+                    model.AddHint(lit, int(a in chosen))
+            model.AddHint(makespan, heuristic.makespan)
+    pruned = original.n_alternatives - instance.n_alternatives
+    return FlexibleJobShopModel(
+        model=model,
+        starts=starts,
+        presences=presences,
+        makespan=makespan,
+        instance=instance,
+        time_scale=time_scale,
+        horizon=horizon,
+        lower_bound=lower_bound,
+        heuristic=heuristic if warm_start else None,
+        pruned=pruned,
+        machine_classes=classes,
+        timings=timer.timings,
+    )
+
+
+def solve_flexible_jobshop(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    max_time: int = 100,
+    fixed_starts: dict = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    prune: bool = True,
+    symmetry_breaking: bool = True,
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+):
+    """
+    Resuelve un JSP flexible minimizando el makespan: `df` tiene una fila
+    por máquina elegible de cada operación (mismo `job_id` y
+    `operation_index`, distinta `machine_id` y su `processing_time`). El
+    resultado indica en `machine_id` la máquina asignada. Incumbentes,
+    detención, `timings` y `solver_stats` como en `solve_jobshop`.
+    """
+    fjm = build_flexible_model(
+        df,
+        time_scale=time_scale,
+        H_daily_hours=H_daily_hours,
+        enforce_daily_limit=enforce_daily_limit,
+        use_setup_times=use_setup_times,
+        fixed_starts=fixed_starts,
+        daily_limit_encoding=daily_limit_encoding,
+        warm_start=warm_start,
+        prune=prune,
+        symmetry_breaking=symmetry_breaking,
+    )
+    if fjm is None:
+        return attach_solve_info(
+            pd.DataFrame(), warnings=["Alguna operación no tiene una máquina elegible factible"]
+        )
+    fjm.model.Minimize(fjm.makespan)
+    timer = PhaseTimer(fjm.timings)
+    solver, log_lines = make_solver(max_time, solver_config)
+    with timer.phase("solve"):
+        status, incumbents = solve_with_monitor(
+            solver,
+            fjm.model,
+            fjm.makespan,
+            time_scale,
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+    info = {
+        "solver_log": log_lines,
+        "incumbents": incumbents,
+        "timings": timer.timings,
+        "solver_stats": [solver_stats(solver, status, time_scale)],
+    }
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        if status == cp_model.UNKNOWN and fjm.heuristic is not None:
+            return attach_solve_info(fjm.heuristic_results(), warnings=[HEURISTIC_FALLBACK], **info)
+        return attach_solve_info(pd.DataFrame(), warnings=[NO_SOLUTION], **info)
+    with timer.phase("results"):
+        results = fjm.results(solver)
+    return attach_solve_info(results, **info)
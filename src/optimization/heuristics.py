@@ -0,0 +1,225 @@
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+import numpy as np
+from src.optimization.bounds import earliest_day_start, fits_in_day
+from src.optimization.instance import JobShopInstance
+
+
+DISPATCH_RULES = ("spt", "lpt", "mwkr", "fifo", "random")
+
+
+@dataclass
+class HeuristicSchedule:
+    """
+    Schedule construido por reglas de despacho; `starts` está escalado y
+    alineado con las operaciones de `JobShopInstance`.
+    """
+
+    starts: np.ndarray
+    makespan: int
+    rule: str
+
+
+def _priorities(instance: JobShopInstance, rule: str, rng) -> list:
+    # Menor valor = mayor prioridad
+    p = instance.total_durations
+    if rule == "spt":
+        return p.tolist()
+    if rule == "lpt":
+        return (-p).tolist()
+    if rule == "mwkr":
+        # Trabajo restante del trabajo, incluyendo la operación
+        job_total = np.add.reduceat(p, instance.job_offsets[:-1])
+        done_before = np.cumsum(p) - p - np.repeat(
+            np.cumsum(job_total) - job_total, np.diff(instance.job_offsets)
+        )
+        return (-(np.repeat(job_total, np.diff(instance.job_offsets)) - done_before)).tolist()
+    if rule == "fifo":
+        return [0] * instance.n_operations
+    if rule == "random":
+        return rng.random(instance.n_operations).tolist()
+    raise ValueError(f"Regla de despacho desconocida: {rule}")
+
+
+def avoid_reservations(start, duration, reservations, H_daily):
+    """
+    Primer inicio >= `start` que no solapa intervalos reservados por
+    operaciones con inicio fijo y que respeta la jornada.
+    """
+    start = earliest_day_start(start, duration, H_daily)
+    moved = True
+    while moved:
+        moved = False
+        for r_start, r_end in reservations:
+            if start < r_end and r_start < start + duration:
+                start = earliest_day_start(r_end, duration, H_daily)
+                moved = True
+    return start
+
+
+def dispatch(
+    instance: JobShopInstance,
+    rule: str = "mwkr",
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+    seed: Optional[int] = None,
+    release_time: int = 0,
+    machine_downtime: Optional[dict] = None,
+) -> Optional[HeuristicSchedule]:
+    """
+    Simulación por eventos de un schedule non-delay: cuando una máquina queda
+    libre toma, de su cola de operaciones listas, la de mayor prioridad según
+    `rule` que quepa en la jornada. Las operaciones de `fixed`
+    (`{posición: inicio escalado}`) y los intervalos de `machine_downtime`
+    (`{máquina: [(inicio, fin), ...]}`) se reservan en su máquina de
+    antemano; el resto no comienza antes de `release_time`. Devuelve None si
+    algún inicio fijo no es alcanzable o, con `H_daily`, si cruza el fin de
+    la jornada.
+    """
+    rng = np.random.default_rng(seed)
+    priority = _priorities(instance, rule, rng)
+    p = instance.total_durations.tolist()
+    machines = instance.machines.tolist()
+    offsets = instance.job_offsets.tolist()
+    job_of = np.repeat(np.arange(len(instance.jobs)), np.diff(instance.job_offsets)).tolist()
+    fixed = fixed or {}
+    H = int(H_daily) if H_daily else None
+    if H and any(d >= H for d in p if d > 0):
+        return None
+    if H and any(not fits_in_day(start, p[i], H) for i, start in fixed.items()):
+        return None
+
+    reservations = {m: list(intervals) for m, intervals in (machine_downtime or {}).items()}
+    for i, start in fixed.items():
+        reservations.setdefault(machines[i], []).append((start, start + p[i]))
+    starts = [0] * len(p)
+    queues = {}
+    machine_free = {}
+    events = []
+    seq = 0
+    scheduled = 0
+
+    def release(i, t):
+        nonlocal seq, scheduled
+        if i in fixed:
+            if t > fixed[i]:
+                return False
+            starts[i] = fixed[i]
+            heapq.heappush(events, (fixed[i] + p[i], seq, i))
+            seq += 1
+            scheduled += 1
+            return True
+        heapq.heappush(queues.setdefault(machines[i], []), (priority[i], seq, i))
+        seq += 1
+        return True
+
+    for k in range(len(offsets) - 1):
+        if not release(offsets[k], 0):
+            return None
+    t = release_time
+    while True:
+        # Despachar en las máquinas libres con cola
+        for m, queue in queues.items():
+            if not queue or machine_free.get(m, 0) > t:
+                continue
+            skipped = []
+            chosen = None
+            while queue:
+                item = heapq.heappop(queue)
+                s = avoid_reservations(t, p[item[2]], reservations.get(m, ()), H)
+                if s == t:
+                    chosen = (item[2], s)
+                    break
+                skipped.append((item, s))
+            if chosen is None:
+                # Ninguna cabe ahora: la de mayor prioridad espera su hueco
+                item, s = skipped.pop(0)
+                chosen = (item[2], s)
+            for item, _ in skipped:
+                heapq.heappush(queue, item)
+            i, s = chosen
+            starts[i] = s
+            machine_free[m] = s + p[i]
+            heapq.heappush(events, (s + p[i], seq, i))
+            seq += 1
+            scheduled += 1
+        if not events:
+            break
+        # Avanzar al próximo término y liberar sucesores
+        t = max(events[0][0], release_time)
+        while events and events[0][0] <= t:
+            end, _, i = heapq.heappop(events)
+            if i + 1 < offsets[job_of[i] + 1] and not release(i + 1, end):
+                return None
+    if scheduled != len(p):
+        return None
+    starts = np.asarray(starts, dtype=np.int64)
+    makespan = int((starts + instance.total_durations).max()) if len(p) else 0
+    return HeuristicSchedule(starts=starts, makespan=makespan, rule=rule)
+
+
+def best_dispatch(
+    instance: JobShopInstance,
+    rules: Iterable[str] = DISPATCH_RULES,
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+    time_limit: float = 0.5,
+    seed: int = 0,
+    release_time: int = 0,
+    machine_downtime: Optional[dict] = None,
+) -> Optional[HeuristicSchedule]:
+    """
+    Ejecuta las reglas deterministas y, si se incluye "random", reinicios
+    aleatorios hasta agotar `time_limit` segundos. Devuelve el mejor schedule.
+    """
+    t0 = time.perf_counter()
+    rules = list(rules)
+    best = None
+    constraints = {"release_time": release_time, "machine_downtime": machine_downtime}
+    for rule in rules:
+        if rule == "random":
+            continue
+        candidate = dispatch(instance, rule, H_daily=H_daily, fixed=fixed, **constraints)
+        if candidate is not None and (best is None or candidate.makespan < best.makespan):
+            best = candidate
+    if "random" in rules:
+        restart = 0
+        while restart == 0 or time.perf_counter() - t0 < time_limit:
+            candidate = dispatch(
+                instance, "random", H_daily=H_daily, fixed=fixed, seed=seed + restart, **constraints
+            )
+            restart += 1
+            if candidate is None:
+                break
+            if best is None or candidate.makespan < best.makespan:
+                best = candidate
+    return best
+
+
+def is_feasible(
+    instance: JobShopInstance,
+    starts,
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+) -> bool:
+    """
+    Verifica precedencias, no solapamiento por máquina, jornada e inicios fijos.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = starts + instance.total_durations
+    same_job = instance.job_ids[1:] == instance.job_ids[:-1]
+    if np.any(starts[1:][same_job] < ends[:-1][same_job]) or np.any(starts < 0):
+        return False
+    order = np.lexsort((starts, instance.machines))
+    m_sorted = instance.machines[order]
+    same_machine = m_sorted[1:] == m_sorted[:-1]
+    busy = instance.total_durations[order] > 0
+    if np.any((starts[order][1:] < ends[order][:-1]) & same_machine & busy[1:] & busy[:-1]):
+        return False
+    if H_daily:
+        p = instance.total_durations.tolist()
+        if not all(fits_in_day(s, d, H_daily) for s, d in zip(starts.tolist(), p)):
+            return False
+    return all(starts[i] == v for i, v in (fixed or {}).items())
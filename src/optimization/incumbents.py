@@ -0,0 +1,61 @@
+import threading
+from typing import Callable, List, Optional
+from ortools.sat.python import cp_model
+
+
+class IncumbentRecorder(cp_model.CpSolverSolutionCallback):
+    """
+    Callback de CP-SAT que registra cada solución mejorante (makespan,
+    objetivo, cota y tiempo de reloj, en horas y segundos) y la reenvía a
+    `on_incumbent`. Si `stop_requested()` devuelve True, detiene la búsqueda
+    conservando la mejor solución encontrada.
+    """
+
+    def __init__(
+        self,
+        makespan,
+        time_scale: int,
+        stage: int = 1,
+        on_incumbent: Optional[Callable[[dict], None]] = None,
+        stop_requested: Optional[Callable[[], bool]] = None,
+    ):
+        super().__init__()
+        self._makespan = makespan
+        self._time_scale = time_scale
+        self._stage = stage
+        self._on_incumbent = on_incumbent
+        self._stop_requested = stop_requested
+        self.incumbents: List[dict] = []
+
+    def on_solution_callback(self):
+        incumbent = {
+            "stage": self._stage,
+            "makespan": round(self.Value(self._makespan) / self._time_scale, 2),
+            "objective": round(self.ObjectiveValue() / self._time_scale, 2),
+            "bound": round(self.BestObjectiveBound() / self._time_scale, 2),
+            "wall_time": round(self.WallTime(), 3),
+        }
+        self.incumbents.append(incumbent)
+        if self._on_incumbent is not None:
+            self._on_incumbent(incumbent)
+        if self._stop_requested is not None and self._stop_requested():
+            self.StopSearch()
+
+
+def watch_stop(solver, stop_requested: Optional[Callable[[], bool]], poll: float = 0.2):
+    """
+    Hilo que detiene `solver` en cuanto `stop_requested()` es True, aunque no
+    lleguen nuevas soluciones. Devuelve la función que termina el hilo.
+    """
+    done = threading.Event()
+    if stop_requested is None:
+        return done.set
+
+    def loop():
+        while not done.wait(poll):
+            if stop_requested():
+                solver.StopSearch()
+                return
+
+    threading.Thread(target=loop, daemon=True).start()
+    return done.set
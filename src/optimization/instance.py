@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class JobShopInstance:
+    """
+    Representación en arreglos de una instancia JSP.
+
+    Las operaciones quedan ordenadas por (job_id, operation_index); la
+    operación `i` pertenece al trabajo `job_ids[i]` y ocupa la posición
+    `task_ids[i]` dentro de él. `job_offsets[k]:job_offsets[k + 1]` es el
+    rango de operaciones del k-ésimo trabajo de `jobs`.
+    """
+
+    jobs: np.ndarray
+    job_offsets: np.ndarray
+    job_ids: np.ndarray
+    task_ids: np.ndarray
+    machines: np.ndarray
+    durations: np.ndarray
+    setups: np.ndarray
+    use_setup_times: bool
+
+    @property
+    def n_operations(self) -> int:
+        return len(self.job_ids)
+
+    @property
+    def total_durations(self) -> np.ndarray:
+        return self.durations + self.setups
+
+    def operation_index(self) -> dict:
+        """
+        Mapa `(job_id, task_id) -> posición` en los arreglos.
+        """
+        return {
+            key: i
+            for i, key in enumerate(zip(self.job_ids.tolist(), self.task_ids.tolist()))
+        }
+
+    def scaled_fixed_starts(self, start_time_fixed_map, time_scale: int) -> dict:
+        """
+        Traduce `start_time_fixed_map` (horas, por `(job_id, task_id)`) a
+        `{posición: inicio escalado}`.
+        """
+        if not start_time_fixed_map:
+            return {}
+        index = self.operation_index()
+        return {
+            index[key]: int(round(value * time_scale))
+            for key, value in start_time_fixed_map.items()
+            if value is not None and key in index
+        }
+
+    def schedule_columns(self, starts, time_scale: int) -> dict:
+        """
+        Columnas de resultados (mismo formato que `build_jobshop_results`)
+        para inicios escalados alineados con las operaciones.
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        start_h = starts / time_scale
+        end_h = (starts + self.total_durations) / time_scale
+        results = {
+            "job_id": self.job_ids,
+            "operation_index": self.task_ids,
+            "machine_id": self.machines,
+            "start_time_hours": np.round(start_h, 2),
+            "end_time_hours": np.round(end_h, 2),
+            "duration_hours": np.round(end_h - start_h, 2),
+        }
+        if self.use_setup_times:
+            results["setup_time_hours"] = np.round(self.setups / time_scale, 2)
+        results["processing_time_hours"] = np.round(self.durations / time_scale, 2)
+        return results
+
+    def to_jobs_data(self) -> dict:
+        """
+        Devuelve el diccionario `{job_id: [(machine, duration[, setup]), ...]}`
+        que consume el constructor del modelo.
+        """
+        machines = self.machines.tolist()
+        durations = self.durations.tolist()
+        if self.use_setup_times:
+            ops = list(zip(machines, durations, self.setups.tolist()))
+        else:
+            ops = list(zip(machines, durations))
+        offsets = self.job_offsets.tolist()
+        return {
+            job_id: ops[offsets[k] : offsets[k + 1]]
+            for k, job_id in enumerate(self.jobs.tolist())
+        }
+
+
+def build_instance(df: pd.DataFrame, use_setup_times: bool) -> JobShopInstance:
+    """
+    Construye la instancia en una sola pasada vectorizada a partir del
+    DataFrame ya preprocesado (con `processing_time_scaled` y, si aplica,
+    `setup_time_scaled`).
+    """
+    job_col = df["job_id"].to_numpy()
+    order = np.lexsort((df["operation_index"].to_numpy(), job_col))
+    job_ids = job_col[order]
+    op_col = df["operation_index"].to_numpy()[order]
+    if np.any((job_ids[1:] == job_ids[:-1]) & (op_col[1:] == op_col[:-1])):
+        raise ValueError(
+            "Hay operaciones repetidas (varias máquinas elegibles): usar el modo flexible"
+        )
+    jobs, job_starts = np.unique(job_ids, return_index=True)
+    job_offsets = np.append(job_starts, len(job_ids)).astype(np.int64)
+    counts = np.diff(job_offsets)
+    task_ids = np.arange(len(job_ids), dtype=np.int64) - np.repeat(job_starts, counts)
+    machines = df["machine_id"].to_numpy()[order].astype(np.int64)
+    durations = df["processing_time_scaled"].to_numpy()[order].astype(np.int64)
+    if use_setup_times:
+        setups = (
+            pd.to_numeric(df["setup_time_scaled"], errors="coerce")
+            .fillna(0)
+            .to_numpy()[order]
+            .astype(np.int64)
+        )
+    else:
+        setups = np.zeros(len(job_ids), dtype=np.int64)
+    return JobShopInstance(
+        jobs=jobs,
+        job_offsets=job_offsets,
+        job_ids=job_ids,
+        task_ids=task_ids,
+        machines=machines,
+        durations=durations,
+        setups=setups,
+        use_setup_times=use_setup_times,
+    )
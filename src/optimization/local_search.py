@@ -0,0 +1,346 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import numpy as np
+from src.optimization.bounds import earliest_day_start
+from src.optimization.instance import JobShopInstance
+
+
+@dataclass
+class LocalSearchResult:
+    """
+    Mejor schedule encontrado por la búsqueda local (inicios escalados,
+    alineados con las operaciones de `JobShopInstance`).
+    """
+
+    starts: np.ndarray
+    makespan: int
+    initial_makespan: int
+    iterations: int
+    elapsed: float
+
+
+class _SequenceState:
+    """
+    Grafo disyuntivo con las secuencias por máquina fijadas. Mantiene cabezas
+    (inicios semi-activos) y colas (trabajo restante tras cada operación) y
+    las actualiza solo para las operaciones afectadas por un intercambio.
+    """
+
+    def __init__(self, instance, starts, H_daily=None, fixed=None):
+        self.p = instance.total_durations.tolist()
+        self.n = len(self.p)
+        job_ids = instance.job_ids
+        same_job = (job_ids[1:] == job_ids[:-1]).tolist()
+        self.job_pred = [-1] + [i if same_job[i] else -1 for i in range(self.n - 1)]
+        self.job_succ = [i + 1 if same_job[i] else -1 for i in range(self.n - 1)] + [-1]
+        self.last_ops = (instance.job_offsets[1:] - 1).tolist()
+        self.machine_of = instance.machines.tolist()
+        self.H = int(H_daily) if H_daily else None
+        self.fixed = fixed or {}
+        # Secuencias por máquina según los inicios dados
+        order = np.lexsort((np.arange(self.n), np.asarray(starts), instance.machines)).tolist()
+        self.seq = {}
+        for i in order:
+            self.seq.setdefault(self.machine_of[i], []).append(i)
+        self.pos = [0] * self.n
+        for ops in self.seq.values():
+            for k, i in enumerate(ops):
+                self.pos[i] = k
+        self.head = [0] * self.n
+        self.tail = [0] * self.n
+
+    def machine_pred(self, i):
+        k = self.pos[i]
+        return self.seq[self.machine_of[i]][k - 1] if k > 0 else -1
+
+    def machine_succ(self, i):
+        ops = self.seq[self.machine_of[i]]
+        k = self.pos[i]
+        return ops[k + 1] if k + 1 < len(ops) else -1
+
+    def _start_of(self, i):
+        t = 0
+        a = self.job_pred[i]
+        if a >= 0:
+            t = self.head[a] + self.p[a]
+        b = self.machine_pred(i)
+        if b >= 0:
+            t = max(t, self.head[b] + self.p[b])
+        t = earliest_day_start(t, self.p[i], self.H)
+        if i in self.fixed:
+            if t > self.fixed[i]:
+                return None
+            t = self.fixed[i]
+        return t
+
+    def _tail_of(self, i):
+        q = 0
+        for s in (self.job_succ[i], self.machine_succ(i)):
+            if s >= 0:
+                q = max(q, self.tail[s] + self.p[s])
+        return q
+
+    def full_evaluation(self):
+        """
+        Recalcula todas las cabezas y colas en orden topológico. Devuelve
+        False si las secuencias son infactibles (ciclo o inicio fijo).
+        """
+        indeg = [0] * self.n
+        for i in range(self.n):
+            indeg[i] = (self.job_pred[i] >= 0) + (self.machine_pred(i) >= 0)
+        queue = deque(i for i in range(self.n) if indeg[i] == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            start = self._start_of(i)
+            if start is None:
+                return False
+            self.head[i] = start
+            order.append(i)
+            for s in (self.job_succ[i], self.machine_succ(i)):
+                if s >= 0:
+                    indeg[s] -= 1
+                    if indeg[s] == 0:
+                        queue.append(s)
+        if len(order) < self.n:
+            return False
+        for i in reversed(order):
+            self.tail[i] = self._tail_of(i)
+        return True
+
+    def _propagate(self, seeds, compute, values, successors, undo):
+        # Corrección de etiquetas limitada a las operaciones alcanzadas
+        queue = deque(seeds)
+        pending = set(seeds)
+        budget = 4 * self.n + 16
+        while queue:
+            budget -= 1
+            if budget < 0:
+                return False
+            i = queue.popleft()
+            pending.discard(i)
+            new = compute(i)
+            if new is None:
+                return False
+            if new != values[i]:
+                undo.append((values, i, values[i]))
+                values[i] = new
+                for s in successors(i):
+                    if s >= 0 and s not in pending:
+                        pending.add(s)
+                        queue.append(s)
+        return True
+
+    def swap(self, u, v):
+        """
+        Intercambia las operaciones adyacentes u -> v de una máquina y
+        actualiza cabezas/colas afectadas. Devuelve el registro para revertir
+        o None si el resultado es infactible (en cuyo caso ya se revirtió).
+        """
+        ops = self.seq[self.machine_of[u]]
+        ku, kv = self.pos[u], self.pos[v]
+        before = ops[ku - 1] if ku > 0 else -1
+        after = ops[kv + 1] if kv + 1 < len(ops) else -1
+        ops[ku], ops[kv] = v, u
+        self.pos[u], self.pos[v] = kv, ku
+        undo = []
+        ok = self._propagate(
+            [x for x in (v, u, after) if x >= 0],
+            self._start_of,
+            self.head,
+            lambda i: (self.job_succ[i], self.machine_succ(i)),
+            undo,
+        ) and self._propagate(
+            [x for x in (u, v, before) if x >= 0],
+            self._tail_of,
+            self.tail,
+            lambda i: (self.job_pred[i], self.machine_pred(i)),
+            undo,
+        )
+        if not ok:
+            self.revert(u, v, undo)
+            return None
+        return undo
+
+    def revert(self, u, v, undo):
+        ops = self.seq[self.machine_of[u]]
+        ku, kv = self.pos[u], self.pos[v]
+        ops[ku], ops[kv] = v, u
+        self.pos[u], self.pos[v] = kv, ku
+        for values, i, old in reversed(undo):
+            values[i] = old
+
+    def makespan(self):
+        return max((self.head[i] + self.p[i] for i in self.last_ops), default=0)
+
+    def critical_blocks(self):
+        """
+        Bloques críticos: operaciones consecutivas del camino crítico que
+        comparten máquina.
+        """
+        if not self.last_ops:
+            return [], -1, -1
+        i = max(self.last_ops, key=lambda j: self.head[j] + self.p[j])
+        path = []
+        while i >= 0 and i not in self.fixed:
+            path.append(i)
+            a, b = self.job_pred[i], self.machine_pred(i)
+            end_a = self.head[a] + self.p[a] if a >= 0 else -1
+            end_b = self.head[b] + self.p[b] if b >= 0 else -1
+            i = b if end_b > end_a else a
+        path.reverse()
+        blocks, block = [], []
+        for i in path:
+            if block and self.machine_pred(i) == block[-1]:
+                block.append(i)
+            else:
+                if len(block) > 1:
+                    blocks.append(block)
+                block = [i]
+        if len(block) > 1:
+            blocks.append(block)
+        return blocks, path[0] if path else -1, path[-1] if path else -1
+
+    def estimate(self, u, v):
+        """
+        Estimación (Taillard) del makespan tras intercambiar u -> v.
+        """
+        p, head, tail = self.p, self.head, self.tail
+        a, b = self.job_pred[v], self.machine_pred(u)
+        r_v = max(head[a] + p[a] if a >= 0 else 0, head[b] + p[b] if b >= 0 else 0)
+        a = self.job_pred[u]
+        r_u = max(head[a] + p[a] if a >= 0 else 0, r_v + p[v])
+        s, c = self.job_succ[u], self.machine_succ(v)
+        q_u = max(tail[s] + p[s] if s >= 0 else 0, tail[c] + p[c] if c >= 0 else 0)
+        s = self.job_succ[v]
+        q_v = max(tail[s] + p[s] if s >= 0 else 0, q_u + p[u])
+        return max(r_v + p[v] + q_v, r_u + p[u] + q_u)
+
+    def starts(self):
+        return np.asarray(self.head, dtype=np.int64)
+
+
+def left_shift(
+    instance: JobShopInstance,
+    starts,
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+) -> np.ndarray:
+    """
+    Schedule semi-activo con las mismas secuencias por máquina que `starts`:
+    cada operación adelanta su inicio todo lo que permiten sus predecesores.
+    """
+    state = _SequenceState(instance, starts, H_daily=H_daily, fixed=fixed)
+    if not state.full_evaluation():
+        return np.asarray(starts, dtype=np.int64)
+    return state.starts()
+
+
+def _n5_moves(blocks, path_first, path_last):
+    # No se mueve el inicio de un bloque que abre el camino ni el final de
+    # uno que lo cierra: esos intercambios no reducen el makespan
+    moves = []
+    for block in blocks:
+        if block[0] != path_first:
+            moves.append((block[0], block[1]))
+        if block[-1] != path_last and (len(block) > 2 or block[0] == path_first):
+            moves.append((block[-2], block[-1]))
+    if not moves:
+        # N5 vacío: vecindario N1 sobre todos los pares de cada bloque
+        moves = [(b[j], b[j + 1]) for b in blocks for j in range(len(b) - 1)]
+    return moves
+
+
+def tabu_search(
+    instance: JobShopInstance,
+    starts,
+    H_daily: Optional[int] = None,
+    fixed: Optional[Dict[int, int]] = None,
+    time_limit: float = 1.0,
+    max_iterations: Optional[int] = None,
+    tenure: Optional[int] = None,
+    max_stall: int = 500,
+    lower_bound: int = 0,
+    seed: int = 0,
+    on_improvement: Optional[Callable[[int, float], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+) -> Optional[LocalSearchResult]:
+    """
+    Búsqueda tabú sobre intercambios de bloques críticos (vecindario N5),
+    partiendo de las secuencias por máquina implícitas en `starts` (por
+    ejemplo, un schedule heurístico o la solución de CP-SAT). Corre hasta
+    `time_limit` segundos de reloj, hasta alcanzar `lower_bound` o hasta que
+    `stop_requested()` sea True. Cada mejora se informa a
+    `on_improvement(makespan, segundos)`. Devuelve None si `starts` no es
+    factible para las restricciones de inicio fijo.
+    """
+    t0 = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    state = _SequenceState(instance, starts, H_daily=H_daily, fixed=fixed)
+    if not state.full_evaluation():
+        return None
+    current = state.makespan()
+    initial = best = current
+    best_seq = {m: list(ops) for m, ops in state.seq.items()}
+    tenure = tenure or max(8, int(np.sqrt(state.n)))
+    tabu = {}
+    iteration = stall = 0
+    while best > lower_bound and time.perf_counter() - t0 < time_limit:
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+        if stop_requested is not None and stop_requested():
+            break
+        iteration += 1
+        moves = [m for m in _n5_moves(*state.critical_blocks()) if m[0] not in state.fixed and m[1] not in state.fixed]
+        if not moves:
+            break
+        scored = sorted((state.estimate(u, v), k, (u, v)) for k, (u, v) in enumerate(moves))
+        chosen = None
+        for value, _, (u, v) in scored:
+            if tabu.get((v, u), 0) <= iteration or value < best:
+                chosen = (u, v)
+                break
+        if chosen is None:
+            chosen = scored[int(rng.integers(len(scored)))][2]
+        u, v = chosen
+        tabu[(u, v)] = iteration + tenure + int(rng.integers(0, 3))
+        if state.swap(u, v) is None:
+            continue
+        current = state.makespan()
+        if current < best:
+            best, stall = current, 0
+            best_seq = {m: list(ops) for m, ops in state.seq.items()}
+            if on_improvement is not None:
+                on_improvement(best, time.perf_counter() - t0)
+        else:
+            stall += 1
+        if stall >= max_stall:
+            # Reinicio desde la mejor solución con una pequeña perturbación
+            state.seq = {m: list(ops) for m, ops in best_seq.items()}
+            for ops in state.seq.values():
+                for k, i in enumerate(ops):
+                    state.pos[i] = k
+            state.full_evaluation()
+            for _ in range(3):
+                blocks = state.critical_blocks()[0]
+                pairs = [(b[j], b[j + 1]) for b in blocks for j in range(len(b) - 1)]
+                pairs = [m for m in pairs if m[0] not in state.fixed and m[1] not in state.fixed]
+                if not pairs:
+                    break
+                state.swap(*pairs[int(rng.integers(len(pairs)))])
+            tabu.clear()
+            stall = 0
+    state.seq = best_seq
+    for ops in state.seq.values():
+        for k, i in enumerate(ops):
+            state.pos[i] = k
+    state.full_evaluation()
+    return LocalSearchResult(
+        starts=state.starts(),
+        makespan=state.makespan(),
+        initial_makespan=initial,
+        iterations=iteration,
+        elapsed=time.perf_counter() - t0,
+    )
@@ -1,18 +1,27 @@
+from dataclasses import dataclass, field
+from typing import Callable, Optional
 from ortools.sat.python import cp_model
+import numpy as np
 import pandas as pd
-from src.utils.helpers import build_schedule_results
+from src.optimization.bounds import ScheduleBounds, bounds_report, compute_bounds
+from src.optimization.heuristics import DISPATCH_RULES, HeuristicSchedule, best_dispatch
+from src.optimization.incumbents import IncumbentRecorder, watch_stop
+from src.optimization.instance import JobShopInstance, build_instance
+from src.optimization.local_search import tabu_search
+from src.optimization.solver_config import SolverConfig, make_solver
+from src.utils.helpers import PhaseTimer, build_schedule_results
 import warnings
 
 
 def preprocess_jobshop_df(df, time_scale, use_setup_times):
     df = df.copy()
     df["processing_time_scaled"] = (
-        (df["processing_time"] * time_scale).round().astype(int).fillna(0)
+        (df["processing_time"] * time_scale).fillna(0).round().astype(int)
     )
     if use_setup_times:
         if "setup_time" in df.columns:
             df["setup_time_scaled"] = (
-                (df["setup_time"] * time_scale).round().astype(int).fillna(0)
+                (df["setup_time"] * time_scale).fillna(0).round().astype(int)
             )
         else:
             warnings.warn(
@@ -23,24 +32,112 @@ def preprocess_jobshop_df(df, time_scale, use_setup_times):
 
 
 def build_jobs_data(df, use_setup_times):
-    jobs_data = {}
-    for job_id, job_df in df.groupby("job_id"):
-        job_df = job_df.sort_values("operation_index")
-        if use_setup_times:
-            jobs_data[job_id] = [
-                (
-                    int(row["machine_id"]),
-                    int(row["processing_time_scaled"]),
-                    int(row["setup_time_scaled"] if not pd.isna(row["setup_time_scaled"]) else 0),
+    return build_instance(df, use_setup_times).to_jobs_data()
+
+
+# Reglas de despacho (deterministas) usadas como solución inicial
+WARM_START_RULES = ("spt", "lpt", "mwkr", "fifo")
+# Avisos del solve: van en `attrs["warnings"]` del resultado (y en la
+# respuesta de la API), no a stdout de los procesos del pool
+HEURISTIC_FALLBACK = "CP-SAT no encontró solución a tiempo: se devuelve el schedule heurístico"
+NO_SOLUTION = "No se encontró solución factible"
+NO_DISPATCH = "Las reglas de despacho no encontraron un schedule factible"
+
+DAILY_LIMIT_ENCODINGS = ("auto", "division", "day_window", "night_intervals")
+
+# Fases registradas en `attrs["timings"]`: construcción del modelo y búsqueda
+BUILD_PHASES = ("preprocess", "jobs_data", "warm_start", "bounds", "model_build")
+SOLVE_PHASES = ("solve", "stage2", "polish")
+
+
+def choose_daily_limit_encoding(encoding, n_operations, n_machines, horizon, H_daily):
+    """
+    Resuelve la codificación de la restricción diaria. En modo "auto" se usan
+    intervalos de noche en cada `NoOverlap` salvo que la cantidad de días por
+    máquina supere varias veces la de operaciones; en ese caso, ventanas de día.
+    """
+    if encoding not in DAILY_LIMIT_ENCODINGS:
+        raise ValueError(f"Codificación de límite diario desconocida: {encoding}")
+    if encoding != "auto":
+        return encoding
+    n_days = horizon // H_daily + 1
+    if n_days * n_machines <= 4 * max(n_operations, 1):
+        return "night_intervals"
+    return "day_window"
+
+
+def merge_intervals(machine_downtime):
+    """
+    Ordena y une los intervalos `{máquina: [(inicio, fin), ...]}` que se
+    solapan, descartando los vacíos.
+    """
+    merged = {}
+    for machine, intervals in (machine_downtime or {}).items():
+        result = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if result and start <= result[-1][1]:
+                result[-1] = (result[-1][0], max(result[-1][1], end))
+            else:
+                result.append((start, end))
+        if result:
+            merged[machine] = result
+    return merged
+
+
+def add_daily_limit_constraints(
+    model,
+    task_vars,
+    machine_to_intervals,
+    horizon,
+    H_daily,
+    daily_limit_encoding="auto",
+    downtime=None,
+    day_windows=None,
+):
+    """
+    Agrega la restricción de jornada: ninguna operación de `task_vars`
+    (`{(job_id, task_id): (inicio, término)}`) cruza el fin de un día de
+    `H_daily` unidades. Con "night_intervals" se agrega una unidad de noche
+    fija a cada lista de `machine_to_intervals` (salvo donde ya hay una
+    indisponibilidad de `downtime`); las demás codificaciones restringen el
+    inicio y el término de cada operación, con `day_windows` como rango de días.
+    """
+    encoding = choose_daily_limit_encoding(
+        daily_limit_encoding, len(task_vars), len(machine_to_intervals), horizon, H_daily
+    )
+    if encoding == "night_intervals":
+        # Una unidad de "noche" fija al final de cada jornada en cada máquina:
+        # ninguna operación puede terminar en el borde ni cruzar al día siguiente
+        n_days = horizon // H_daily + 1
+        for machine, intervals in machine_to_intervals.items():
+            for day in range(1, n_days + 1):
+                night = day * H_daily - 1
+                if any(a <= night < b for a, b in (downtime or {}).get(machine, ())):
+                    continue
+                intervals.append(
+                    model.NewFixedSizeIntervalVar(
+                        day * H_daily - 1, 1, f"night_{machine}_{day}"
+                    )
                 )
-                for _, row in job_df.iterrows()
-            ]
+        return
+    for (job_id, task_id), (start_var, end_var) in task_vars.items():
+        if day_windows is not None:
+            day_min, day_max = day_windows[(job_id, task_id)]
         else:
-            jobs_data[job_id] = [
-                (int(row["machine_id"]), int(row["processing_time_scaled"]))
-                for _, row in job_df.iterrows()
-            ]
-    return jobs_data
+            day_min, day_max = 0, horizon // H_daily
+        if encoding == "day_window":
+            # H·d <= inicio y término <= H·(d + 1) - 1
+            day = model.NewIntVar(day_min, day_max, f"day_{job_id}_{task_id}")
+            model.Add(start_var >= H_daily * day)
+            model.Add(end_var <= H_daily * day + H_daily - 1)
+        else:
+            day_start = model.NewIntVar(day_min, day_max, f"day_start_{job_id}_{task_id}")
+            day_end = model.NewIntVar(day_min, day_max, f"day_end_{job_id}_{task_id}")
+            model.AddDivisionEquality(day_start, start_var, H_daily)
+            model.AddDivisionEquality(day_end, end_var, H_daily)
+            model.Add(day_start == day_end)
 
 
 def create_cp_variables_and_constraints(
@@ -52,6 +149,10 @@ def create_cp_variables_and_constraints(
     time_scale,
     use_setup_times,
     start_time_fixed_map=None,
+    time_windows=None,
+    day_windows=None,
+    daily_limit_encoding="auto",
+    machine_downtime=None,
 ):
     all_tasks = {}
     job_ends = {}
@@ -65,8 +166,13 @@ def create_cp_variables_and_constraints(
                 machine, duration = op
                 total_duration = duration
             suffix = f"_{job_id}_{task_id}"
-            start_var = model.NewIntVar(0, horizon, "start" + suffix)
-            end_var = model.NewIntVar(0, horizon, "end" + suffix)
+            # Ventana [release, deadline] precalculada o [0, horizon]
+            if time_windows is not None:
+                start_min, end_max = time_windows[(job_id, task_id)]
+            else:
+                start_min, end_max = 0, horizon
+            start_var = model.NewIntVar(start_min, end_max - total_duration, "start" + suffix)
+            end_var = model.NewIntVar(start_min + total_duration, end_max, "end" + suffix)
             interval = model.NewIntervalVar(
                 start_var, total_duration, end_var, "interval" + suffix
             )
@@ -75,70 +181,160 @@ def create_cp_variables_and_constraints(
             if start_time_fixed_map is not None:
                 key = (job_id, task_id)
                 if key in start_time_fixed_map and start_time_fixed_map[key] is not None:
-                    model.Add(start_var == int(start_time_fixed_map[key] * time_scale))
+                    model.Add(start_var == int(round(start_time_fixed_map[key] * time_scale)))
             if previous_end is not None:
                 model.Add(start_var >= previous_end)
             previous_end = end_var
         job_ends[job_id] = previous_end
-    # No solapamiento por máquina
     machine_to_intervals = {}
     for (job_id, task_id), (_, _, interval, machine) in all_tasks.items():
         machine_to_intervals.setdefault(machine, []).append(interval)
-    for machine, intervals in machine_to_intervals.items():
-        model.AddNoOverlap(intervals)
+    # Intervalos fijos de indisponibilidad (escalados) en cada máquina
+    downtime = merge_intervals(machine_downtime)
+    for machine, intervals in downtime.items():
+        if machine not in machine_to_intervals:
+            continue
+        for k, (start, end) in enumerate(intervals):
+            machine_to_intervals[machine].append(
+                model.NewFixedSizeIntervalVar(start, end - start, f"downtime_{machine}_{k}")
+            )
     # Restricción diaria opcional
     if enforce_daily_limit:
-        H_daily = int(H_daily_hours * time_scale)
-        for (job_id, task_id), (start_var, end_var, _, _) in all_tasks.items():
-            day_start = model.NewIntVar(0, 1000, f"day_start_{job_id}_{task_id}")
-            day_end = model.NewIntVar(0, 1000, f"day_end_{job_id}_{task_id}")
-            model.AddDivisionEquality(day_start, start_var, H_daily)
-            model.AddDivisionEquality(day_end, end_var, H_daily)
-            model.Add(day_start == day_end)
+        add_daily_limit_constraints(
+            model,
+            {key: (start_var, end_var) for key, (start_var, end_var, _, _) in all_tasks.items()},
+            machine_to_intervals,
+            horizon,
+            int(H_daily_hours * time_scale),
+            daily_limit_encoding,
+            downtime,
+            day_windows,
+        )
+    # No solapamiento por máquina
+    for machine, intervals in machine_to_intervals.items():
+        model.AddNoOverlap(intervals)
     return all_tasks, job_ends
 
 
+def solution_values(solver, variables):
+    """
+    Lee en bloque los valores de `variables` desde la respuesta del solver.
+    """
+    indices = np.fromiter((var.Index() for var in variables), dtype=np.int64)
+    solution = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+    if len(solution) == 0:
+        return solver.Values(variables).to_numpy(dtype=np.int64)
+    return solution[indices]
+
+
+def add_solution_hint(model, variables, values):
+    for var, value in zip(variables, np.asarray(values).tolist()):
+        model.AddHint(var, value)
+
+
+def hint_from_solver(model, solver):
+    """
+    Usa la solución completa de `solver` (sobre el mismo modelo) como hint.
+    """
+    solution = list(solver.ResponseProto().solution)
+    model.ClearHints()
+    hint = model.Proto().solution_hint
+    hint.vars.extend(range(len(solution)))
+    hint.values.extend(solution)
+
+
 def build_jobshop_results(jobs_data, all_tasks, solver, time_scale, use_setup_times):
-    results = []
-    for job_id, operations in jobs_data.items():
-        for task_id, op in enumerate(operations):
-            start_var, end_var, _, machine = all_tasks[(job_id, task_id)]
-            start_h = solver.Value(start_var) / time_scale
-            end_h = solver.Value(end_var) / time_scale
-            duration_h = end_h - start_h
-            if use_setup_times:
-                _, duration, setup = op
-                setup_h = setup / time_scale
-                process_h = duration / time_scale
-                results.append(
-                    {
-                        "job_id": job_id,
-                        "operation_index": task_id,
-                        "machine_id": machine,
-                        "start_time_hours": round(start_h, 2),
-                        "end_time_hours": round(end_h, 2),
-                        "duration_hours": round(duration_h, 2),
-                        "setup_time_hours": round(setup_h, 2),
-                        "processing_time_hours": round(process_h, 2),
-                    }
-                )
-            else:
-                _, duration = op
-                process_h = duration / time_scale
-                results.append(
-                    {
-                        "job_id": job_id,
-                        "operation_index": task_id,
-                        "machine_id": machine,
-                        "start_time_hours": round(start_h, 2),
-                        "end_time_hours": round(end_h, 2),
-                        "duration_hours": round(duration_h, 2),
-                        "processing_time_hours": round(process_h, 2),
-                    }
-                )
+    keys = [
+        (job_id, task_id)
+        for job_id, operations in jobs_data.items()
+        for task_id in range(len(operations))
+    ]
+    tasks = [all_tasks[key] for key in keys]
+    ops = [op for operations in jobs_data.values() for op in operations]
+    starts = solution_values(solver, [task[0] for task in tasks])
+    ends = solution_values(solver, [task[1] for task in tasks])
+    start_h = starts / time_scale
+    end_h = ends / time_scale
+    results = {
+        "job_id": np.array([key[0] for key in keys]),
+        "operation_index": np.array([key[1] for key in keys], dtype=np.int64),
+        "machine_id": np.array([task[3] for task in tasks], dtype=np.int64),
+        "start_time_hours": np.round(start_h, 2),
+        "end_time_hours": np.round(end_h, 2),
+        "duration_hours": np.round(end_h - start_h, 2),
+    }
+    durations = np.array([op[1] for op in ops], dtype=np.int64)
+    if use_setup_times:
+        setups = np.array([op[2] for op in ops], dtype=np.int64)
+        results["setup_time_hours"] = np.round(setups / time_scale, 2)
+    results["processing_time_hours"] = np.round(durations / time_scale, 2)
     return results
 
 
+def attach_solve_info(schedule_df, **info):
+    """
+    Adjunta información del solve (por ejemplo `solver_log`, `incumbents`,
+    `timings`, segundos por fase, o `warnings`, avisos como la vuelta al
+    schedule heurístico) en `schedule_df.attrs`, omitiendo los valores
+    vacíos.
+    """
+    for key, value in info.items():
+        if not value:
+            continue
+        if isinstance(value, dict):
+            schedule_df.attrs[key] = dict(value)
+        elif isinstance(value, (list, tuple)):
+            schedule_df.attrs[key] = list(value)
+        else:
+            schedule_df.attrs[key] = value
+    return schedule_df
+
+
+def solve_with_monitor(
+    solver, model, makespan, time_scale, stage=1, on_incumbent=None, stop_requested=None
+):
+    """
+    Resuelve registrando cada incumbente y atendiendo pedidos de detención.
+    Devuelve `(status, incumbents)`.
+    """
+    recorder = IncumbentRecorder(
+        makespan,
+        time_scale,
+        stage=stage,
+        on_incumbent=on_incumbent,
+        stop_requested=stop_requested,
+    )
+    stop_watch = watch_stop(solver, stop_requested)
+    try:
+        status = solver.Solve(model, recorder)
+    finally:
+        stop_watch()
+    return status, recorder.incumbents
+
+
+def solver_stats(solver, status, time_scale, stage=1) -> dict:
+    """
+    Estadísticas de un solve CP-SAT: estado, objetivo y mejor cota (en horas),
+    gap relativo, ramas, conflictos y tiempo de reloj.
+    """
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    objective = solver.ObjectiveValue() if found else None
+    bound = solver.BestObjectiveBound()
+    gap = None
+    if objective is not None:
+        gap = abs(objective - bound) / max(1.0, abs(objective))
+    return {
+        "stage": stage,
+        "status": solver.StatusName(status).lower(),
+        "objective": round(objective / time_scale, 2) if objective is not None else None,
+        "best_bound": round(bound / time_scale, 2),
+        "gap": round(gap, 6) if gap is not None else None,
+        "branches": solver.NumBranches(),
+        "conflicts": solver.NumConflicts(),
+        "wall_time": round(solver.WallTime(), 3),
+    }
+
+
 def build_start_time_fixed_map(fixed_starts):
     if not fixed_starts:
         return None
@@ -151,6 +347,179 @@ def build_start_time_fixed_map(fixed_starts):
     return start_time_fixed_map
 
 
+@dataclass
+class JobShopModel:
+    """
+    Modelo CP-SAT construido junto con los datos necesarios para resolverlo
+    y leer resultados.
+    """
+
+    model: cp_model.CpModel
+    all_tasks: dict
+    job_ends: dict
+    makespan: cp_model.IntVar
+    jobs_data: dict
+    instance: JobShopInstance
+    bounds: ScheduleBounds
+    time_scale: int
+    use_setup_times: bool
+    heuristic: Optional[HeuristicSchedule] = None
+    fixed: Optional[dict] = None
+    timings: dict = field(default_factory=dict)
+
+    def results(self, solver) -> pd.DataFrame:
+        return pd.DataFrame(
+            build_jobshop_results(
+                self.jobs_data, self.all_tasks, solver, self.time_scale, self.use_setup_times
+            )
+        )
+
+    def polish(self, solver, time_limit, H_daily_hours, enforce_daily_limit):
+        """
+        Mejora la solución de `solver` con búsqueda tabú. Devuelve
+        `(resultados, makespan escalado)` solo si el makespan mejora.
+        """
+        start_vars = [start_var for (start_var, _, _, _) in self.all_tasks.values()]
+        result = tabu_search(
+            self.instance,
+            solution_values(solver, start_vars),
+            H_daily=int(H_daily_hours * self.time_scale) if enforce_daily_limit else None,
+            fixed=self.fixed,
+            time_limit=time_limit,
+            lower_bound=max(self.bounds.lower_bound, int(solver.BestObjectiveBound())),
+        )
+        if result is None or result.makespan >= solver.Value(self.makespan):
+            return None
+        return pd.DataFrame(self.instance.schedule_columns(result.starts, self.time_scale)), result.makespan
+
+    def heuristic_results(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            self.instance.schedule_columns(self.heuristic.starts, self.time_scale)
+        )
+
+    def heuristic_is_optimal(self) -> bool:
+        # El schedule de las reglas de despacho ya alcanza la cota inferior
+        return self.heuristic is not None and self.heuristic.makespan <= self.bounds.lower_bound
+
+    def heuristic_incumbent(self, stage: int = 1) -> dict:
+        makespan = round(self.heuristic.makespan / self.time_scale, 2)
+        return {
+            "stage": stage,
+            "makespan": makespan,
+            "objective": makespan,
+            "bound": round(self.bounds.lower_bound / self.time_scale, 2),
+            "wall_time": 0.0,
+        }
+
+
+def build_jobshop_model(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    fixed_starts: dict = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    release_time: float = 0.0,
+    machine_downtime: Optional[dict] = None,
+    tight_horizon: bool = True,
+) -> JobShopModel:
+    """
+    Preprocesa la instancia, calcula cotas y construye el modelo CP-SAT con
+    la variable de makespan (sin objetivo). Con `warm_start`, un schedule de
+    reglas de despacho se agrega como hint. Con `tight_horizon` el horizonte
+    se acota con ese schedule y con la cota greedy (solo válido cuando el
+    objetivo es el makespan); sin él se usa el horizonte trivial.
+
+    `release_time` (horas) es el inicio más temprano de las operaciones sin
+    inicio fijo y `machine_downtime` (`{máquina: [(inicio, fin), ...]}`, en
+    horas) los intervalos en que cada máquina no está disponible. Los
+    segundos de cada fase (`BUILD_PHASES`) quedan en `timings`.
+    """
+    timer = PhaseTimer()
+    with timer.phase("preprocess"):
+        df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
+    with timer.phase("jobs_data"):
+        instance = build_instance(df, use_setup_times)
+        jobs_data = instance.to_jobs_data()
+    start_time_fixed_map = build_start_time_fixed_map(fixed_starts)
+    H_daily = int(H_daily_hours * time_scale)
+    fixed = instance.scaled_fixed_starts(start_time_fixed_map, time_scale)
+    release = int(np.ceil(release_time * time_scale - 1e-6))
+    # Redondeo conservador, con tolerancia para el error de punto flotante
+    downtime = merge_intervals(
+        {
+            machine: [
+                (int(np.floor(start * time_scale + 1e-6)), int(np.ceil(end * time_scale - 1e-6)))
+                for start, end in intervals
+            ]
+            for machine, intervals in (machine_downtime or {}).items()
+        }
+    )
+    heuristic = None
+    if warm_start:
+        with timer.phase("warm_start"):
+            heuristic = best_dispatch(
+                instance,
+                rules=WARM_START_RULES,
+                H_daily=H_daily if enforce_daily_limit else None,
+                fixed=fixed,
+                release_time=release,
+                machine_downtime=downtime,
+            )
+    with timer.phase("bounds"):
+        bounds = compute_bounds(
+            instance,
+            enforce_daily_limit=enforce_daily_limit,
+            H_daily=H_daily,
+            start_time_fixed_map=start_time_fixed_map,
+            time_scale=time_scale,
+            upper_bound=heuristic.makespan if heuristic is not None else None,
+            release_time=release,
+            machine_downtime=downtime,
+            tight_horizon=tight_horizon,
+        )
+    horizon = bounds.horizon
+    with timer.phase("model_build"):
+        model = cp_model.CpModel()
+        all_tasks, job_ends = create_cp_variables_and_constraints(
+            model,
+            jobs_data,
+            horizon,
+            enforce_daily_limit,
+            H_daily_hours,
+            time_scale,
+            use_setup_times,
+            start_time_fixed_map,
+            bounds.time_windows(instance),
+            bounds.day_windows(instance),
+            daily_limit_encoding,
+            downtime,
+        )
+        makespan = model.NewIntVar(bounds.lower_bound, horizon, "makespan")
+        model.AddMaxEquality(makespan, list(job_ends.values()))
+        if heuristic is not None:
+            # El orden de all_tasks coincide con el de la instancia
+            start_vars = [start_var for (start_var, _, _, _) in all_tasks.values()]
+            add_solution_hint(model, start_vars, heuristic.starts)
+            model.AddHint(makespan, heuristic.makespan)
+    return JobShopModel(
+        model=model,
+        all_tasks=all_tasks,
+        job_ends=job_ends,
+        makespan=makespan,
+        jobs_data=jobs_data,
+        instance=instance,
+        bounds=bounds,
+        time_scale=time_scale,
+        use_setup_times=use_setup_times,
+        heuristic=heuristic,
+        fixed=fixed,
+        timings=timer.timings,
+    )
+
+
 def solve_jobshop(
     df: pd.DataFrame,
     time_scale: int = 60,
@@ -159,42 +528,202 @@ def solve_jobshop(
     use_setup_times: bool = False,
     max_time: int = 100,
     fixed_starts: dict = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    polish_time: float = 0.0,
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
 ):
     """
     Resuelve un Job Shop Scheduling, con opción de considerar tiempos de setup.
+    Si `polish_time > 0` y CP-SAT no prueba optimalidad, la solución se mejora
+    con búsqueda tabú durante esa cantidad de segundos. `solver_config`
+    controla hilos, semilla, determinismo y límites de gap de CP-SAT.
+
+    Cada solución mejorante se pasa a `on_incumbent`; si `stop_requested()`
+    devuelve True el solve se detiene y se devuelve la mejor solución hasta
+    ese momento. `attrs["timings"]` del resultado registra los segundos de
+    cada fase, `attrs["solver_stats"]` las estadísticas de CP-SAT y
+    `attrs["lower_bounds"]` las cotas inferiores y el gap (ver
+    `bounds_report`). Si el schedule heurístico ya alcanza la cota inferior
+    combinatoria, se devuelve sin llamar a CP-SAT.
+    """
+    jsm = build_jobshop_model(
+        df,
+        time_scale=time_scale,
+        H_daily_hours=H_daily_hours,
+        enforce_daily_limit=enforce_daily_limit,
+        use_setup_times=use_setup_times,
+        fixed_starts=fixed_starts,
+        daily_limit_encoding=daily_limit_encoding,
+        warm_start=warm_start,
+    )
+    jsm.model.Minimize(jsm.makespan)
+    timer = PhaseTimer(jsm.timings)
+    if jsm.heuristic_is_optimal():
+        # Óptimo sin CP-SAT: `lower_bounds` lo muestra con gap 0
+        incumbent = jsm.heuristic_incumbent()
+        if on_incumbent is not None:
+            on_incumbent(incumbent)
+        with timer.phase("results"):
+            results = jsm.heuristic_results()
+        return attach_solve_info(
+            results,
+            incumbents=[incumbent],
+            timings=timer.timings,
+            lower_bounds=bounds_report(jsm.bounds, time_scale, jsm.heuristic.makespan),
+        )
+    solver, log_lines = make_solver(max_time, solver_config)
+    with timer.phase("solve"):
+        status, incumbents = solve_with_monitor(
+            solver,
+            jsm.model,
+            jsm.makespan,
+            time_scale,
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
+        )
+    info = {
+        "solver_log": log_lines,
+        "incumbents": incumbents,
+        "timings": timer.timings,
+        "solver_stats": [solver_stats(solver, status, time_scale)],
+    }
+    if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+        if status == cp_model.UNKNOWN and jsm.heuristic is not None:
+            report = bounds_report(jsm.bounds, time_scale, jsm.heuristic.makespan, solver.BestObjectiveBound())
+            return attach_solve_info(
+                jsm.heuristic_results(), lower_bounds=report, warnings=[HEURISTIC_FALLBACK], **info
+            )
+        return attach_solve_info(pd.DataFrame(), warnings=[NO_SOLUTION], **info)
+    makespan = int(solver.ObjectiveValue())
+    stopped = stop_requested is not None and stop_requested()
+    if polish_time > 0 and status != cp_model.OPTIMAL and not stopped:
+        with timer.phase("polish"):
+            polished = jsm.polish(solver, polish_time, H_daily_hours, enforce_daily_limit)
+        if polished is not None:
+            results, makespan = polished
+            report = bounds_report(jsm.bounds, time_scale, makespan, solver.BestObjectiveBound())
+            return attach_solve_info(results, lower_bounds=report, **info)
+    with timer.phase("results"):
+        results = jsm.results(solver)
+    report = bounds_report(jsm.bounds, time_scale, makespan, solver.BestObjectiveBound())
+    return attach_solve_info(results, lower_bounds=report, **info)
+
+
+def solve_jobshop_local_search(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    max_time: float = 10,
+    fixed_starts: dict = None,
+    seed: int = 0,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+):
     """
-    df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
-    jobs_data = build_jobs_data(df, use_setup_times)
+    Reglas de despacho seguidas de búsqueda tabú sobre el camino crítico
+    durante `max_time` segundos, sin CP-SAT. Pensado para instancias grandes
+    donde CP-SAT no cierra el gap en el tiempo disponible. Las mejoras se
+    informan a `on_incumbent` con el mismo formato que en `solve_jobshop`.
+    """
+    timer = PhaseTimer()
+    with timer.phase("preprocess"):
+        df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
+    with timer.phase("jobs_data"):
+        instance = build_instance(df, use_setup_times)
     start_time_fixed_map = build_start_time_fixed_map(fixed_starts)
-    if use_setup_times:
-        horizon = int(
-            (df["processing_time_scaled"] + df["setup_time_scaled"]).sum() * 2
+    H_daily = int(H_daily_hours * time_scale) if enforce_daily_limit else None
+    fixed = instance.scaled_fixed_starts(start_time_fixed_map, time_scale)
+    with timer.phase("warm_start"):
+        initial = best_dispatch(instance, rules=WARM_START_RULES, H_daily=H_daily, fixed=fixed)
+    if initial is None:
+        return attach_solve_info(pd.DataFrame(), warnings=[NO_DISPATCH], timings=timer.timings)
+    with timer.phase("bounds"):
+        bounds = compute_bounds(
+            instance,
+            enforce_daily_limit=enforce_daily_limit,
+            H_daily=H_daily,
+            start_time_fixed_map=start_time_fixed_map,
+            time_scale=time_scale,
+            upper_bound=initial.makespan,
         )
-    else:
-        horizon = int(df["processing_time_scaled"].sum() * 2)
-    model = cp_model.CpModel()
-    all_tasks, job_ends = create_cp_variables_and_constraints(
-        model,
-        jobs_data,
-        horizon,
-        enforce_daily_limit,
-        H_daily_hours,
-        time_scale,
-        use_setup_times,
-        start_time_fixed_map,
+    incumbents = []
+
+    def record(makespan, elapsed):
+        incumbent = {
+            "stage": 1,
+            "makespan": round(makespan / time_scale, 2),
+            "objective": round(makespan / time_scale, 2),
+            "bound": round(bounds.lower_bound / time_scale, 2),
+            "wall_time": round(elapsed, 3),
+        }
+        incumbents.append(incumbent)
+        if on_incumbent is not None:
+            on_incumbent(incumbent)
+
+    record(initial.makespan, 0.0)
+    with timer.phase("solve"):
+        result = tabu_search(
+            instance,
+            initial.starts,
+            H_daily=H_daily,
+            fixed=fixed,
+            time_limit=max_time,
+            lower_bound=bounds.lower_bound,
+            seed=seed,
+            on_improvement=record,
+            stop_requested=stop_requested,
+        )
+    with timer.phase("results"):
+        results = pd.DataFrame(instance.schedule_columns(result.starts, time_scale))
+    return attach_solve_info(
+        results,
+        incumbents=incumbents,
+        timings=timer.timings,
+        lower_bounds=bounds_report(bounds, time_scale, result.makespan),
     )
-    makespan = model.NewIntVar(0, horizon, "makespan")
-    model.AddMaxEquality(makespan, list(job_ends.values()))
-    model.Minimize(makespan)
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = max_time
-    status = solver.Solve(model)
-    if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        results = build_jobshop_results(jobs_data, all_tasks, solver, time_scale, use_setup_times)
-    else:
-        print("❌ No se encontró solución factible.")
-        return pd.DataFrame()
-    return pd.DataFrame(results)
+
+
+def solve_jobshop_heuristic(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    fixed_starts: dict = None,
+    rule: str = "best",
+    time_limit: float = 0.5,
+    seed: int = 0,
+):
+    """
+    Schedule factible en milisegundos mediante reglas de despacho, sin CP-SAT.
+    Con `rule="best"` prueba todas las reglas y reinicios aleatorios hasta
+    `time_limit` segundos.
+    """
+    timer = PhaseTimer()
+    with timer.phase("preprocess"):
+        df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
+    with timer.phase("jobs_data"):
+        instance = build_instance(df, use_setup_times)
+    start_time_fixed_map = build_start_time_fixed_map(fixed_starts)
+    with timer.phase("solve"):
+        schedule = best_dispatch(
+            instance,
+            rules=DISPATCH_RULES if rule == "best" else (rule,),
+            H_daily=int(H_daily_hours * time_scale) if enforce_daily_limit else None,
+            fixed=instance.scaled_fixed_starts(start_time_fixed_map, time_scale),
+            time_limit=time_limit,
+            seed=seed,
+        )
+    if schedule is None:
+        return attach_solve_info(pd.DataFrame(), warnings=[NO_DISPATCH], timings=timer.timings)
+    with timer.phase("results"):
+        results = pd.DataFrame(instance.schedule_columns(schedule.starts, time_scale))
+    return attach_solve_info(results, timings=timer.timings)
 
 
 def solve_jobshop_two_stage(
@@ -206,54 +735,105 @@ def solve_jobshop_two_stage(
     max_time_stage1: int = 60,
     max_time_stage2: int = 60,
     fixed_starts: dict = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
 ):
-    df, use_setup_times = preprocess_jobshop_df(df, time_scale, use_setup_times)
-    jobs_data = build_jobs_data(df, use_setup_times)
-    start_time_fixed_map = build_start_time_fixed_map(fixed_starts)
-    if use_setup_times:
-        horizon = int(
-            (df["processing_time_scaled"] + df["setup_time_scaled"]).sum() * 2
-        )
+    # Un único modelo para ambas etapas
+    jsm = build_jobshop_model(
+        df,
+        time_scale=time_scale,
+        H_daily_hours=H_daily_hours,
+        enforce_daily_limit=enforce_daily_limit,
+        use_setup_times=use_setup_times,
+        fixed_starts=fixed_starts,
+        daily_limit_encoding=daily_limit_encoding,
+        warm_start=warm_start,
+    )
+    model, makespan = jsm.model, jsm.makespan
+    timer = PhaseTimer(jsm.timings)
+    start_vars = [start_var for (start_var, _, _, _) in jsm.all_tasks.values()]
+    if jsm.heuristic_is_optimal():
+        # Etapa 1 resuelta por la cota inferior: la etapa 2 parte del schedule heurístico
+        incumbent = jsm.heuristic_incumbent()
+        if on_incumbent is not None:
+            on_incumbent(incumbent)
+        log_lines, incumbents, stats = [], [incumbent], []
+        best_makespan = jsm.heuristic.makespan
+        start_values = np.asarray(jsm.heuristic.starts)
+        report = bounds_report(jsm.bounds, time_scale, best_makespan)
+        with timer.phase("results"):
+            results_stage1 = jsm.heuristic_results()
     else:
-        horizon = int(df["processing_time_scaled"].sum() * 2)
-    def build_model():
-        model = cp_model.CpModel()
-        all_tasks, job_ends = create_cp_variables_and_constraints(
+        # Etapa 1: Minimizar makespan
+        model.Minimize(makespan)
+        solver1, log_lines = make_solver(max_time_stage1, solver_config)
+        with timer.phase("solve"):
+            status1, incumbents = solve_with_monitor(
+                solver1,
+                model,
+                makespan,
+                time_scale,
+                stage=1,
+                on_incumbent=on_incumbent,
+                stop_requested=stop_requested,
+            )
+        stats = [solver_stats(solver1, status1, time_scale, stage=1)]
+        if status1 not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            return attach_solve_info(
+                pd.DataFrame(),
+                warnings=[f"{NO_SOLUTION} en la etapa 1"],
+                solver_log=log_lines,
+                incumbents=incumbents,
+                timings=timer.timings,
+                solver_stats=stats,
+            )
+        best_makespan = solver1.Value(makespan)
+        start_values = solution_values(solver1, start_vars)
+        report = bounds_report(jsm.bounds, time_scale, best_makespan, solver1.BestObjectiveBound())
+        with timer.phase("results"):
+            results_stage1 = jsm.results(solver1)
+        hint_from_solver(model, solver1)
+    info = {
+        "solver_log": log_lines,
+        "incumbents": incumbents,
+        "timings": timer.timings,
+        "solver_stats": stats,
+        "lower_bounds": report,
+    }
+    if stop_requested is not None and stop_requested():
+        # Detenido por el cliente: no se ejecuta la etapa 2
+        return attach_solve_info(results_stage1, **info)
+    # Etapa 2: Minimizar suma de tiempos de inicio, partiendo de la solución de la etapa 1
+    model.Add(makespan == best_makespan)
+    total_start = cp_model.LinearExpr.Sum(start_vars)
+    # La solución de la etapa 1 acota el objetivo de la etapa 2
+    model.Add(total_start <= int(start_values.sum()))
+    model.Minimize(total_start)
+    solver2, log_lines2 = make_solver(max_time_stage2, solver_config)
+    with timer.phase("stage2"):
+        status2, incumbents2 = solve_with_monitor(
+            solver2,
             model,
-            jobs_data,
-            horizon,
-            enforce_daily_limit,
-            H_daily_hours,
+            makespan,
             time_scale,
-            use_setup_times,
-            start_time_fixed_map,
+            stage=2,
+            on_incumbent=on_incumbent,
+            stop_requested=stop_requested,
         )
-        makespan = model.NewIntVar(0, horizon, "makespan")
-        model.AddMaxEquality(makespan, list(job_ends.values()))
-        return model, all_tasks, job_ends, makespan
-    # Etapa 1: Minimizar makespan
-    model1, all_tasks1, job_ends1, makespan1 = build_model()
-    model1.Minimize(makespan1)
-    solver1 = cp_model.CpSolver()
-    solver1.parameters.max_time_in_seconds = max_time_stage1
-    status1 = solver1.Solve(model1)
-    if status1 not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        print("❌ No se encontró solución factible en la etapa 1.")
-        return pd.DataFrame()
-    best_makespan = solver1.Value(makespan1)
-    print(f"✅ Makespan mínimo encontrado: {best_makespan/time_scale} horas")
-    # Etapa 2: Minimizar suma de tiempos de inicio
-    model2, all_tasks2, job_ends2, makespan2 = build_model()
-    model2.Add(makespan2 == best_makespan)
-    total_start = sum(start_var for (start_var, _, _, _) in all_tasks2.values())
-    model2.Minimize(total_start)
-    solver2 = cp_model.CpSolver()
-    solver2.parameters.max_time_in_seconds = max_time_stage2
-    status2 = solver2.Solve(model2)
+    info = {
+        "solver_log": log_lines + log_lines2,
+        "incumbents": incumbents + incumbents2,
+        "timings": timer.timings,
+        "solver_stats": stats + [solver_stats(solver2, status2, time_scale, stage=2)],
+        "lower_bounds": report,
+    }
     if status2 in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-        results = build_jobshop_results(jobs_data, all_tasks2, solver2, time_scale, use_setup_times)
-        return pd.DataFrame(results)
+        with timer.phase("results"):
+            results = jsm.results(solver2)
+        return attach_solve_info(results, **info)
     else:
-        print("❌ No se encontró solución factible en la etapa 2. Se devuelven resultados de la etapa 1.")
-        results = build_jobshop_results(jobs_data, all_tasks1, solver1, time_scale, use_setup_times)
-        return pd.DataFrame(results)
\ No newline at end of file
+        warning = f"{NO_SOLUTION} en la etapa 2: se devuelven los resultados de la etapa 1"
+        return attach_solve_info(results_stage1, warnings=[warning], **info)
@@ -0,0 +1,176 @@
+import time
+from typing import Callable, Optional, Sequence
+from ortools.sat.python import cp_model
+import pandas as pd
+from src.optimization.bounds import bounds_report
+from src.optimization.model_builder import (
+    HEURISTIC_FALLBACK,
+    NO_SOLUTION,
+    attach_solve_info,
+    build_jobshop_model,
+    hint_from_solver,
+    solve_with_monitor,
+    solver_stats,
+)
+from src.optimization.objectives import OBJECTIVE_MODES, objective_terms, parse_objectives
+from src.optimization.solver_config import SolverConfig, make_solver
+from src.utils.helpers import PhaseTimer
+
+DEFAULT_OBJECTIVES = ("makespan", "total_flow_time")
+# Tiempo mínimo por etapa aunque las anteriores hayan agotado el presupuesto:
+# alcanza para que CP-SAT devuelva el hint de la etapa anterior
+MIN_STAGE_TIME = 0.5
+
+
+def _stage_objective(term, time_scale: int):
+    # Objetivo de la etapa en horas escaladas, como lo informan los incumbentes
+    if term.divisor == time_scale:
+        return term.expr
+    return term.expr * (time_scale / term.divisor)
+
+
+def solve_jobshop_multi_objective(
+    df: pd.DataFrame,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    max_time: float = 100,
+    fixed_starts: dict = None,
+    objectives: Sequence = DEFAULT_OBJECTIVES,
+    objective_mode: str = "lexicographic",
+    due_dates: Optional[dict] = None,
+    job_weights: Optional[dict] = None,
+    daily_limit_encoding: str = "auto",
+    warm_start: bool = True,
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+):
+    """
+    Optimiza varios objetivos (ver `OBJECTIVES`) sobre un único modelo
+    CP-SAT. `objectives` es una lista de nombres o de `{"name", "weight"}`;
+    `due_dates` (horas) y `job_weights` van por `job_id`.
+
+    - `objective_mode="lexicographic"`: una etapa por objetivo, en orden.
+      Cada etapa parte de la solución de la anterior como hint y agrega su
+      valor como cota superior del objetivo anterior, así que las siguientes
+      solo desempatan. Los `max_time` segundos se reparten entre las etapas
+      y el tiempo que una no usa pasa a las siguientes.
+    - `objective_mode="weighted"`: un solo solve de `Σ weight * objetivo`
+      (objetivos de tiempo en horas, `setup_count` en cantidad).
+
+    Si el makespan es el primer objetivo lexicográfico el horizonte se acota
+    con el schedule heurístico y la cota greedy y, si el heurístico alcanza
+    la cota inferior, la primera etapa se omite; si no, se usa el horizonte
+    trivial, porque el óptimo de otro objetivo puede terminar más tarde.
+    Si una etapa posterior a la primera no encuentra solución, se devuelve la
+    de la etapa anterior.
+    """
+    specs = parse_objectives(objectives)
+    if objective_mode not in OBJECTIVE_MODES:
+        raise ValueError(f"Modo de objetivos desconocido: {objective_mode} (usar 'lexicographic' o 'weighted')")
+    names = [name for name, _ in specs]
+    makespan_first = objective_mode == "lexicographic" and names[0] == "makespan"
+    jsm = build_jobshop_model(
+        df,
+        time_scale=time_scale,
+        H_daily_hours=H_daily_hours,
+        enforce_daily_limit=enforce_daily_limit,
+        use_setup_times=use_setup_times,
+        fixed_starts=fixed_starts,
+        daily_limit_encoding=daily_limit_encoding,
+        warm_start=warm_start,
+        # Las cotas superiores del makespan solo acotan el horizonte si el makespan manda
+        tight_horizon=makespan_first,
+    )
+    model = jsm.model
+    timer = PhaseTimer(jsm.timings)
+    with timer.phase("model_build"):
+        terms = objective_terms(jsm, names, due_dates, job_weights)
+        if objective_mode == "weighted":
+            weighted = cp_model.LinearExpr.Sum(
+                [_stage_objective(term, time_scale) * weight for term, (_, weight) in zip(terms, specs)]
+            )
+            stages = [("weighted", weighted, None)]
+        else:
+            stages = [(term.name, _stage_objective(term, time_scale), term) for term in terms]
+
+    t0 = time.perf_counter()
+    log_lines, incumbents, stats, warnings = [], [], [], []
+    best_solver = None
+    best_makespan = None
+    makespan_bound = None
+    for k, (name, objective, term) in enumerate(stages):
+        stage = k + 1
+        if k > 0 and stop_requested is not None and stop_requested():
+            # Detenido por el cliente: no se ejecutan las etapas restantes
+            break
+        if k == 0 and makespan_first and jsm.heuristic_is_optimal():
+            incumbent = jsm.heuristic_incumbent(stage)
+            if on_incumbent is not None:
+                on_incumbent(incumbent)
+            incumbents.append(incumbent)
+            best_makespan = jsm.heuristic.makespan
+            model.Add(jsm.makespan <= best_makespan)
+            continue
+        remaining = max(max_time - (time.perf_counter() - t0), 0.0)
+        solver, stage_log = make_solver(max(remaining / (len(stages) - k), MIN_STAGE_TIME), solver_config)
+        model.Minimize(objective)
+        with timer.phase("solve" if k == 0 else "stage2"):
+            status, stage_incumbents = solve_with_monitor(
+                solver,
+                model,
+                jsm.makespan,
+                time_scale,
+                stage=stage,
+                on_incumbent=on_incumbent,
+                stop_requested=stop_requested,
+            )
+        log_lines += stage_log
+        incumbents += stage_incumbents
+        stats.append(solver_stats(solver, status, time_scale, stage=stage))
+        if k == 0 and makespan_first:
+            makespan_bound = solver.BestObjectiveBound()
+        if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            if k == 0 and status == cp_model.UNKNOWN and jsm.heuristic is not None:
+                warnings.append(HEURISTIC_FALLBACK)
+                best_makespan = jsm.heuristic.makespan
+            elif best_solver is None and best_makespan is None:
+                return attach_solve_info(
+                    pd.DataFrame(),
+                    warnings=[NO_SOLUTION],
+                    solver_log=log_lines,
+                    incumbents=incumbents,
+                    timings=timer.timings,
+                    solver_stats=stats,
+                )
+            else:
+                warnings.append(
+                    f"{NO_SOLUTION} en la etapa {stage} ({name}): se devuelve la de la etapa anterior"
+                )
+            break
+        best_solver = solver
+        best_makespan = solver.Value(jsm.makespan)
+        if term is not None and k + 1 < len(stages):
+            # La etapa siguiente no puede empeorar este objetivo
+            model.Add(term.expr <= solver.Value(term.expr))
+            hint_from_solver(model, solver)
+    with timer.phase("results"):
+        results = jsm.results(best_solver) if best_solver is not None else jsm.heuristic_results()
+    report = bounds_report(
+        jsm.bounds,
+        time_scale,
+        # Con otro objetivo primero, alcanzar la cota no prueba optimalidad
+        best_makespan if makespan_first else None,
+        makespan_bound,
+    )
+    return attach_solve_info(
+        results,
+        solver_log=log_lines,
+        incumbents=incumbents,
+        timings=timer.timings,
+        solver_stats=stats,
+        lower_bounds=report,
+        warnings=warnings,
+    )
@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from typing import Optional
+from ortools.sat.python import cp_model
+import numpy as np
+import pandas as pd
+
+# Objetivos disponibles. Los de tiempo se miden en horas; `setup_count` en
+# cantidad de cambios de trabajo en una máquina
+OBJECTIVES = (
+    "makespan",
+    "total_tardiness",
+    "weighted_tardiness",
+    "total_flow_time",
+    "setup_count",
+    "machine_idle_time",
+)
+OBJECTIVE_MODES = ("lexicographic", "weighted")
+# Los pesos por trabajo se redondean a centésimos para que las restricciones
+# entre etapas lexicográficas sean enteras
+JOB_WEIGHT_SCALE = 100
+
+
+@dataclass
+class ObjectiveTerm:
+    """
+    Un objetivo dentro del modelo CP-SAT: `expr` es entera (tiempos
+    escalados) y su valor en horas (o en cantidad) es `expr / divisor`.
+    """
+
+    name: str
+    expr: cp_model.LinearExpr
+    divisor: int
+
+    def value(self, solver) -> float:
+        return solver.Value(self.expr) / self.divisor
+
+
+def parse_objectives(objectives) -> list:
+    """
+    Normaliza la lista de objetivos a pares `(nombre, peso)`. Acepta nombres
+    sueltos, dicts `{"name": ..., "weight": ...}` u objetos con esos
+    atributos; el peso por defecto es 1.
+    """
+    parsed = []
+    for item in objectives:
+        if isinstance(item, str):
+            name, weight = item, 1.0
+        elif isinstance(item, dict):
+            name, weight = item["name"], item.get("weight", 1.0)
+        else:
+            name, weight = item.name, item.weight
+        if name not in OBJECTIVES:
+            raise ValueError(f"Objetivo desconocido: {name} (opciones: {', '.join(OBJECTIVES)})")
+        if any(name == other for other, _ in parsed):
+            raise ValueError(f"El objetivo {name} está repetido")
+        parsed.append((name, float(1.0 if weight is None else weight)))
+    if not parsed:
+        raise ValueError("Se requiere al menos un objetivo")
+    return parsed
+
+
+def _tardiness_vars(model, job_ends, due_dates, horizon):
+    # Atraso de cada trabajo con fecha de entrega: T >= fin - entrega, T >= 0
+    tardiness = {}
+    for job_id, end in job_ends.items():
+        due = due_dates.get(job_id)
+        if due is None:
+            continue
+        var = model.NewIntVar(0, max(0, horizon - due), f"tardiness_{job_id}")
+        model.Add(var >= end - due)
+        tardiness[job_id] = var
+    return tardiness
+
+
+def _changeover_expr(model, all_tasks):
+    """
+    Cambios de trabajo entre operaciones consecutivas de cada máquina. Solo
+    varía si un mismo trabajo visita una máquina más de una vez: ahí se
+    modela la secuencia de la máquina con `AddCircuit` y cada arco entre
+    operaciones del mismo trabajo ahorra un cambio. En las demás máquinas
+    la cantidad es fija (operaciones - 1).
+    """
+    by_machine = {}
+    for key, (start, end, _, machine) in all_tasks.items():
+        by_machine.setdefault(machine, []).append((key[0], start, end))
+    constant = 0
+    saved = []
+    for machine, ops in by_machine.items():
+        constant += len(ops) - 1
+        jobs = [job for job, _, _ in ops]
+        if len(set(jobs)) == len(jobs):
+            continue
+        arcs = []
+        for i, (job_i, _, end_i) in enumerate(ops):
+            arcs.append((0, i + 1, model.NewBoolVar(f"first_{machine}_{i}")))
+            arcs.append((i + 1, 0, model.NewBoolVar(f"last_{machine}_{i}")))
+            for j, (job_j, start_j, _) in enumerate(ops):
+                if i == j:
+                    continue
+                lit = model.NewBoolVar(f"next_{machine}_{i}_{j}")
+                model.Add(start_j >= end_i).OnlyEnforceIf(lit)
+                arcs.append((i + 1, j + 1, lit))
+                if job_i == job_j:
+                    saved.append(lit)
+        model.AddCircuit(arcs)
+    return constant - cp_model.LinearExpr.Sum(saved)
+
+
+def _idle_expr(model, all_tasks, instance, horizon):
+    # Tiempo ocioso de cada máquina entre su primer inicio y su último fin
+    by_machine = {}
+    for start, end, _, machine in all_tasks.values():
+        by_machine.setdefault(machine, ([], []))
+        by_machine[machine][0].append(start)
+        by_machine[machine][1].append(end)
+    spans = []
+    for machine, (starts, ends) in by_machine.items():
+        first = model.NewIntVar(0, horizon, f"first_start_{machine}")
+        last = model.NewIntVar(0, horizon, f"last_end_{machine}")
+        model.AddMinEquality(first, starts)
+        model.AddMaxEquality(last, ends)
+        spans.append(last - first)
+    return cp_model.LinearExpr.Sum(spans) - int(instance.total_durations.sum())
+
+
+def objective_terms(
+    jsm,
+    names,
+    due_dates: Optional[dict] = None,
+    job_weights: Optional[dict] = None,
+) -> list:
+    """
+    Agrega al modelo de `jsm` (ver `build_jobshop_model`) las variables que
+    necesitan los objetivos `names` y devuelve un `ObjectiveTerm` por cada
+    uno. `due_dates` y `job_weights` van por `job_id`; las fechas en horas.
+    Los trabajos sin fecha de entrega no tienen atraso y los sin peso pesan 1.
+    """
+    model, time_scale, horizon = jsm.model, jsm.time_scale, jsm.bounds.horizon
+    due = {
+        job_id: int(round(d * time_scale)) for job_id, d in (due_dates or {}).items() if d is not None
+    }
+    tardiness = None
+    terms = []
+    for name in names:
+        if name in ("total_tardiness", "weighted_tardiness"):
+            if not due:
+                raise ValueError(f"El objetivo {name} requiere `due_dates`")
+            if tardiness is None:
+                tardiness = _tardiness_vars(model, jsm.job_ends, due, horizon)
+        if name == "makespan":
+            terms.append(ObjectiveTerm(name, jsm.makespan, time_scale))
+        elif name == "total_tardiness":
+            terms.append(ObjectiveTerm(name, cp_model.LinearExpr.Sum(list(tardiness.values())), time_scale))
+        elif name == "weighted_tardiness":
+            weights = job_weights or {}
+            expr = cp_model.LinearExpr.WeightedSum(
+                list(tardiness.values()),
+                [int(round(weights.get(job_id, 1.0) * JOB_WEIGHT_SCALE)) for job_id in tardiness],
+            )
+            terms.append(ObjectiveTerm(name, expr, time_scale * JOB_WEIGHT_SCALE))
+        elif name == "total_flow_time":
+            terms.append(ObjectiveTerm(name, cp_model.LinearExpr.Sum(list(jsm.job_ends.values())), time_scale))
+        elif name == "setup_count":
+            terms.append(ObjectiveTerm(name, _changeover_expr(model, jsm.all_tasks), 1))
+        elif name == "machine_idle_time":
+            terms.append(ObjectiveTerm(name, _idle_expr(model, jsm.all_tasks, jsm.instance, horizon), time_scale))
+        else:
+            raise ValueError(f"Objetivo desconocido: {name}")
+    return terms
+
+
+def evaluate_schedule(
+    schedule_df: pd.DataFrame,
+    due_dates: Optional[dict] = None,
+    job_weights: Optional[dict] = None,
+) -> dict:
+    """
+    Valor de cada objetivo de `OBJECTIVES` para un schedule de resultados
+    (columnas `job_id`, `machine_id`, `start_time_hours` y
+    `end_time_hours`), en horas. Es una pasada vectorizada, así que sirve
+    para cualquier modo de resolución; los atrasos solo se informan con
+    `due_dates`.
+    """
+    if schedule_df is None or schedule_df.empty:
+        return {}
+    job = schedule_df["job_id"].to_numpy()
+    machine = schedule_df["machine_id"].to_numpy()
+    start = schedule_df["start_time_hours"].to_numpy(dtype=float)
+    end = schedule_df["end_time_hours"].to_numpy(dtype=float)
+    completion = pd.Series(end).groupby(job).max()
+    values = {
+        "makespan": float(end.max()),
+        "total_flow_time": float(completion.sum()),
+    }
+    if due_dates:
+        due = completion.index.map(lambda j: due_dates.get(j, np.nan)).to_numpy(dtype=float)
+        tardiness = np.nan_to_num(np.maximum(completion.to_numpy() - due, 0.0))
+        weights = completion.index.map(lambda j: (job_weights or {}).get(j, 1.0)).to_numpy(dtype=float)
+        values["total_tardiness"] = float(tardiness.sum())
+        values["weighted_tardiness"] = float((weights * tardiness).sum())
+        values["tardy_jobs"] = int((tardiness > 0).sum())
+    # Secuencia de cada máquina: orden por (máquina, inicio)
+    order = np.lexsort((start, machine))
+    same_machine = machine[order][1:] == machine[order][:-1]
+    values["setup_count"] = int((same_machine & (job[order][1:] != job[order][:-1])).sum())
+    per_machine = pd.DataFrame({"machine": machine, "start": start, "end": end}).groupby("machine")
+    idle = per_machine["end"].max() - per_machine["start"].min() - (per_machine["end"].sum() - per_machine["start"].sum())
+    values["machine_idle_time"] = float(idle.sum())
+    return {name: round(value, 2) if isinstance(value, float) else value for name, value in values.items()}
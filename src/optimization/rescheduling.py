@@ -0,0 +1,225 @@
+from typing import Callable, Optional
+from ortools.sat.python import cp_model
+import numpy as np
+import pandas as pd
+from src.optimization.model_builder import (
+    HEURISTIC_FALLBACK,
+    NO_SOLUTION,
+    add_solution_hint,
+    attach_solve_info,
+    build_jobshop_model,
+    solve_with_monitor,
+    solver_stats,
+)
+from src.optimization.solver_config import SolverConfig, make_solver
+from src.utils.helpers import PhaseTimer
+
+
+def apply_schedule_changes(
+    df: pd.DataFrame,
+    added_operations: Optional[list] = None,
+    removed_jobs: Optional[list] = None,
+    duration_updates: Optional[list] = None,
+) -> pd.DataFrame:
+    """
+    Aplica cambios al conjunto de operaciones: agrega operaciones (dicts con
+    las mismas columnas de entrada), elimina trabajos completos y actualiza
+    `processing_time` / `setup_time` de operaciones existentes, identificadas
+    por `(job_id, operation_index)`.
+    """
+    df = df.copy()
+    if removed_jobs:
+        df = df[~df["job_id"].isin(removed_jobs)]
+    if added_operations:
+        df = pd.concat([df, pd.DataFrame(added_operations)], ignore_index=True)
+    for update in duration_updates or []:
+        mask = (df["job_id"] == update["job_id"]) & (
+            df["operation_index"] == update["operation_index"]
+        )
+        df.loc[mask, "processing_time"] = update["processing_time"]
+        if update.get("setup_time") is not None:
+            df.loc[mask, "setup_time"] = update["setup_time"]
+    return df.reset_index(drop=True)
+
+
+def _clip_downtime(machine_downtime, running, now):
+    """
+    Recorta la indisponibilidad para que empiece después de `now` y de las
+    operaciones en curso de la máquina (no se modela interrupción).
+    """
+    busy = {}
+    for row in running.itertuples():
+        busy[row.machine_id] = max(busy.get(row.machine_id, now), row.previous_end)
+    clipped = {}
+    for machine, intervals in (machine_downtime or {}).items():
+        kept = []
+        for start, end in intervals:
+            start = max(start, busy.get(machine, now))
+            if start < end:
+                kept.append((start, end))
+        if kept:
+            clipped[machine] = kept
+    return clipped
+
+
+def _executed_rows(executed: pd.DataFrame, use_setup_times: bool) -> dict:
+    # Mismas columnas que `build_jobshop_results`, con los tiempos del plan anterior
+    start = executed["previous_start"].to_numpy()
+    end = executed["previous_end"].to_numpy()
+    rows = {
+        "job_id": executed["job_id"].to_numpy(),
+        "operation_index": executed["position"].to_numpy(),
+        "machine_id": executed["machine_id"].to_numpy(),
+        "start_time_hours": np.round(start, 2),
+        "end_time_hours": np.round(end, 2),
+        "duration_hours": np.round(end - start, 2),
+    }
+    if use_setup_times:
+        rows["setup_time_hours"] = np.round(executed["setup_time"].fillna(0).to_numpy(), 2)
+    rows["processing_time_hours"] = np.round(executed["processing_time"].fillna(0).to_numpy(), 2)
+    rows["state"] = executed["state"].to_numpy()
+    return rows
+
+
+def reschedule_jobshop(
+    df: pd.DataFrame,
+    previous_schedule: pd.DataFrame,
+    now: float,
+    time_scale: int = 60,
+    H_daily_hours: int = 10,
+    enforce_daily_limit: bool = True,
+    use_setup_times: bool = False,
+    max_time: float = 30,
+    machine_downtime: Optional[dict] = None,
+    deviation_weight: float = 0.0,
+    daily_limit_encoding: str = "auto",
+    solver_config: Optional[SolverConfig] = None,
+    on_incumbent: Optional[Callable[[dict], None]] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+):
+    """
+    Re-planifica a partir de `now` (horas desde el inicio del plan) sobre las
+    operaciones de `df` (ya con los cambios aplicados, ver
+    `apply_schedule_changes`) y el plan anterior `previous_schedule`
+    (columnas `job_id`, `operation_index` como posición dentro del trabajo y
+    `start_time_hours`, como en la salida de `solve_jobshop`).
+
+    - Las operaciones terminadas antes de `now` salen del modelo y conservan
+      sus tiempos.
+    - Las que están en curso quedan con su inicio fijo.
+    - El resto no comienza antes de `now`, evita `machine_downtime`
+      (`{máquina: [(inicio, fin), ...]}` en horas) y usa el plan anterior
+      como hint.
+    - Con `deviation_weight > 0` se minimiza
+      `makespan + deviation_weight * Σ |inicio - inicio anterior|`.
+
+    La columna `state` del resultado indica `finished`, `running` o `planned`.
+    """
+    use_setup_times = use_setup_times and "setup_time" in df.columns
+    df = df.sort_values(["job_id", "operation_index"], kind="stable").reset_index(drop=True)
+    df["position"] = df.groupby("job_id").cumcount()
+    previous = previous_schedule[["job_id", "operation_index", "start_time_hours"]].rename(
+        columns={"operation_index": "position", "start_time_hours": "previous_start"}
+    )
+    df = df.merge(previous, on=["job_id", "position"], how="left")
+    # Los tiempos de salida están redondeados a 2 decimales: volver a la
+    # grilla de `time_scale`, con las duraciones escaladas como en el modelo
+    duration = (df["processing_time"] * time_scale).fillna(0).round()
+    if use_setup_times:
+        duration = duration + (df["setup_time"] * time_scale).fillna(0).round()
+    previous_start = np.round(df["previous_start"] * time_scale)
+    df["previous_start"] = previous_start / time_scale
+    df["previous_end"] = (previous_start + duration) / time_scale
+
+    # Terminadas: prefijo de cada trabajo; en curso: la primera no terminada
+    finished = (df["previous_end"] <= now).astype(int).groupby(df["job_id"]).cummin().astype(bool)
+    predecessor_finished = finished.groupby(df["job_id"]).shift(fill_value=True).astype(bool)
+    running = ~finished & predecessor_finished & (df["previous_start"] < now)
+    df["state"] = np.where(finished, "finished", np.where(running, "running", "planned"))
+    executed = df[finished]
+    remaining = df[~finished].copy()
+    remaining["operation_index"] = remaining.groupby("job_id").cumcount()
+
+    parts = [pd.DataFrame(_executed_rows(executed, use_setup_times))]
+    info = {}
+    if len(remaining):
+        fixed_starts = {}
+        for row in remaining[remaining["state"] == "running"].itertuples():
+            fixed_starts.setdefault(row.job_id, []).append(
+                {"operation_index": row.operation_index, "start_time_fixed": row.previous_start}
+            )
+        jsm = build_jobshop_model(
+            remaining,
+            time_scale=time_scale,
+            H_daily_hours=H_daily_hours,
+            enforce_daily_limit=enforce_daily_limit,
+            use_setup_times=use_setup_times,
+            fixed_starts=fixed_starts,
+            daily_limit_encoding=daily_limit_encoding,
+            release_time=now,
+            machine_downtime=_clip_downtime(machine_downtime, df[running], now),
+            tight_horizon=deviation_weight <= 0,
+        )
+        model = jsm.model
+        # El orden de all_tasks coincide con el de `remaining`
+        start_vars = [start_var for (start_var, _, _, _) in jsm.all_tasks.values()]
+        previous_starts = np.round(remaining["previous_start"].to_numpy() * time_scale)
+        has_previous = ~np.isnan(previous_starts)
+        model.ClearHints()
+        hint = np.where(
+            has_previous,
+            np.nan_to_num(previous_starts),
+            jsm.heuristic.starts if jsm.heuristic is not None else 0,
+        ).astype(np.int64)
+        hinted = has_previous | (jsm.heuristic is not None)
+        add_solution_hint(model, [v for v, h in zip(start_vars, hinted) if h], hint[hinted])
+        objective = jsm.makespan
+        if deviation_weight > 0:
+            deviations = []
+            for var, old, use in zip(start_vars, hint.tolist(), has_previous.tolist()):
+                if not use:
+                    continue
+                deviation = model.NewIntVar(0, jsm.bounds.horizon, f"dev_{var.Name()}")
+                model.Add(deviation >= var - old)
+                model.Add(deviation >= old - var)
+                deviations.append(deviation)
+            objective = jsm.makespan + deviation_weight * cp_model.LinearExpr.Sum(deviations)
+        model.Minimize(objective)
+        timer = PhaseTimer(jsm.timings)
+        solver, log_lines = make_solver(max_time, solver_config)
+        with timer.phase("solve"):
+            status, incumbents = solve_with_monitor(
+                solver,
+                model,
+                jsm.makespan,
+                time_scale,
+                on_incumbent=on_incumbent,
+                stop_requested=stop_requested,
+            )
+        info = {
+            "solver_log": log_lines,
+            "incumbents": incumbents,
+            "timings": timer.timings,
+            "solver_stats": [solver_stats(solver, status, time_scale)],
+        }
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            with timer.phase("results"):
+                planned = jsm.results(solver)
+        elif status == cp_model.UNKNOWN and jsm.heuristic is not None:
+            info["warnings"] = [HEURISTIC_FALLBACK]
+            planned = jsm.heuristic_results()
+        else:
+            info["warnings"] = [f"{NO_SOLUTION} para la re-planificación"]
+            return attach_solve_info(pd.DataFrame(), **info)
+        # Volver a las posiciones originales dentro de cada trabajo
+        first_position = remaining.groupby("job_id")["position"].min()
+        planned["operation_index"] += planned["job_id"].map(first_position).to_numpy()
+        planned["state"] = remaining["state"].to_numpy()
+        parts.append(planned)
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return attach_solve_info(pd.DataFrame(), **info)
+    schedule_df = pd.concat(parts, ignore_index=True).sort_values(
+        ["job_id", "operation_index"], ignore_index=True
+    )
+    return attach_solve_info(schedule_df, **info)
@@ -0,0 +1,116 @@
+import os
+from dataclasses import dataclass, fields, replace
+from typing import List, Optional
+from ortools.sat.python import cp_model
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _env_float(name: str) -> Optional[float]:
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else None
+
+
+# En modo determinista el límite es de tiempo determinista, que no equivale a
+# segundos: el reloj se corta igual en este múltiplo de `max_time` para que un
+# solve no retenga su proceso (y sus núcleos) mucho más allá del presupuesto
+DETERMINISTIC_WALL_TIME_FACTOR = float(os.environ.get("JSP_SOLVER_DETERMINISTIC_WALL_FACTOR", "2"))
+
+# Núcleos que pueden usar los solves CP-SAT de este proceso. Lo fija el
+# pool de la API en cada proceso trabajador (ver `set_core_budget`).
+_core_budget: Optional[int] = _env_int("JSP_SOLVER_CORE_BUDGET")
+
+
+def set_core_budget(cores: Optional[int]):
+    global _core_budget
+    _core_budget = max(1, int(cores)) if cores else None
+
+
+def get_core_budget() -> int:
+    return _core_budget or os.cpu_count() or 1
+
+
+@dataclass
+class SolverConfig:
+    """
+    Parámetros de CP-SAT controlados por la aplicación. Los campos en None
+    dejan el valor por defecto del solver (o del servidor, ver
+    `default_solver_config`).
+
+    - `num_workers`: hilos de búsqueda por solve (acotado por el presupuesto
+      de núcleos del proceso).
+    - `deterministic`: búsqueda intercalada y límite en tiempo determinista,
+      de modo que la misma semilla reproduce el mismo resultado (salvo que
+      se alcance antes el tope de reloj, ver
+      `DETERMINISTIC_WALL_TIME_FACTOR`).
+    - `relative_gap_limit` / `absolute_gap_limit`: detener el solve cuando
+      el gap contra la mejor cota es suficientemente chico.
+    - `log_search_progress`: capturar el log de CP-SAT.
+    """
+
+    num_workers: Optional[int] = None
+    deterministic: bool = False
+    random_seed: Optional[int] = None
+    relative_gap_limit: Optional[float] = None
+    absolute_gap_limit: Optional[float] = None
+    log_search_progress: bool = False
+
+    def merged(self, overrides: Optional[dict]) -> "SolverConfig":
+        """
+        Copia con los valores de `overrides` que no son None.
+        """
+        if not overrides:
+            return self
+        names = {f.name for f in fields(self)}
+        return replace(
+            self, **{k: v for k, v in overrides.items() if k in names and v is not None}
+        )
+
+    def effective_workers(self) -> int:
+        budget = get_core_budget()
+        return max(1, min(self.num_workers or budget, budget))
+
+
+def default_solver_config() -> SolverConfig:
+    """
+    Valores por defecto del servidor, tomados de variables de entorno.
+    """
+    return SolverConfig(
+        num_workers=_env_int("JSP_SOLVER_NUM_WORKERS"),
+        deterministic=os.environ.get("JSP_SOLVER_DETERMINISTIC", "0") == "1",
+        random_seed=_env_int("JSP_SOLVER_RANDOM_SEED"),
+        relative_gap_limit=_env_float("JSP_SOLVER_RELATIVE_GAP"),
+        absolute_gap_limit=_env_float("JSP_SOLVER_ABSOLUTE_GAP"),
+    )
+
+
+def make_solver(max_time: float, config: Optional[SolverConfig] = None):
+    """
+    Crea un CpSolver configurado. Devuelve `(solver, log_lines)`; la lista se
+    completa durante el solve si `log_search_progress` está activo.
+    """
+    config = config or default_solver_config()
+    solver = cp_model.CpSolver()
+    params = solver.parameters
+    params.num_workers = config.effective_workers()
+    if config.deterministic:
+        params.interleave_search = params.num_workers > 1
+        params.max_deterministic_time = max_time
+        params.max_time_in_seconds = max_time * DETERMINISTIC_WALL_TIME_FACTOR
+    else:
+        params.max_time_in_seconds = max_time
+    if config.random_seed is not None:
+        params.random_seed = config.random_seed
+    if config.relative_gap_limit is not None:
+        params.relative_gap_limit = config.relative_gap_limit
+    if config.absolute_gap_limit is not None:
+        params.absolute_gap_limit = config.absolute_gap_limit
+    log_lines: List[str] = []
+    if config.log_search_progress:
+        params.log_search_progress = True
+        params.log_to_stdout = False
+        solver.log_callback = log_lines.append
+    return solver, log_lines
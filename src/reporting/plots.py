@@ -1,90 +1,217 @@
-import matplotlib.pyplot as plt
+import io
+
 import matplotlib.patches as mpatches
+import numpy as np
 import pandas as pd
+from matplotlib import colormaps
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+SETUP_COLOR = "#888888"
+BAR_HEIGHT = 0.8
+# Nivel de detalle: con más barras que estos umbrales se omiten rótulos,
+# bordes, leyenda por color y líneas de jornada
+LABEL_MAX_BARS = 300
+EDGE_MAX_BARS = 2000
+TICK_MAX_ROWS = 60
+LEGEND_MAX_ENTRIES = 20
+DAY_LINES_MAX = 500
+
+
+def _gantt_bars(schedule_df: pd.DataFrame, view: str) -> dict:
+    """
+    Barras del Gantt como arrays alineados: fila (trabajo o máquina), inicio,
+    fin del setup, fin y código de color. En la vista por trabajo cada fila es
+    un trabajo y el color es la máquina; en la vista por máquina, al revés.
+    """
+    if view not in ("job", "machine"):
+        raise ValueError(f"Vista desconocida: {view} (usar 'job' o 'machine')")
+    row_key, color_key = ("job_id", "machine_id") if view == "job" else ("machine_id", "job_id")
+    df = schedule_df.sort_values("start_time_hours", kind="stable")
+    start = df["start_time_hours"].to_numpy(dtype=float)
+    if "setup_time_hours" in df.columns:
+        setup = df["setup_time_hours"].fillna(0).to_numpy(dtype=float)
+    else:
+        setup = np.zeros(len(df))
+    row_ids = np.sort(df[row_key].unique())
+    # Colores por orden de aparición en el tiempo, como la leyenda
+    color, color_ids = pd.factorize(df[color_key])
+    return {
+        "row": np.searchsorted(row_ids, df[row_key].to_numpy()),
+        "start": start,
+        "setup_end": start + setup,
+        "end": df["end_time_hours"].to_numpy(dtype=float),
+        "color": color,
+        "label": df["operation_index" if view == "job" else "job_id"].to_numpy(),
+        "row_ids": row_ids,
+        "color_ids": np.asarray(color_ids),
+    }
+
+
+def _merge_bars(bars: dict, resolution: float) -> dict:
+    """
+    Une las barras consecutivas de una misma fila separadas por menos de
+    `resolution` horas. Cada grupo toma el color de su primera barra y pierde
+    el setup y el rótulo.
+    """
+    order = np.lexsort((bars["start"], bars["row"]))
+    row, start, end = bars["row"][order], bars["start"][order], bars["end"][order]
+    new_group = np.ones(len(row), dtype=bool)
+    new_group[1:] = (row[1:] != row[:-1]) | (start[1:] - end[:-1] > resolution)
+    first = np.flatnonzero(new_group)
+    merged_end = np.maximum.reduceat(end, first)
+    return {
+        **bars,
+        "row": row[first],
+        "start": start[first],
+        "setup_end": start[first],
+        "end": merged_end,
+        "color": bars["color"][order][first],
+        "label": None,
+    }
+
+
+def downsample_bars(bars: dict, max_bars: int, width_px: float) -> dict:
+    """
+    Nivel de detalle para schedules enormes: si hay más de `max_bars` barras
+    se unen las que quedan a menos de un pixel de distancia en su fila,
+    duplicando la tolerancia hasta quedar por debajo de `max_bars`.
+    """
+    n = len(bars["row"])
+    if n <= max_bars or n == 0:
+        return bars
+    span = float(bars["end"].max() - bars["start"].min()) or 1.0
+    resolution = span / max(width_px, 1.0)
+    merged = _merge_bars(bars, resolution)
+    while len(merged["row"]) > max_bars and resolution < span:
+        resolution *= 2
+        merged = _merge_bars(bars, resolution)
+    return merged
+
+
+def _rectangles(row, left, right) -> np.ndarray:
+    y0 = row - BAR_HEIGHT / 2
+    y1 = row + BAR_HEIGHT / 2
+    return np.stack(
+        [
+            np.column_stack([left, y0]),
+            np.column_stack([left, y1]),
+            np.column_stack([right, y1]),
+            np.column_stack([right, y0]),
+        ],
+        axis=1,
+    )
+
+
+def _draw_gantt(ax, schedule_df: pd.DataFrame, H_daily_hours: int, view: str, max_bars, width_px: float):
+    n_ops = len(schedule_df)
+    bars = _gantt_bars(schedule_df, view)
+    if max_bars is not None:
+        bars = downsample_bars(bars, max_bars, width_px)
+    n_bars = len(bars["row"])
+    cmap = colormaps["tab20"]
+    facecolors = cmap(bars["color"] % 20)
+    edge = {"edgecolors": "black", "linewidths": 0.5} if n_bars <= EDGE_MAX_BARS else {"linewidths": 0}
+
+    # Una colección para todo el procesamiento y otra para los setups
+    has_setup = bool(np.any(bars["setup_end"] > bars["start"]))
+    ax.add_collection(
+        PolyCollection(_rectangles(bars["row"], bars["setup_end"], bars["end"]), facecolors=facecolors, **edge)
+    )
+    if has_setup:
+        with_setup = bars["setup_end"] > bars["start"]
+        ax.add_collection(
+            PolyCollection(
+                _rectangles(bars["row"][with_setup], bars["start"][with_setup], bars["setup_end"][with_setup]),
+                facecolors=SETUP_COLOR,
+                hatch="//",
+                **edge,
+            )
+        )
+    if bars["label"] is not None and n_bars <= LABEL_MAX_BARS:
+        centers = (bars["setup_end"] + bars["end"]) / 2
+        for x, y, label in zip(centers, bars["row"], bars["label"]):
+            ax.text(x, y, int(label), va="center", ha="center", fontsize=8, color="white")
+
+    n_rows = len(bars["row_ids"])
+    max_time = float(schedule_df["end_time_hours"].max()) if n_ops else 0.0
+    ax.set_xlim(0, max(max_time, H_daily_hours) * 1.01)
+    ax.set_ylim(-0.5, max(n_rows, 1) - 0.5)
+    day_lines = np.arange(H_daily_hours, int(max_time) + H_daily_hours, H_daily_hours)
+    if len(day_lines) <= DAY_LINES_MAX:
+        ax.vlines(day_lines, 0, 1, transform=ax.get_xaxis_transform(), colors="red", linestyles="--", linewidth=1)
+
+    row_name, color_name = ("Job", "Máquina") if view == "job" else ("Máquina", "Job")
+    ticks = np.unique(np.linspace(0, n_rows - 1, min(n_rows, TICK_MAX_ROWS)).astype(int)) if n_rows else []
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([f"{row_name} {bars['row_ids'][t]}" for t in ticks])
+    ax.set_xlabel("Tiempo (horas)")
+    title = "Diagrama de Gantt del Job Shop" + (" por máquina" if view == "machine" else "")
+    if n_bars < n_ops:
+        title += f" ({n_bars} barras de {n_ops} operaciones)"
+    ax.set_title(title)
+    if len(bars["color_ids"]) <= LEGEND_MAX_ENTRIES:
+        patches = [
+            mpatches.Patch(color=cmap(i % 20), label=f"{color_name} {c}") for i, c in enumerate(bars["color_ids"])
+        ]
+        if has_setup:
+            patches.append(mpatches.Patch(facecolor=SETUP_COLOR, hatch="//", label="Setup"))
+        ax.legend(handles=patches, bbox_to_anchor=(1, 1), loc="upper right")
 
 
-def plot_schedule(schedule_df: pd.DataFrame, H_daily_hours: int = 8, figsize=(20, 8)):
+def _auto_figsize(schedule_df: pd.DataFrame, view: str):
+    n_rows = schedule_df["job_id" if view == "job" else "machine_id"].nunique()
+    return (20, min(max(8, 0.25 * n_rows), 40))
+
+
+def gantt_figure(
+    schedule_df: pd.DataFrame,
+    H_daily_hours: int = 8,
+    view: str = "job",
+    max_bars=None,
+    figsize=None,
+    dpi: int = 100,
+) -> Figure:
+    """
+    Diagrama de Gantt como `Figure` de matplotlib, sin pyplot ni display (apto
+    para un servidor). `view="job"` dibuja una fila por trabajo coloreada por
+    máquina; `view="machine"`, una fila por máquina coloreada por trabajo.
+    Con `max_bars`, los schedules más grandes se simplifican uniendo barras
+    contiguas (ver `downsample_bars`).
+    """
+    figsize = figsize or _auto_figsize(schedule_df, view)
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    _draw_gantt(ax, schedule_df, H_daily_hours, view, max_bars, width_px=figsize[0] * dpi)
+    fig.tight_layout()
+    return fig
+
+
+def render_gantt(schedule_df: pd.DataFrame, fmt: str = "png", dpi: int = 100, **kwargs) -> bytes:
+    """
+    Gantt renderizado como imagen (`fmt` = "png" o "svg"). Los demás
+    argumentos van a `gantt_figure`.
+    """
+    fig = gantt_figure(schedule_df, dpi=dpi, **kwargs)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi)
+    return buf.getvalue()
+
+
+def plot_schedule(schedule_df: pd.DataFrame, H_daily_hours: int = 8, figsize=(20, 8), view: str = "job", max_bars=None):
     """
     Dibuja un diagrama de Gantt del schedule y marca límites de jornadas diarias.
     Si existen columnas de setup, grafica el setup en gris y el procesamiento en color de máquina.
     """
-    schedule_df_sorted = schedule_df.sort_values(by="start_time_hours").copy()
+    import matplotlib.pyplot as plt
+
+    crosses = schedule_df["start_time_hours"] // H_daily_hours != schedule_df["end_time_hours"] // H_daily_hours
+    for row in schedule_df[crosses].itertuples():
+        print(
+            f"⚠️ Advertencia: Job {row.job_id} operación {row.operation_index} cruza días ({row.start_time_hours}h → {row.end_time_hours}h)."
+        )
     fig, ax = plt.subplots(figsize=figsize)
-    machines = schedule_df_sorted["machine_id"].unique()
-    color_map = {m: plt.cm.tab20(i % 20) for i, m in enumerate(machines)}
-    yticks, ylabels = [], []
-    y = 0
-    has_setup = "setup_time_hours" in schedule_df_sorted.columns and "processing_time_hours" in schedule_df_sorted.columns
-    for _, row in schedule_df_sorted.iterrows():
-        start_day = int(row["start_time_hours"] // H_daily_hours)
-        end_day = int(row["end_time_hours"] // H_daily_hours)
-        if start_day != end_day:
-            print(
-                f"⚠️ Advertencia: Job {row['job_id']} operación {row['operation_index']} cruza días ({row['start_time_hours']}h → {row['end_time_hours']}h)."
-            )
-    for job_id, job_df in schedule_df_sorted.groupby("job_id"):
-        for _, row in job_df.iterrows():
-            if has_setup:
-                # Graficar setup (gris)
-                if row["setup_time_hours"] > 0:
-                    ax.barh(
-                        y,
-                        row["setup_time_hours"],
-                        left=row["start_time_hours"],
-                        color="#888888",
-                        edgecolor="black",
-                        hatch="//",
-                        label="Setup" if y == 0 else None,
-                    )
-                # Graficar procesamiento (color máquina)
-                ax.barh(
-                    y,
-                    row["processing_time_hours"],
-                    left=row["start_time_hours"] + row["setup_time_hours"],
-                    color=color_map[row["machine_id"]],
-                    edgecolor="black",
-                )
-                ax.text(
-                    row["start_time_hours"] + row["setup_time_hours"] + row["processing_time_hours"] / 2,
-                    y,
-                    int(row["operation_index"]),
-                    va="center",
-                    ha="center",
-                    fontsize=8,
-                    color="white",
-                )
-            else:
-                ax.barh(
-                    y,
-                    row["duration_hours"],
-                    left=row["start_time_hours"],
-                    color=color_map[row["machine_id"]],
-                    edgecolor="black",
-                )
-                ax.text(
-                    row["start_time_hours"] + row["duration_hours"] / 2,
-                    y,
-                    int(row["operation_index"]),
-                    va="center",
-                    ha="center",
-                    fontsize=8,
-                    color="white",
-                )
-        yticks.append(y)
-        ylabels.append(f"Job {job_id}")
-        y += 1
-    max_time = schedule_df_sorted["end_time_hours"].max()
-    for t in range(H_daily_hours, int(max_time) + H_daily_hours, H_daily_hours):
-        ax.axvline(x=t, color="red", linestyle="--", linewidth=1)
-    ax.set_yticks(yticks)
-    ax.set_yticklabels(ylabels)
-    ax.set_xlabel("Tiempo (horas)")
-    ax.set_title("Diagrama de Gantt del Job Shop")
-    patches = [
-        mpatches.Patch(color=color_map[m], label=f"Máquina {m}") for m in machines
-    ]
-    if has_setup:
-        patches.append(mpatches.Patch(facecolor="#888888", hatch="//", label="Setup"))
-    ax.legend(handles=patches, bbox_to_anchor=(1, 1), loc="upper right")
+    _draw_gantt(ax, schedule_df, H_daily_hours, view, max_bars, width_px=figsize[0] * fig.dpi)
     plt.tight_layout()
     plt.show()
+    return fig
@@ -1,5 +1,14 @@
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
 import pandas as pd
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 
 def add_day_hour_columns(schedule_df: pd.DataFrame, H_daily_hours: int = 8):
     df_human = schedule_df.copy()
@@ -30,3 +39,37 @@ def build_schedule_results(jobs_data, all_tasks, solver, time_scale):
                 }
             )
     return results
+
+
+def peak_rss_mb():
+    """
+    Memoria residente máxima del proceso hasta ahora (MB), incluida la que
+    reserva CP-SAT fuera de Python. None si la plataforma no la expone.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS, bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class PhaseTimer:
+    """
+    Acumula segundos de reloj por fase:
+
+        timer = PhaseTimer()
+        with timer.phase("solve"):
+            ...
+        timer.timings  # {"solve": 1.23}
+    """
+
+    def __init__(self, timings: Optional[Dict[str, float]] = None):
+        self.timings: Dict[str, float] = dict(timings or {})
+
+    @contextmanager
+    def phase(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
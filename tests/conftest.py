@@ -0,0 +1,83 @@
+import os
+
+# Un solo proceso del pool y un hilo de CP-SAT: los tests corren en CI con pocos núcleos
+os.environ.setdefault("JSP_SOLVE_WORKERS", "1")
+os.environ.setdefault("JSP_SOLVER_NUM_WORKERS", "1")
+os.environ.setdefault("JSP_SOLVE_WARM_UP", "0")
+os.environ.pop("JSP_CACHE_PATH", None)
+
+import time
+
+import pytest
+
+from benchmarks.standard_instances import load_instance
+
+
+def wait_until(predicate, timeout: float = 30.0, poll: float = 0.05) -> bool:
+    t0 = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - t0 > timeout:
+            return False
+        time.sleep(poll)
+    return True
+
+
+def operations_payload(df) -> list:
+    return df.to_dict(orient="records")
+
+
+def assert_feasible_schedule(schedule: list, n_operations: int, eps: float = 1e-6):
+    """
+    Chequea un schedule de `SolveResponse` (lista de `TaskOutput`): todas las
+    operaciones, precedencia dentro de cada trabajo y sin solapes por máquina.
+    """
+    assert len(schedule) == n_operations
+    by_job, by_machine = {}, {}
+    for task in schedule:
+        assert task["end_time_hours"] >= task["start_time_hours"]
+        by_job.setdefault(task["job_id"], []).append(task)
+        by_machine.setdefault(task["machine_id"], []).append(task)
+    for tasks in by_job.values():
+        tasks.sort(key=lambda t: t["operation_index"])
+        for a, b in zip(tasks, tasks[1:]):
+            assert b["start_time_hours"] >= a["end_time_hours"] - eps
+    for tasks in by_machine.values():
+        tasks.sort(key=lambda t: t["start_time_hours"])
+        for a, b in zip(tasks, tasks[1:]):
+            assert b["start_time_hours"] >= a["end_time_hours"] - eps
+
+
+@pytest.fixture(scope="session")
+def hard_instance():
+    # ta01 (15x15): CP-SAT con un hilo no prueba optimalidad en segundos
+    return load_instance("ta01")
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Una sola API (y un solo pool de procesos) para todos los tests
+    from fastapi.testclient import TestClient
+
+    from api.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def clean_cache():
+    from api.services.result_cache import get_result_cache
+
+    cache = get_result_cache()
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture(scope="session")
+def solve_queue():
+    from api.services.job_queue import SolveJobQueue
+
+    queue = SolveJobQueue(max_workers=1, max_queue=4, mp_context="spawn", core_budget=1)
+    yield queue
+    queue.shutdown()
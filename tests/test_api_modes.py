@@ -0,0 +1,141 @@
+import json
+
+import pytest
+
+from benchmarks.generators import random_jobshop_df
+from tests.conftest import assert_feasible_schedule, operations_payload
+
+SMALL = random_jobshop_df(5, 3, seed=1)
+N_OPERATIONS = len(SMALL)
+
+
+def _request(**fields):
+    return {
+        "operations": operations_payload(SMALL),
+        "enforce_daily_limit": False,
+        "max_time": 2,
+        **fields,
+    }
+
+
+@pytest.mark.parametrize(
+    "path, fields",
+    [
+        ("/schedule/solve", {}),
+        ("/schedule/solve", {"enforce_daily_limit": True, "H_daily_hours": 8}),
+        ("/schedule/solve", {"polish_time": 0.2}),
+        ("/schedule/solve_two_stage", {"max_time_stage1": 1, "max_time_stage2": 1}),
+        ("/schedule/solve_heuristic", {}),
+        ("/schedule/solve_local_search", {}),
+        ("/schedule/solve_decomposition", {"window_size": 6, "window_time": 0.2}),
+        ("/schedule/solve_flexible", {}),
+        ("/schedule/solve_multi_objective", {"objectives": ["makespan", "total_flow_time"]}),
+        (
+            "/schedule/solve_multi_objective",
+            {
+                "objectives": [{"name": "weighted_tardiness", "weight": 1}, {"name": "setup_count", "weight": 0.1}],
+                "objective_mode": "weighted",
+                "due_dates": {0: 2.0, 1: 4.0},
+                "job_weights": {0: 2.0},
+            },
+        ),
+    ],
+)
+def test_each_mode_returns_feasible_schedule(client, clean_cache, path, fields):
+    response = client.post(path, json=_request(**fields))
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["status"] in ("optimal", "feasible")
+    assert body["cached"] is False
+    assert_feasible_schedule(body["schedule"], N_OPERATIONS)
+    assert body["makespan"] == pytest.approx(max(t["end_time_hours"] for t in body["schedule"]))
+    assert body["objectives"]["makespan"] == pytest.approx(body["makespan"])
+    if path == "/schedule/solve_decomposition":
+        assert body["windows"]
+        assert body["peak_rss_mb"] is None or body["peak_rss_mb"] > 0
+
+
+@pytest.mark.parametrize("deviation_weight", [0.0, 1.0])
+def test_reschedule_keeps_started_operations(client, clean_cache, deviation_weight):
+    first = client.post("/schedule/solve", json=_request()).json()
+    now = 1.0
+    response = client.post(
+        "/schedule/reschedule",
+        json=_request(
+            previous_schedule=[
+                {k: t[k] for k in ("job_id", "operation_index", "start_time_hours")} for t in first["schedule"]
+            ],
+            now_hours=now,
+            deviation_weight=deviation_weight,
+        ),
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert_feasible_schedule(body["schedule"], N_OPERATIONS)
+    previous = {(t["job_id"], t["operation_index"]): t["start_time_hours"] for t in first["schedule"]}
+    for task in body["schedule"]:
+        if previous[(task["job_id"], task["operation_index"])] < now:
+            # Lo que ya empezó no se mueve
+            assert task["start_time_hours"] == pytest.approx(previous[(task["job_id"], task["operation_index"])])
+        else:
+            assert task["start_time_hours"] >= now - 1e-6
+
+
+def test_cache_hit_path(client, clean_cache):
+    first = client.post("/schedule/solve", json=_request()).json()
+    second = client.post("/schedule/solve", json=_request(max_time=1)).json()
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["schedule"] == first["schedule"]
+    # Renombrar trabajos y máquinas no cambia la clave
+    renamed = [{**op, "job_id": op["job_id"] + 100, "machine_id": op["machine_id"] + 10} for op in _request()["operations"]]
+    third = client.post("/schedule/solve", json=_request(operations=renamed, max_time=1)).json()
+    assert third["cached"] is True
+    assert {t["job_id"] for t in third["schedule"]} == {j + 100 for j in SMALL["job_id"].unique()}
+    assert third["makespan"] == first["makespan"]
+    stats = client.get("/schedule/cache").json()
+    assert stats["hits"] >= 2
+
+
+def test_cache_miss_for_longer_time_limit(client, clean_cache):
+    first = client.post("/schedule/solve", json=_request(max_time=1)).json()
+    second = client.post("/schedule/solve", json=_request(max_time=3)).json()
+    assert second["cached"] is (first["status"] == "optimal")
+
+
+@pytest.mark.parametrize("fmt", ["columnar", "ndjson"])
+def test_wire_formats(client, clean_cache, fmt):
+    response = client.post(f"/schedule/solve?format={fmt}", json=_request())
+    assert response.status_code == 200
+    if fmt == "columnar":
+        body = response.json()
+        assert len(body["schedule"]["job_id"]) == N_OPERATIONS
+    else:
+        lines = [json.loads(line) for line in response.text.splitlines() if line]
+        assert len(lines) == N_OPERATIONS + 1
+
+
+def test_arrow_format(client, clean_cache):
+    pa = pytest.importorskip("pyarrow")
+    response = client.post("/schedule/solve?format=arrow", json=_request())
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == N_OPERATIONS
+
+
+def test_batch(client, clean_cache):
+    items = [_request(), _request(operations=operations_payload(random_jobshop_df(3, 2, seed=2)))]
+    response = client.post("/schedule/solve_batch", json={"items": items, "mode": "heuristic"})
+    assert response.status_code == 200
+    results = response.json()["items"]
+    assert [item["index"] for item in results] == [0, 1]
+    assert all(item["status"] == "done" for item in results)
+
+
+def test_gantt_from_job(client, clean_cache):
+    pytest.importorskip("matplotlib")
+    response = client.post("/schedule/solve", json=_request())
+    job_id = response.headers["X-Job-Id"]
+    image = client.get(f"/schedule/jobs/{job_id}/gantt", params={"format": "svg"})
+    assert image.status_code == 200
+    assert image.headers["content-type"].startswith("image/svg")
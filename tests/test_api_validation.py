@@ -0,0 +1,64 @@
+import asyncio
+from concurrent.futures import Future
+
+import pytest
+from fastapi import HTTPException
+
+from api.routers import schedule_router
+from api.services.job_queue import SolveJob
+
+DUPLICATED = [
+    {"job_id": 0, "operation_index": 0, "machine_id": 0, "processing_time": 1.0},
+    {"job_id": 0, "operation_index": 0, "machine_id": 1, "processing_time": 1.5},
+    {"job_id": 1, "operation_index": 0, "machine_id": 1, "processing_time": 2.0},
+]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/schedule/solve",
+        "/schedule/solve_heuristic",
+        "/schedule/solve_two_stage",
+        "/schedule/jobs",
+        "/schedule/jobs?mode=local_search",
+        "/schedule/solve/stream",
+    ],
+)
+def test_duplicate_operations_are_rejected(client, path):
+    response = client.post(path, json={"operations": DUPLICATED, "max_time": 1})
+    assert response.status_code == 422
+    assert "flexible" in response.json()["detail"]
+
+
+def test_duplicate_operations_in_columns_are_rejected(client):
+    columns = {key: [op[key] for op in DUPLICATED] for key in DUPLICATED[0]}
+    response = client.post("/schedule/solve", json={"operations": columns, "max_time": 1})
+    assert response.status_code == 422
+
+
+def test_flexible_mode_accepts_eligible_machines(client):
+    response = client.post(
+        "/schedule/solve_flexible", json={"operations": DUPLICATED, "max_time": 5, "enforce_daily_limit": False}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] in ("optimal", "feasible")
+    assert len(body["schedule"]) == 2
+
+
+class _ConnectedRequest:
+    headers = {}
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_worker_value_error_maps_to_422():
+    future = Future()
+    future.set_exception(ValueError("Datos inválidos"))
+    job = SolveJob(id="job", mode="solve", submitted_at=0.0, future=future)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(schedule_router._wait_result(job, _ConnectedRequest()))
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail == "Datos inválidos"
@@ -0,0 +1,36 @@
+from benchmarks.generators import random_jobshop_df
+from src.optimization.bounds import compute_bounds, fits_in_day
+from src.optimization.heuristics import best_dispatch
+from src.optimization.instance import build_instance
+from src.optimization.model_builder import preprocess_jobshop_df
+
+
+def _instance(df, time_scale=60):
+    df, use_setup_times = preprocess_jobshop_df(df, time_scale, False)
+    return build_instance(df, use_setup_times)
+
+
+def test_fits_in_day():
+    assert fits_in_day(0, 120, 300)
+    assert fits_in_day(120, 150, 300)
+    assert not fits_in_day(120, 210, 300)
+    assert fits_in_day(290, 0, 300)
+
+
+def test_horizon_caps_only_with_tight_horizon():
+    instance = _instance(random_jobshop_df(6, 4, seed=0))
+    total = int(instance.total_durations.sum())
+    heuristic = best_dispatch(instance)
+    tight = compute_bounds(instance, upper_bound=heuristic.makespan)
+    loose = compute_bounds(instance, upper_bound=heuristic.makespan, tight_horizon=False)
+    assert tight.lower_bound == loose.lower_bound
+    assert tight.lower_bound <= tight.horizon <= heuristic.makespan
+    assert loose.horizon == 2 * total
+    assert (loose.end_max >= tight.end_max).all()
+
+
+def test_lower_bound_is_valid_for_dispatch():
+    instance = _instance(random_jobshop_df(8, 5, seed=4))
+    bounds = compute_bounds(instance)
+    assert bounds.lower_bound <= best_dispatch(instance).makespan
+    assert bounds.lower_bound == max(bounds.components.values())
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from src.optimization.flexible import build_flexible_instance, flexible_dispatch, solve_flexible_jobshop
+from src.optimization.model_builder import preprocess_jobshop_df
+
+# Jornada de 5 h con la operación (0, 0) fija a las 2 h: en la máquina 0
+# (3.5 h) cruza el fin del día, en la máquina 1 (2 h) cabe
+OPERATIONS = [
+    {"job_id": 0, "operation_index": 0, "machine_id": 0, "processing_time": 3.5},
+    {"job_id": 0, "operation_index": 0, "machine_id": 1, "processing_time": 2.0},
+    {"job_id": 1, "operation_index": 0, "machine_id": 0, "processing_time": 1.0},
+]
+FIXED_STARTS = {0: [{"operation_index": 0, "start_time_fixed": 2.0}]}
+TIME_SCALE = 60
+H_DAILY = 5 * TIME_SCALE
+
+
+def _instance(operations):
+    df, use_setup_times = preprocess_jobshop_df(pd.DataFrame(operations), TIME_SCALE, False)
+    return build_flexible_instance(df, use_setup_times)
+
+
+def test_fixed_start_skips_alternative_over_daily_limit():
+    instance = _instance(OPERATIONS)
+    schedule = flexible_dispatch(instance, H_daily=H_DAILY, fixed={0: 2 * TIME_SCALE})
+    assert instance.alt_machines[schedule.choice[0]] == 1
+    assert schedule.starts[0] == 2 * TIME_SCALE
+
+
+def test_fixed_start_without_alternative_in_the_day():
+    instance = _instance([op for op in OPERATIONS if op["machine_id"] == 0])
+    assert flexible_dispatch(instance, H_daily=H_DAILY, fixed={0: 2 * TIME_SCALE}) is None
+    # Sin límite diario el inicio fijo se respeta
+    assert flexible_dispatch(instance, fixed={0: 2 * TIME_SCALE}) is not None
+
+
+def test_solve_flexible_respects_daily_limit_on_fixed_start():
+    schedule_df = solve_flexible_jobshop(
+        pd.DataFrame(OPERATIONS), H_daily_hours=5, enforce_daily_limit=True, fixed_starts=FIXED_STARTS, max_time=5
+    )
+    pinned = schedule_df[schedule_df["job_id"] == 0].iloc[0]
+    assert pinned["machine_id"] == 1
+    assert pinned["start_time_hours"] == 2.0
+    assert (schedule_df["start_time_hours"] // 5 == (schedule_df["end_time_hours"] - 1e-9) // 5).all()
@@ -0,0 +1,56 @@
+import pandas as pd
+
+from src.optimization.model_builder import (
+    HEURISTIC_FALLBACK,
+    NO_DISPATCH,
+    solve_jobshop,
+    solve_jobshop_heuristic,
+)
+from src.optimization.solver_config import SolverConfig
+
+# Jornada de 5 h: el inicio fijo a las 2 h de una operación de 3.5 h cruza el fin del día
+OPERATIONS = [
+    {"job_id": 0, "operation_index": 0, "machine_id": 0, "processing_time": 3.5},
+    {"job_id": 1, "operation_index": 0, "machine_id": 1, "processing_time": 1.0},
+]
+FIXED_STARTS = {0: [{"operation_index": 0, "start_time_fixed": 2.0}]}
+
+
+def test_dispatch_rejects_fixed_start_over_daily_limit(capsys):
+    schedule_df = solve_jobshop_heuristic(
+        pd.DataFrame(OPERATIONS), H_daily_hours=5, enforce_daily_limit=True, fixed_starts=FIXED_STARTS
+    )
+    assert schedule_df.empty
+    assert schedule_df.attrs["warnings"] == [NO_DISPATCH]
+    # El aviso va en el resultado, no a stdout del proceso
+    assert capsys.readouterr().out == ""
+
+
+def test_dispatch_keeps_fixed_start_without_daily_limit():
+    schedule_df = solve_jobshop_heuristic(
+        pd.DataFrame(OPERATIONS), H_daily_hours=5, enforce_daily_limit=False, fixed_starts=FIXED_STARTS
+    )
+    fixed = schedule_df[schedule_df["job_id"] == 0].iloc[0]
+    assert fixed["start_time_hours"] == 2.0
+
+
+def test_heuristic_endpoint_reports_infeasible_fixed_start(client):
+    response = client.post(
+        "/schedule/solve_heuristic",
+        json={"operations": OPERATIONS, "H_daily_hours": 5, "fixed_starts": FIXED_STARTS},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "infeasible"
+    assert body["schedule"] == []
+    assert body["warnings"] == [NO_DISPATCH]
+
+
+def test_heuristic_fallback_is_reported_in_warnings(hard_instance, capsys):
+    schedule_df = solve_jobshop(
+        hard_instance, max_time=0.001, enforce_daily_limit=False, solver_config=SolverConfig(num_workers=1)
+    )
+    assert len(schedule_df) == len(hard_instance)
+    assert schedule_df.attrs["solver_stats"][0]["status"] == "unknown"
+    assert schedule_df.attrs["warnings"] == [HEURISTIC_FALLBACK]
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,116 @@
+import json
+import threading
+
+from api.services.job_queue import get_solve_queue
+from benchmarks.generators import random_jobshop_df
+from tests.conftest import assert_feasible_schedule, operations_payload, wait_until
+
+
+def _long_request(df, max_time=60):
+    return {"operations": operations_payload(df), "enforce_daily_limit": False, "max_time": max_time}
+
+
+def _sse_events(text: str) -> list:
+    # Pares (evento, datos) de un stream server-sent events
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _job(client, job_id) -> dict:
+    return client.get(f"/schedule/jobs/{job_id}").json()
+
+
+def _stop_when_improving(client, job_id):
+    # Detiene el trabajo apenas informa un incumbente, desde otro hilo
+    def stop():
+        wait_until(lambda: _job(client, job_id)["incumbents"])
+        get_solve_queue().stop(job_id)
+
+    thread = threading.Thread(target=stop, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_job_stop_keeps_best_solution(client, clean_cache, hard_instance):
+    response = client.post("/schedule/jobs", json=_long_request(hard_instance))
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert wait_until(lambda: _job(client, job_id)["status"] == "running")
+    assert wait_until(lambda: _job(client, job_id)["incumbents"])
+    stopped = client.post(f"/schedule/jobs/{job_id}/stop").json()
+    assert stopped["stop_requested"] is True
+    assert wait_until(lambda: _job(client, job_id)["status"] == "done")
+    job = _job(client, job_id)
+    assert job["finished_at"] - job["started_at"] < 30
+    assert job["result"]["status"] == "feasible"
+    assert_feasible_schedule(job["result"]["schedule"], len(hard_instance))
+    # Un resultado detenido no se cachea
+    assert client.get("/schedule/cache").json()["size"] == 0
+
+
+def test_cancel_queued_job(client, clean_cache, hard_instance):
+    running = client.post("/schedule/jobs", json=_long_request(hard_instance)).json()["job_id"]
+    assert wait_until(lambda: _job(client, running)["status"] == "running")
+    queued = client.post("/schedule/jobs", json=_long_request(hard_instance, max_time=59)).json()["job_id"]
+    assert _job(client, queued)["status"] == "queued"
+    assert client.delete(f"/schedule/jobs/{queued}").json()["status"] == "cancelled"
+    # Lo que ya corre no se cancela: se detiene
+    assert client.delete(f"/schedule/jobs/{running}").status_code == 409
+    client.post(f"/schedule/jobs/{running}/stop")
+    assert wait_until(lambda: _job(client, running)["status"] == "done")
+    assert client.get("/schedule/jobs/missing").status_code == 404
+
+
+def test_job_events_stream_until_stopped(client, clean_cache, hard_instance):
+    job_id = client.post("/schedule/jobs", json=_long_request(hard_instance)).json()["job_id"]
+    stopper = _stop_when_improving(client, job_id)
+    response = client.get(f"/schedule/jobs/{job_id}/events")
+    stopper.join(timeout=30)
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    incumbents = [data for name, data in events if name == "incumbent"]
+    statuses = [data for name, data in events if name == "status"]
+    assert incumbents
+    makespans = [incumbent["makespan"] for incumbent in incumbents]
+    assert makespans == sorted(makespans, reverse=True)
+    assert statuses[-1]["status"] == "done"
+    assert statuses[-1]["stop_requested"] is True
+    assert statuses[-1]["result"]["makespan"] == makespans[-1]
+
+
+def test_solve_stream(client, clean_cache):
+    df = random_jobshop_df(5, 3, seed=3)
+    response = client.post("/schedule/solve/stream", json=_long_request(df, max_time=2))
+    events = _sse_events(response.text)
+    first, last = events[0], events[-1]
+    assert first[0] == "status"
+    assert first[1]["job_id"] == last[1]["job_id"]
+    assert last[0] == "status"
+    assert last[1]["status"] == "done"
+    assert_feasible_schedule(last[1]["result"]["schedule"], len(df))
+
+
+def test_cancel_sync_solve_through_jobs(client, clean_cache, hard_instance):
+    running = client.post("/schedule/jobs", json=_long_request(hard_instance)).json()["job_id"]
+    assert wait_until(lambda: _job(client, running)["status"] == "running")
+    responses = []
+    waiting = threading.Thread(
+        target=lambda: responses.append(
+            client.post("/schedule/solve", json=_long_request(hard_instance, max_time=59))
+        ),
+        daemon=True,
+    )
+    waiting.start()
+    # El id del solve síncrono solo se conoce desde la cola
+    queue = get_solve_queue()
+    assert wait_until(lambda: len([j for j in queue._jobs.values() if j.status == "queued"]) == 1)
+    (queued,) = [j for j in queue._jobs.values() if j.status == "queued"]
+    assert client.delete(f"/schedule/jobs/{queued.id}").json()["status"] == "cancelled"
+    waiting.join(timeout=10)
+    assert responses and responses[0].status_code == 409
+    assert "cancelado" in responses[0].json()["detail"]
+    client.post(f"/schedule/jobs/{running}/stop")
+    assert wait_until(lambda: _job(client, running)["status"] == "done")
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+from api.routers import schedule_router
+from tests.conftest import operations_payload, wait_until
+
+
+def _long_payload(df, max_time=60):
+    return {"operations": operations_payload(df), "enforce_daily_limit": False, "max_time": max_time}
+
+
+def test_job_started_without_polling(solve_queue, hard_instance):
+    job = solve_queue.submit(_long_payload(hard_instance), "solve")
+    # `status` no consulta la cola: el inicio lo informa el proceso del pool
+    assert wait_until(lambda: job.started_at is not None)
+    assert job.status == "running"
+    assert solve_queue.stop(job.id)
+    result = job.future.result(timeout=30)
+    assert job.status == "done"
+    assert result["status"] == "feasible"
+    assert job.submitted_at <= job.started_at <= job.finished_at
+    assert job.finished_at - job.started_at < 30
+
+
+class _DisconnectedRequest:
+    headers = {}
+
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+def test_wait_result_stops_job_on_disconnect(solve_queue, hard_instance, monkeypatch):
+    monkeypatch.setattr(schedule_router, "get_solve_queue", lambda: solve_queue)
+    job = solve_queue.submit(_long_payload(hard_instance), "solve")
+    assert wait_until(lambda: job.started_at is not None)
+    t0 = time.perf_counter()
+    response = asyncio.run(schedule_router._wait_result(job, _DisconnectedRequest()))
+    assert response.status_code == 499
+    assert job.stop_requested
+    # Sin el aviso de detención el solve seguiría los 60 s de `max_time`
+    job.future.result(timeout=30)
+    assert time.perf_counter() - t0 < 30
+
+
+def test_cancel_job_already_taken_by_pool(solve_queue, hard_instance):
+    running = solve_queue.submit(_long_payload(hard_instance), "solve")
+    assert wait_until(lambda: running.started_at is not None)
+    # El pool adelanta un trabajo a su cola interna: `Future.cancel` ya no lo cancela
+    queued = solve_queue.submit(_long_payload(hard_instance, max_time=59), "solve")
+    assert queued.status == "queued"
+    assert solve_queue.cancel(queued.id)
+    assert queued.status == "cancelled"
+    solve_queue.stop(running.id)
+    running.future.result(timeout=30)
+    assert wait_until(lambda: queued.future.done(), timeout=10)
+    assert queued.status == "cancelled"
+    assert queued.result is None
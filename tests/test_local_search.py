@@ -0,0 +1,21 @@
+import pandas as pd
+
+from src.optimization.instance import build_instance
+from src.optimization.local_search import tabu_search
+from src.optimization.model_builder import preprocess_jobshop_df, solve_jobshop_local_search
+
+COLUMNS = ["job_id", "operation_index", "machine_id", "processing_time"]
+
+
+def test_tabu_search_on_empty_instance():
+    df, use_setup_times = preprocess_jobshop_df(pd.DataFrame(columns=COLUMNS), 60, False)
+    instance = build_instance(df, use_setup_times)
+    # Cota inferior negativa: fuerza a evaluar el vecindario del camino crítico vacío
+    result = tabu_search(instance, [], lower_bound=-1, max_iterations=5)
+    assert result is not None
+    assert result.makespan == 0
+
+
+def test_local_search_on_empty_request():
+    schedule_df = solve_jobshop_local_search(pd.DataFrame(columns=COLUMNS), max_time=0.5)
+    assert schedule_df.empty
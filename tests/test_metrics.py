@@ -0,0 +1,6 @@
+def test_cache_totals_are_counters(client):
+    text = client.get("/metrics").text
+    assert "# TYPE jsp_cache_hits_total counter" in text
+    assert "# TYPE jsp_cache_misses_total counter" in text
+    assert "# TYPE jsp_cache_hit_rate gauge" in text
+    assert "jsp_cache_hits " not in text
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from src.optimization.multi_objective import solve_jobshop_multi_objective
+from src.optimization.objectives import evaluate_schedule
+from src.optimization.solver_config import SolverConfig
+
+# Con makespan mínimo (13 h) el atraso total es 18 h; el óptimo del atraso
+# (14 h) termina a las 15 h, por encima de las cotas superiores del makespan
+OPERATIONS = [
+    {"job_id": 0, "operation_index": 0, "machine_id": 0, "processing_time": 3.0},
+    {"job_id": 0, "operation_index": 1, "machine_id": 1, "processing_time": 1.0},
+    {"job_id": 1, "operation_index": 0, "machine_id": 1, "processing_time": 4.0},
+    {"job_id": 1, "operation_index": 1, "machine_id": 0, "processing_time": 6.0},
+    {"job_id": 2, "operation_index": 0, "machine_id": 1, "processing_time": 1.0},
+    {"job_id": 2, "operation_index": 1, "machine_id": 0, "processing_time": 4.0},
+]
+DUE_DATES = {0: 100, 1: 1, 2: 1}
+
+
+def _solve(objectives, objective_mode="lexicographic"):
+    schedule_df = solve_jobshop_multi_objective(
+        pd.DataFrame(OPERATIONS),
+        enforce_daily_limit=False,
+        max_time=10,
+        objectives=objectives,
+        objective_mode=objective_mode,
+        due_dates=DUE_DATES,
+        solver_config=SolverConfig(num_workers=1, random_seed=0),
+    )
+    return evaluate_schedule(schedule_df, DUE_DATES), schedule_df.attrs["solver_stats"]
+
+
+def test_tardiness_first_is_not_capped_by_makespan_horizon():
+    values, stats = _solve(["total_tardiness"])
+    assert stats[0]["status"] == "optimal"
+    assert values["total_tardiness"] == 14.0
+    assert values["makespan"] == 15.0
+
+
+def test_weighted_tardiness_is_not_capped_by_makespan_horizon():
+    objectives = [{"name": "total_tardiness", "weight": 1.0}, {"name": "makespan", "weight": 0.01}]
+    values, _ = _solve(objectives, objective_mode="weighted")
+    assert values["total_tardiness"] == 14.0
+
+
+def test_makespan_first_then_tardiness():
+    values, stats = _solve(["makespan", "total_tardiness"])
+    assert values["makespan"] == 13.0
+    assert values["total_tardiness"] == 18.0
+    assert len(stats) <= 2
+
+
+def test_unknown_objective_mode():
+    with pytest.raises(ValueError):
+        _solve(["makespan"], objective_mode="pareto")
@@ -0,0 +1,53 @@
+from api.schemas.schedule_schema import SolveRequest
+from api.services.result_cache import ResultCache
+
+OPERATIONS = [
+    {"job_id": 0, "operation_index": 0, "machine_id": 0, "processing_time": 1.0},
+    {"job_id": 0, "operation_index": 1, "machine_id": 1, "processing_time": 2.0},
+    {"job_id": 1, "operation_index": 0, "machine_id": 1, "processing_time": 1.5},
+]
+SCHEDULE = {
+    "job_id": [0, 0, 1],
+    "operation_index": [0, 1, 0],
+    "machine_id": [0, 1, 1],
+    "start_time_hours": [0.0, 1.0, 3.0],
+    "end_time_hours": [1.0, 3.0, 4.5],
+}
+
+
+def _payload(**fields):
+    return SolveRequest(operations=OPERATIONS, **fields).model_dump()
+
+
+def _result(status, stage_statuses):
+    stats = [{"stage": k + 1, "status": s} for k, s in enumerate(stage_statuses)]
+    return {"status": status, "makespan": 4.5, "schedule": SCHEDULE, "solver_stats": stats}
+
+
+def test_cache_hit_with_relabeled_ids():
+    cache = ResultCache(path=None)
+    cache.store(_payload(max_time=10), "solve", _result("feasible", ["feasible"]))
+    # Mismos trabajos con otros ids: misma clave canónica
+    renamed = [{**op, "job_id": op["job_id"] + 10, "machine_id": op["machine_id"] + 5} for op in OPERATIONS]
+    hit = cache.lookup(SolveRequest(operations=renamed, max_time=5).model_dump(), "solve")
+    assert hit["cached"] is True
+    assert hit["schedule"]["job_id"] == [10, 10, 11]
+    assert hit["schedule"]["machine_id"] == [5, 6, 6]
+    assert cache.lookup(_payload(max_time=20), "solve") is None
+
+
+def test_proven_optimum_serves_any_time_limit():
+    cache = ResultCache(path=None)
+    cache.store(_payload(max_time=1), "solve", _result("optimal", ["optimal"]))
+    assert cache.lookup(_payload(max_time=100), "solve") is not None
+
+
+def test_two_stage_optimal_first_stage_needs_stage2_budget():
+    cache = ResultCache(path=None)
+    stored = _payload(max_time_stage1=5, max_time_stage2=1)
+    cache.store(stored, "two_stage", _result("optimal", ["optimal", "feasible"]))
+    assert cache.lookup(_payload(max_time_stage1=5, max_time_stage2=30), "two_stage") is None
+    assert cache.lookup(_payload(max_time_stage1=5, max_time_stage2=1), "two_stage") is not None
+    # Con ambas etapas óptimas, el resultado sirve para cualquier presupuesto
+    cache.store(stored, "two_stage", _result("optimal", ["optimal", "optimal"]))
+    assert cache.lookup(_payload(max_time_stage1=5, max_time_stage2=30), "two_stage") is not None
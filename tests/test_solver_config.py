@@ -0,0 +1,16 @@
+import pytest
+
+from src.optimization.solver_config import DETERMINISTIC_WALL_TIME_FACTOR, SolverConfig, make_solver
+
+
+def test_time_limit_in_seconds():
+    solver, _ = make_solver(3, SolverConfig(num_workers=1))
+    assert solver.parameters.max_time_in_seconds == 3
+
+
+def test_deterministic_keeps_wall_clock_cap():
+    solver, _ = make_solver(3, SolverConfig(num_workers=1, deterministic=True, random_seed=7))
+    params = solver.parameters
+    assert params.max_deterministic_time == 3
+    assert params.max_time_in_seconds == pytest.approx(3 * DETERMINISTIC_WALL_TIME_FACTOR)
+    assert params.random_seed == 7